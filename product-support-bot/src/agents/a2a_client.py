@@ -0,0 +1,310 @@
+import threading
+import time
+
+import httpx
+from a2a.client import A2ACardResolver
+from google.adk.agents.remote_a2a_agent import RemoteA2aAgent, AGENT_CARD_WELL_KNOWN_PATH
+
+from src.config import (
+    A2A_MAX_CONNECTIONS,
+    A2A_MAX_KEEPALIVE,
+    A2A_KEEPALIVE_EXPIRY,
+    A2A_CONNECT_TIMEOUT,
+    A2A_READ_TIMEOUT,
+    A2A_POOL_TIMEOUT,
+    A2A_HTTP2,
+    A2A_CARD_TTL,
+)
+
+
+# ----------------------------
+# Pool metrics
+# ----------------------------
+
+class PoolMetrics:
+    """
+    Connection reuse and saturation counters for the pooled A2A client.
+
+    A request that does not open a TCP connection was served from a
+    keep-alive connection. `pool_wait` is the time between a request
+    entering the transport and it getting a connection (new or reused);
+    it grows when every pooled connection is busy.
+    """
+
+    def __init__(self, max_connections: int):
+        self._lock = threading.Lock()
+        self.max_connections = max_connections
+        self.requests = 0
+        self.new_connections = 0
+        self.in_flight = 0
+        self.peak_in_flight = 0
+        self.pool_wait_total_s = 0.0
+        self.pool_wait_max_s = 0.0
+        self.pool_timeouts = 0
+        self.errors = 0
+        self.pool = None
+
+    def request_started(self) -> None:
+        with self._lock:
+            self.requests += 1
+            self.in_flight += 1
+            self.peak_in_flight = max(self.peak_in_flight, self.in_flight)
+
+    def request_finished(self) -> None:
+        with self._lock:
+            self.in_flight -= 1
+
+    def connection_opened(self) -> None:
+        with self._lock:
+            self.new_connections += 1
+
+    def connection_acquired(self, wait_s: float) -> None:
+        with self._lock:
+            self.pool_wait_total_s += wait_s
+            self.pool_wait_max_s = max(self.pool_wait_max_s, wait_s)
+
+    def request_failed(self, error: Exception) -> None:
+        with self._lock:
+            self.errors += 1
+            if isinstance(error, httpx.PoolTimeout):
+                self.pool_timeouts += 1
+
+    def snapshot(self) -> dict:
+        with self._lock:
+            connections = list(self.pool.connections) if self.pool is not None else []
+            reused = max(self.requests - self.new_connections, 0)
+            return {
+                "requests": self.requests,
+                "new_connections": self.new_connections,
+                "reused_connections": reused,
+                "reuse_ratio": reused / self.requests if self.requests else 0.0,
+                "open_connections": len(connections),
+                "idle_connections": sum(1 for c in connections if c.is_idle()),
+                "max_connections": self.max_connections,
+                "in_flight": self.in_flight,
+                "peak_in_flight": self.peak_in_flight,
+                # Fraction of the pool busy at peak; 1.0 means requests queued
+                "peak_saturation": self.peak_in_flight / self.max_connections,
+                "pool_wait_avg_ms": 1000 * self.pool_wait_total_s / self.requests if self.requests else 0.0,
+                "pool_wait_max_ms": 1000 * self.pool_wait_max_s,
+                "pool_timeouts": self.pool_timeouts,
+                "errors": self.errors,
+            }
+
+
+# ----------------------------
+# Metered transport
+# ----------------------------
+
+class _MeteredStream(httpx.AsyncByteStream):
+    """
+    Response body wrapper: the pooled connection stays busy until the body
+    is closed, so that is when the request stops counting as in flight.
+    """
+
+    def __init__(self, stream: httpx.AsyncByteStream, on_close):
+        self._stream = stream
+        self._on_close = on_close
+
+    async def __aiter__(self):
+        async for chunk in self._stream:
+            yield chunk
+
+    async def aclose(self) -> None:
+        try:
+            await self._stream.aclose()
+        finally:
+            if self._on_close is not None:
+                self._on_close()
+                self._on_close = None
+
+
+class MeteredTransport(httpx.AsyncHTTPTransport):
+    def __init__(self, metrics: PoolMetrics, **kwargs):
+        super().__init__(**kwargs)
+        self.metrics = metrics
+        metrics.pool = self._pool
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        metrics = self.metrics
+        started = time.perf_counter()
+        acquired = False
+        user_trace = request.extensions.get("trace")
+
+        async def trace(event: str, info: dict):
+            nonlocal acquired
+            if event == "connection.connect_tcp.started":
+                metrics.connection_opened()
+            if not acquired and event in (
+                "connection.connect_tcp.started",
+                "http11.send_request_headers.started",
+                "http2.send_request_headers.started",
+            ):
+                acquired = True
+                metrics.connection_acquired(time.perf_counter() - started)
+            if user_trace is not None:
+                await user_trace(event, info)
+
+        request.extensions["trace"] = trace
+        metrics.request_started()
+        try:
+            response = await super().handle_async_request(request)
+        except Exception as e:
+            metrics.request_failed(e)
+            metrics.request_finished()
+            raise
+
+        response.stream = _MeteredStream(response.stream, metrics.request_finished)
+        return response
+
+
+# ----------------------------
+# Shared pooled client
+# ----------------------------
+
+def _http2_available() -> bool:
+    try:
+        import h2  # noqa: F401
+        return True
+    except ImportError:
+        return False
+
+
+def create_pooled_client(metrics: PoolMetrics | None = None) -> httpx.AsyncClient:
+    """
+    Keep-alive AsyncClient for A2A calls, with pool limits and timeouts from
+    config. HTTP/2 is used when A2A_HTTP2 is set and `h2` is installed.
+    """
+    metrics = metrics or PoolMetrics(A2A_MAX_CONNECTIONS)
+
+    http2 = A2A_HTTP2 and _http2_available()
+    if A2A_HTTP2 and not http2:
+        print("⚠️ A2A_HTTP2 is set but the 'h2' package is not installed; using HTTP/1.1")
+
+    limits = httpx.Limits(
+        max_connections=A2A_MAX_CONNECTIONS,
+        max_keepalive_connections=A2A_MAX_KEEPALIVE,
+        keepalive_expiry=A2A_KEEPALIVE_EXPIRY,
+    )
+    timeout = httpx.Timeout(
+        connect=A2A_CONNECT_TIMEOUT,
+        read=A2A_READ_TIMEOUT,
+        write=A2A_CONNECT_TIMEOUT,
+        pool=A2A_POOL_TIMEOUT,
+    )
+    return httpx.AsyncClient(
+        transport=MeteredTransport(metrics, limits=limits, http2=http2),
+        timeout=timeout,
+    )
+
+
+pool_metrics = PoolMetrics(A2A_MAX_CONNECTIONS)
+_shared_client: httpx.AsyncClient | None = None
+
+
+def get_shared_client() -> httpx.AsyncClient:
+    """
+    Process-wide pooled client, created on first use.
+    """
+    global _shared_client
+    if _shared_client is None:
+        _shared_client = create_pooled_client(pool_metrics)
+    return _shared_client
+
+
+# ----------------------------
+# Agent card cache
+# ----------------------------
+
+class AgentCardCache:
+    """
+    Agent cards keyed by base URL, refetched at most once per `ttl` seconds.
+    """
+
+    def __init__(self, ttl: float = 300.0):
+        self.ttl = ttl
+        self._cards: dict[str, tuple[float, object]] = {}
+        self.hits = 0
+        self.fetches = 0
+        self.fetch_errors = 0
+
+    async def get(self, base_url: str, client: httpx.AsyncClient):
+        entry = self._cards.get(base_url)
+        if entry is not None and time.monotonic() - entry[0] <= self.ttl:
+            self.hits += 1
+            return entry[1]
+
+        try:
+            card = await A2ACardResolver(httpx_client=client, base_url=base_url).get_agent_card(
+                relative_card_path=AGENT_CARD_WELL_KNOWN_PATH,
+            )
+        except Exception:
+            self.fetch_errors += 1
+            if entry is not None:
+                # Keep serving the last good card while the server is unreachable
+                return entry[1]
+            raise
+
+        self.fetches += 1
+        self._cards[base_url] = (time.monotonic(), card)
+        return card
+
+    def stats(self) -> dict:
+        return {
+            "cards": len(self._cards),
+            "ttl_seconds": self.ttl,
+            "hits": self.hits,
+            "fetches": self.fetches,
+            "fetch_errors": self.fetch_errors,
+        }
+
+
+agent_card_cache = AgentCardCache(A2A_CARD_TTL)
+
+
+# ----------------------------
+# Remote agent
+# ----------------------------
+
+class PooledRemoteA2aAgent(RemoteA2aAgent):
+    """
+    RemoteA2aAgent that sends every call through the shared pooled client
+    and takes its agent card from `agent_card_cache`.
+
+    Before each run the card is checked against the cache; when the TTL has
+    expired and the refetched card differs, the A2A client is rebuilt from
+    it on the next call.
+    """
+
+    def __init__(self, *, name: str, base_url: str, description: str = "", **kwargs):
+        base_url = base_url.rstrip("/")
+        super().__init__(
+            name=name,
+            description=description,
+            agent_card=f"{base_url}{AGENT_CARD_WELL_KNOWN_PATH}",
+            httpx_client=get_shared_client(),
+            timeout=A2A_READ_TIMEOUT,
+            **kwargs,
+        )
+        self._base_url = base_url
+
+    async def _refresh_agent_card(self) -> None:
+        card = await agent_card_cache.get(self._base_url, self._httpx_client)
+        # Compared by value: a refetch that returns the same card keeps the client
+        if card != self._agent_card:
+            await self._validate_agent_card(card)
+            self._agent_card = card
+            self._a2a_client = None
+            self._is_resolved = False
+
+    async def _run_async_impl(self, ctx):
+        await self._refresh_agent_card()
+        async for event in super()._run_async_impl(ctx):
+            yield event
+
+
+def a2a_client_stats() -> dict:
+    return {
+        "pool": pool_metrics.snapshot(),
+        "agent_cards": agent_card_cache.stats(),
+    }
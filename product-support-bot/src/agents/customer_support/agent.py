@@ -1,8 +1,12 @@
-from google.adk.agents import LlmAgent
+import threading
+
+from google.adk.agents import BaseAgent, LlmAgent
 from google.adk.models.google_llm import Gemini
 from google.genai import types
 
-from src.agents.remote_catalog_agent import create_remote_catalog_agent
+from src.config import CATALOG_MODE, SUPPORT_FAST_PATH, require_google_api_key
+from src.agents.remote_catalog_agent import create_catalog_agent
+from src.agents.customer_support.router import fast_path_router
 from src.agents.customer_support.memory import (
     save_last_product,
     get_last_product,
@@ -19,23 +23,16 @@ retry_config = types.HttpRetryOptions(
     http_status_codes=[429, 500, 503, 504],
 )
 
-# Remote sub-agent (A2A) – product catalog
-remote_product_catalog_agent = create_remote_catalog_agent()
-
-# customer_support_agent definition
-customer_support_agent = LlmAgent(
-    model=Gemini(model="gemini-2.5-flash-lite", retry_options=retry_config),
-    name="customer_support_agent",
-    description=(
+DESCRIPTION = (
     "A customer support assistant that handles user interaction, intent detection, "
     "and session memory, and delegates product discovery and product detail requests "
     "to a remote product catalog agent backed by a real electronics dataset. "
     "It remembers recently discussed products and preferred brands within the same "
     "session using ADK session state."
-),
+)
 
 
-    instruction="""
+INSTRUCTION = """
 You are a friendly and professional customer support agent.
 
 You have:
@@ -44,6 +41,7 @@ You have:
   - list brands (optionally by category)
   - list products (by category and/or brand)
   - look up detailed information about a specific product
+  - compare several named products side by side
 - Memory tools: save_last_product, get_last_product, save_preferred_brand, get_preferred_brand.
   These store and read values from the ADK session state for the current user/session.
 
@@ -126,7 +124,9 @@ MEMORY BEHAVIOR:
    (e.g. "How much does it weigh?", "Is it in stock?", "Compare them"):
    - FIRST call get_last_product
    - Use last_product for single-product follow-ups
-   - Use last_product and second_last_product for comparisons
+   - Use last_product and second_last_product for comparisons, and ask
+     product_catalog_agent to compare them in a single request
+     (it looks up all named products with one tool call)
 
    If no last_product is stored, politely ask which product they mean.
 
@@ -202,19 +202,80 @@ Adapt the level of detail to what the user actually asked.
 - After calling ANY tool, you MUST always produce a user-facing response.
   Silent turns are not allowed under any circumstance.
 
-""",
-
-    tools=[
-        save_last_product,
-        get_last_product,
-        save_preferred_brand,
-        get_preferred_brand,
-    ],
-    sub_agents=[remote_product_catalog_agent],
-)
-
-
-print("✅ Customer Support Agent created (with session-state memory)!")
-print("   Model: gemini-2.5-flash-lite")
-print("   Tools: save_last_product, get_last_product, save_preferred_brand, get_preferred_brand")
-print("   Sub-agents: 1 (remote Product Catalog Agent via A2A)")
+"""
+
+
+def create_customer_support_agent(
+    model=None,
+    catalog_agent: BaseAgent | None = None,
+    fast_path: bool = SUPPORT_FAST_PATH,
+) -> LlmAgent:
+    """
+    Build the customer support agent.
+
+    `model` overrides the default Gemini model (e.g. a scripted stand-in for
+    offline benchmarks), `catalog_agent` the product catalog sub-agent
+    (remote over A2A, or in-process with CATALOG_MODE=local).
+    """
+    if model is None:
+        require_google_api_key()
+        model = Gemini(model="gemini-2.5-flash-lite", retry_options=retry_config)
+
+    return LlmAgent(
+        model=model,
+        name="customer_support_agent",
+        description=DESCRIPTION,
+        instruction=INSTRUCTION,
+        tools=[
+            save_last_product,
+            get_last_product,
+            save_preferred_brand,
+            get_preferred_brand,
+        ],
+        sub_agents=[catalog_agent or create_catalog_agent(CATALOG_MODE)],
+        # Exact product names and simple memory questions are answered without the LLM
+        before_agent_callback=fast_path_router if fast_path else None,
+    )
+
+
+# ----------------------------
+# Shared instance (built on first use)
+# ----------------------------
+
+_agent: LlmAgent | None = None
+_agent_lock = threading.Lock()
+
+
+def get_customer_support_agent() -> LlmAgent:
+    global _agent
+
+    with _agent_lock:
+        if _agent is None:
+            _agent = create_customer_support_agent()
+            print(
+                f"✅ Customer Support Agent created (catalog: "
+                f"{'in-process' if CATALOG_MODE == 'local' else 'remote via A2A'}, "
+                f"fast path: {'on' if SUPPORT_FAST_PATH else 'off'})"
+            )
+        return _agent
+
+
+def set_customer_support_agent(agent: LlmAgent) -> None:
+    """
+    Use `agent` as the shared instance, e.g. one built with a stand-in model
+    for offline load tests. Must run before the server module is imported.
+    """
+    global _agent
+
+    with _agent_lock:
+        _agent = agent
+
+
+def __getattr__(name):
+    # `from ... import customer_support_agent` keeps working, but the agent,
+    # its Gemini client and the catalog sub-agent are only built on access
+    if name == "customer_support_agent":
+        return get_customer_support_agent()
+    if name == "remote_product_catalog_agent":
+        return get_customer_support_agent().sub_agents[0]
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
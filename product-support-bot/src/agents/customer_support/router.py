@@ -0,0 +1,288 @@
+import re
+import threading
+from typing import Optional
+
+from google.adk.agents.callback_context import CallbackContext
+from google.genai import types
+
+from src.config import CATALOG_MODE
+from src.agents.customer_support.memory import (
+    save_last_product,
+    get_last_product,
+    save_preferred_brand,
+    get_preferred_brand,
+)
+
+
+# ----------------------------
+# Fast-path statistics
+# ----------------------------
+
+class FastPathStats:
+    """
+    Counts routed turns and how many of them were answered without the LLM.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.turns = 0
+        self.fast_path = 0
+        self.by_intent: dict[str, int] = {}
+
+    def record(self, intent: str | None) -> None:
+        with self._lock:
+            self.turns += 1
+            if intent is not None:
+                self.fast_path += 1
+                self.by_intent[intent] = self.by_intent.get(intent, 0) + 1
+
+    def snapshot(self) -> dict:
+        with self._lock:
+            return {
+                "turns": self.turns,
+                "fast_path": self.fast_path,
+                "llm": self.turns - self.fast_path,
+                "fast_path_fraction": self.fast_path / self.turns if self.turns else 0.0,
+                "by_intent": dict(self.by_intent),
+            }
+
+
+router_stats = FastPathStats()
+
+
+# ----------------------------
+# Message matching
+# ----------------------------
+
+# Leading phrases that still make "<phrase> <exact product name>" a plain lookup
+LOOKUP_PREFIXES = (
+    "tell me about",
+    "tell me more about",
+    "show me",
+    "info on",
+    "information on",
+    "information about",
+    "details for",
+    "details on",
+    "what is",
+    "what's",
+)
+
+GET_BRAND_RE = re.compile(
+    r"(what is|what's|whats) my (favorite|favourite|preferred) brand"
+    r"|do you (know|remember) my (brand )?preference"
+    r"|which brand do i (prefer|like)"
+)
+
+GET_LAST_PRODUCT_RE = re.compile(
+    r"(what|which) (was|is) the last product( i (asked|was asking) about)?"
+    r"|what (product )?were we (talking|discussing) about"
+)
+
+SAVE_BRAND_RE = re.compile(
+    r"(i prefer|my (favorite|favourite|preferred) brand is) (the )?(?P<brand>.+?)( brand| products)?"
+    r"|(?P<brand2>.+?) is my (favorite|favourite|preferred) brand"
+)
+
+
+def normalize_message(text: str) -> str:
+    """
+    Lowercase, collapse whitespace and drop trailing punctuation.
+    """
+    return " ".join(text.lower().split()).rstrip(" ?!.")
+
+
+def strip_lookup_prefix(text: str) -> str:
+    for prefix in LOOKUP_PREFIXES:
+        if text.startswith(prefix + " "):
+            text = text[len(prefix) + 1:]
+            break
+    if text.startswith("the "):
+        text = text[4:]
+    return text
+
+
+# ----------------------------
+# Catalog access
+# ----------------------------
+
+_catalog_unavailable = False
+
+
+def _catalog():
+    """
+    The in-process catalog snapshot, once it is loaded.
+
+    Only used with CATALOG_MODE=local, where the catalog agent runs in this
+    process anyway. In split deployments the support server has no dataset
+    (and a copy here would go stale when the catalog server reloads), so
+    product and brand turns go to the LLM and on to the remote catalog.
+
+    The router runs on the event loop, so it never loads the dataset
+    itself: until the server's warm-up (or the catalog agent's first tool
+    call) has built the snapshot, it returns None and turns use the LLM.
+    Also returns None (and stops trying) if the dataset cannot be loaded.
+    """
+    global _catalog_unavailable
+
+    if CATALOG_MODE != "local" or _catalog_unavailable:
+        return None
+    try:
+        from src.agents.product_catalog.loader import catalog_ready, get_snapshot
+        if not catalog_ready():
+            return None
+        return get_snapshot()
+    except Exception as e:
+        _catalog_unavailable = True
+        print(f"⚠️ Fast-path router: catalog unavailable, product lookups use the LLM ({e})")
+        return None
+
+
+def match_product(raw: str) -> str | None:
+    """
+    The catalog name the message asks about, if the message is (optionally
+    after a lookup phrase such as "tell me about") exactly a product name.
+    """
+    catalog = _catalog()
+    if catalog is None or catalog.name_index is None:
+        return None
+
+    exact = catalog.name_index.exact
+    text = raw.strip()
+
+    # Names are matched on lowercase + strip; keep inner spacing/punctuation
+    # as typed, but also accept the message without trailing punctuation
+    for candidate in (text, text.rstrip(" ?!.")):
+        lowered = candidate.lower()
+        for key in (lowered, strip_lookup_prefix(lowered)):
+            name_id = exact.get(key.strip())
+            if name_id is not None:
+                row = int(catalog.name_index.best_row[name_id])
+                return catalog.store.name.value(row).strip()
+    return None
+
+
+def match_brand(text: str) -> str | None:
+    """
+    The catalog's spelling of brand `text`, when the catalog knows it.
+    """
+    catalog = _catalog()
+    if catalog is None or catalog.brand_index is None:
+        return None
+
+    key = text.lower().strip()
+    if key not in catalog.brand_index.postings:
+        return None
+    return next(b.strip() for b in catalog.store.brand.categories if b.lower().strip() == key)
+
+
+# ----------------------------
+# Fast-path handlers
+# ----------------------------
+
+_lookup_tool = None
+
+
+async def product_lookup_reply(callback_context: CallbackContext, product_name: str) -> str:
+    """
+    The catalog answer for an exact product name. Cached answers come
+    straight from the tool cache; misses run on the catalog tool executor,
+    like the catalog agent's own calls, so a lookup never blocks the loop.
+    """
+    global _lookup_tool
+    from src.agents.product_catalog.executor import BUSY_MESSAGE, TIMEOUT_MESSAGE, async_tool
+
+    if _lookup_tool is None:
+        from src.agents.product_catalog.tools import get_product_info
+        _lookup_tool = async_tool(get_product_info)
+
+    info = await _lookup_tool(product_name)
+    if info in (BUSY_MESSAGE, TIMEOUT_MESSAGE):
+        return info
+
+    # Same memory update the LLM performs after a product lookup
+    save_last_product(callback_context, product_name)
+    return f"Here is what I found:\n\n{info}"
+
+
+def get_brand_reply(callback_context: CallbackContext) -> str:
+    brand = get_preferred_brand(callback_context)["preferred_brand"]
+    if brand:
+        return f"Your preferred brand is {brand}."
+    return "You haven't told me a preferred brand yet."
+
+
+def get_last_product_reply(callback_context: CallbackContext) -> str:
+    last = get_last_product(callback_context)
+    if not last["last_product"]:
+        return "We haven't looked at any product yet. Which product are you interested in?"
+
+    reply = f"The last product we discussed was {last['last_product']}."
+    if last["second_last_product"]:
+        reply += f" Before that: {last['second_last_product']}."
+    return reply
+
+
+def save_brand_reply(callback_context: CallbackContext, brand: str) -> str:
+    save_preferred_brand(callback_context, brand)
+    return f"Got it — I’ll remember {brand} as your preferred brand."
+
+
+async def route_message(callback_context: CallbackContext, message: str) -> tuple[str, str] | None:
+    """
+    `(intent, reply)` when the message can be answered deterministically,
+    otherwise None.
+    """
+    text = normalize_message(message)
+    if not text:
+        return None
+
+    if GET_BRAND_RE.fullmatch(text):
+        return "get_preferred_brand", get_brand_reply(callback_context)
+
+    if GET_LAST_PRODUCT_RE.fullmatch(text):
+        return "get_last_product", get_last_product_reply(callback_context)
+
+    m = SAVE_BRAND_RE.fullmatch(text)
+    if m:
+        brand = match_brand(m.group("brand") or m.group("brand2"))
+        if brand:
+            return "save_preferred_brand", save_brand_reply(callback_context, brand)
+        return None
+
+    product_name = match_product(message)
+    if product_name:
+        return "product_lookup", await product_lookup_reply(callback_context, product_name)
+
+    return None
+
+
+# ----------------------------
+# ADK callback
+# ----------------------------
+
+async def fast_path_router(callback_context: CallbackContext) -> Optional[types.Content]:
+    """
+    before_agent_callback for the customer support agent.
+
+    Returning Content ends the turn with that reply and skips the LLM (and
+    the A2A transfer); returning None lets the agent run normally. State
+    written through the memory tools is committed with the reply event.
+    """
+    content = callback_context.user_content
+    message = "".join(
+        part.text for part in (content.parts or []) if part.text
+    ) if content else ""
+
+    try:
+        routed = await route_message(callback_context, message)
+    except Exception as e:
+        print(f"⚠️ Fast-path router error, falling back to the LLM: {e}")
+        routed = None
+
+    router_stats.record(routed[0] if routed else None)
+
+    if routed is None:
+        return None
+
+    return types.Content(role="model", parts=[types.Part(text=routed[1])])
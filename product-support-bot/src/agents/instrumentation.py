@@ -0,0 +1,319 @@
+import asyncio
+import contextvars
+import functools
+import time
+from typing import Any, Optional
+
+from google.adk.agents import BaseAgent, LlmAgent
+from google.adk.runners import Runner
+
+from src.metrics import COUNT_BUCKETS, TOKEN_BUCKETS, registry, sample_event_loop_lag
+
+
+# ----------------------------
+# Metrics
+# ----------------------------
+
+TURN_SECONDS = registry.histogram(
+    "agent_turn_seconds", "End-to-end time of one runner turn", ("app",),
+)
+TURN_TOKENS = registry.histogram(
+    "agent_turn_llm_tokens", "LLM tokens (prompt + output) used by one turn", ("app",), buckets=TOKEN_BUCKETS,
+)
+TURN_LLM_CALLS = registry.histogram(
+    "agent_turn_llm_calls", "LLM calls made by one turn", ("app",), buckets=COUNT_BUCKETS,
+)
+TURN_TOOL_CALLS = registry.histogram(
+    "agent_turn_tool_calls", "Tool calls made by one turn", ("app",), buckets=COUNT_BUCKETS,
+)
+AGENT_SECONDS = registry.histogram(
+    "agent_run_seconds",
+    "Time spent in each agent, including its sub-agents (for a remote agent: the A2A hop)",
+    ("agent",),
+)
+LLM_SECONDS = registry.histogram(
+    "llm_call_seconds", "Time of one LLM call, including retries", ("agent", "model"),
+)
+LLM_CALLS = registry.counter(
+    "llm_calls_total", "LLM calls by outcome", ("agent", "model", "status"),
+)
+LLM_TOKENS = registry.counter(
+    "llm_tokens_total", "LLM tokens by kind (prompt, output, thoughts, cached)", ("agent", "kind"),
+)
+LLM_HTTP_ATTEMPTS = registry.counter(
+    "llm_http_attempts_total", "HTTP requests sent to the model API by status", ("status",),
+)
+LLM_HTTP_RETRIES = registry.counter(
+    "llm_http_retries_total", "Model API requests repeated by the retry policy",
+)
+TOOL_SECONDS = registry.histogram(
+    "tool_call_seconds", "Time of one tool call", ("agent", "tool"),
+)
+TOOL_CALLS = registry.counter(
+    "tool_calls_total", "Tool calls", ("agent", "tool"),
+)
+SESSION_SECONDS = registry.histogram(
+    "session_op_seconds", "Time of one session service operation", ("op",),
+)
+EVENT_LOOP_LAG = registry.histogram(
+    "event_loop_lag_seconds", "How late the server event loop runs a ready callback",
+)
+
+
+# ----------------------------
+# Per-turn accounting
+# ----------------------------
+
+class TurnStats:
+    """
+    Counters for the turn running in the current context, plus the start
+    times of the stages (agent runs, LLM calls, tool calls) still open.
+    """
+
+    __slots__ = ("starts", "tokens", "llm_calls", "tool_calls")
+
+    def __init__(self):
+        self.starts: dict[tuple, tuple[float, Any]] = {}
+        self.tokens = 0
+        self.llm_calls = 0
+        self.tool_calls = 0
+
+
+_turn: contextvars.ContextVar[Optional[TurnStats]] = contextvars.ContextVar("turn_stats", default=None)
+
+
+def current_turn() -> TurnStats:
+    turn = _turn.get()
+    if turn is None:
+        # Agent run without InstrumentedRunner (e.g. adk web): stage timings
+        # still work, per-turn histograms are simply not recorded
+        turn = TurnStats()
+        _turn.set(turn)
+    return turn
+
+
+class InstrumentedRunner(Runner):
+    """
+    Runner that records turn latency and per-turn LLM token, LLM call and
+    tool call counts. Stage timings come from the callbacks installed by
+    `instrument_agent`.
+    """
+
+    async def run_async(self, *args, **kwargs):
+        turn = TurnStats()
+        token = _turn.set(turn)
+        start = time.perf_counter()
+        try:
+            async for event in super().run_async(*args, **kwargs):
+                yield event
+        finally:
+            try:
+                _turn.reset(token)
+            except ValueError:
+                # Generator closed from another context
+                pass
+            TURN_SECONDS.observe(time.perf_counter() - start, app=self.app_name)
+            TURN_TOKENS.observe(turn.tokens, app=self.app_name)
+            TURN_LLM_CALLS.observe(turn.llm_calls, app=self.app_name)
+            TURN_TOOL_CALLS.observe(turn.tool_calls, app=self.app_name)
+
+
+# ----------------------------
+# ADK callbacks
+# ----------------------------
+
+def _before_agent(callback_context):
+    current_turn().starts[("agent", callback_context.invocation_id, callback_context.agent_name)] = (
+        time.perf_counter(), None,
+    )
+    return None
+
+
+def _after_agent(callback_context):
+    started = current_turn().starts.pop(
+        ("agent", callback_context.invocation_id, callback_context.agent_name), None,
+    )
+    if started is not None:
+        AGENT_SECONDS.observe(time.perf_counter() - started[0], agent=callback_context.agent_name)
+    return None
+
+
+def _before_model(callback_context, llm_request):
+    current_turn().starts[("llm", callback_context.invocation_id, callback_context.agent_name)] = (
+        time.perf_counter(), llm_request.model or "",
+    )
+    return None
+
+
+def _after_model(callback_context, llm_response):
+    # Streamed chunks share one call; it ends with the non-partial response
+    if llm_response.partial:
+        return None
+
+    agent = callback_context.agent_name
+    turn = current_turn()
+    started = turn.starts.pop(("llm", callback_context.invocation_id, agent), None)
+    model = started[1] if started is not None else ""
+    if started is not None:
+        LLM_SECONDS.observe(time.perf_counter() - started[0], agent=agent, model=model)
+    LLM_CALLS.inc(agent=agent, model=model, status="error" if llm_response.error_code else "ok")
+    turn.llm_calls += 1
+
+    usage = llm_response.usage_metadata
+    if usage is not None:
+        for kind, count in (
+            ("prompt", usage.prompt_token_count),
+            ("output", usage.candidates_token_count),
+            ("thoughts", usage.thoughts_token_count),
+            ("cached", usage.cached_content_token_count),
+        ):
+            if count:
+                LLM_TOKENS.inc(count, agent=agent, kind=kind)
+        turn.tokens += (usage.prompt_token_count or 0) + (usage.candidates_token_count or 0)
+    return None
+
+
+def _before_tool(tool, args, tool_context):
+    current_turn().starts[("tool", tool_context.function_call_id)] = (time.perf_counter(), None)
+    return None
+
+
+def _after_tool(tool, args, tool_context, tool_response):
+    turn = current_turn()
+    started = turn.starts.pop(("tool", tool_context.function_call_id), None)
+    if started is not None:
+        TOOL_SECONDS.observe(time.perf_counter() - started[0], agent=tool_context.agent_name, tool=tool.name)
+    TOOL_CALLS.inc(agent=tool_context.agent_name, tool=tool.name)
+    turn.tool_calls += 1
+    return None
+
+
+def _chain(callback, existing):
+    """
+    Run `callback` (which always returns None) before any existing callback(s).
+    """
+    if existing is None:
+        return callback
+    if isinstance(existing, list):
+        return [callback] + existing
+    return [callback, existing]
+
+
+# ----------------------------
+# Model API retries
+# ----------------------------
+
+_attempts: contextvars.ContextVar[Optional[list]] = contextvars.ContextVar("llm_attempts", default=None)
+
+
+def _instrument_genai_retries() -> None:
+    """
+    Count model API attempts and retries.
+
+    The google-genai client retries inside its private `_async_request`
+    (per `HttpRetryOptions`), calling `_async_request_once` per attempt, so
+    retries are invisible to ADK callbacks. Both methods are wrapped when
+    they exist; on a client version without them, retries are not counted.
+    """
+    try:
+        from google.genai._api_client import BaseApiClient
+    except ImportError:
+        return
+
+    request = getattr(BaseApiClient, "_async_request", None)
+    request_once = getattr(BaseApiClient, "_async_request_once", None)
+    if request is None or request_once is None or getattr(request, "_instrumented", False):
+        return
+
+    @functools.wraps(request_once)
+    async def counted_request_once(self, *args, **kwargs):
+        attempts = _attempts.get()
+        if attempts is not None:
+            attempts[0] += 1
+        try:
+            response = await request_once(self, *args, **kwargs)
+        except Exception as e:
+            LLM_HTTP_ATTEMPTS.inc(status=str(getattr(e, "code", None) or type(e).__name__))
+            raise
+        LLM_HTTP_ATTEMPTS.inc(status="ok")
+        return response
+
+    @functools.wraps(request)
+    async def counted_request(self, *args, **kwargs):
+        attempts = [0]
+        token = _attempts.set(attempts)
+        try:
+            return await request(self, *args, **kwargs)
+        finally:
+            _attempts.reset(token)
+            if attempts[0] > 1:
+                LLM_HTTP_RETRIES.inc(attempts[0] - 1)
+
+    counted_request._instrumented = True
+    BaseApiClient._async_request = counted_request
+    BaseApiClient._async_request_once = counted_request_once
+
+
+# ----------------------------
+# Installation
+# ----------------------------
+
+_instrumented: set[int] = set()
+
+
+def instrument_agent(agent: BaseAgent) -> BaseAgent:
+    """
+    Install timing / token / tool-call callbacks on `agent` and all its
+    sub-agents (once per agent). The metric callbacks run first and never
+    short-circuit, so existing callbacks such as the fast-path router keep
+    their behavior.
+    """
+    _instrument_genai_retries()
+
+    if id(agent) not in _instrumented:
+        _instrumented.add(id(agent))
+        agent.before_agent_callback = _chain(_before_agent, agent.before_agent_callback)
+        agent.after_agent_callback = _chain(_after_agent, agent.after_agent_callback)
+        if isinstance(agent, LlmAgent):
+            agent.before_model_callback = _chain(_before_model, agent.before_model_callback)
+            agent.after_model_callback = _chain(_after_model, agent.after_model_callback)
+            agent.before_tool_callback = _chain(_before_tool, agent.before_tool_callback)
+            agent.after_tool_callback = _chain(_after_tool, agent.after_tool_callback)
+
+    for sub_agent in agent.sub_agents:
+        instrument_agent(sub_agent)
+    return agent
+
+
+_lag_task: Optional[asyncio.Task] = None
+
+
+async def start_event_loop_lag_monitor() -> None:
+    """
+    Server startup hook: sample event loop lag into `event_loop_lag_seconds`
+    (blocking tool calls or serialization show up here first).
+    """
+    global _lag_task
+
+    if _lag_task is None or _lag_task.done():
+        _lag_task = asyncio.get_running_loop().create_task(
+            sample_event_loop_lag(EVENT_LOOP_LAG.observe)
+        )
+
+
+def instrument_session_service(service):
+    """
+    Time the session operations a turn performs (the session I/O stage).
+    """
+    for op in ("create_session", "get_session", "append_event", "delete_session"):
+        method = getattr(service, op)
+
+        async def timed(*args, _method=method, _op=op, **kwargs):
+            start = time.perf_counter()
+            try:
+                return await _method(*args, **kwargs)
+            finally:
+                SESSION_SECONDS.observe(time.perf_counter() - start, op=_op)
+
+        setattr(service, op, timed)
+    return service
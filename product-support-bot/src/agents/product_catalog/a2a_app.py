@@ -1,10 +1,35 @@
+import inspect
+from contextlib import asynccontextmanager
+
 from google.adk.a2a.utils.agent_to_a2a import to_a2a
 
+from src.agents.instrumentation import InstrumentedRunner, instrument_agent, start_event_loop_lag_monitor
+from src.memory_session_service import create_session_service
+
 from .agent import create_product_catalog_agent
 
-def create_a2a_app(port: int = 8001):
-    agent = create_product_catalog_agent()
-    return to_a2a(agent, port=port)
+def create_a2a_app(port: int = 8001, model=None, on_startup=()):
+    # LLM calls, tool calls, turn latency and event loop lag are recorded for /metrics
+    agent = instrument_agent(create_product_catalog_agent(model=model))
+    # A2A contexts map to sessions; keep them in the bounded in-memory store
+    runner = InstrumentedRunner(
+        agent=agent,
+        app_name=agent.name,
+        session_service=create_session_service("memory"),
+    )
+    # Starlette no longer has startup event handlers, so startup hooks
+    # (sync or async callables) run from the app lifespan instead
+    hooks = [start_event_loop_lag_monitor, *on_startup]
+
+    @asynccontextmanager
+    async def lifespan(app):
+        for hook in hooks:
+            result = hook()
+            if inspect.isawaitable(result):
+                await result
+        yield
+
+    return to_a2a(agent, port=port, runner=runner, lifespan=lifespan)
 
 
 #from fastapi import FastAPI
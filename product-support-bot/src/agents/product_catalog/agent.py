@@ -2,13 +2,29 @@ from google.adk.agents import LlmAgent
 from google.adk.models.google_llm import Gemini
 from google.genai import types
 
+from src.config import CATALOG_TOOL_WORKERS, require_google_api_key
+
+from .executor import async_tool
 from .tools import (
     get_product_info,
+    get_products_info,
     list_categories,
     list_brands,
     list_products,
+    search_catalog,
+    search_products,
 )
 
+CATALOG_TOOLS = [
+    get_product_info,
+    get_products_info,
+    list_categories,
+    list_brands,
+    list_products,
+    search_catalog,
+    search_products,
+]
+
 
 retry_config = types.HttpRetryOptions(
     attempts=5,
@@ -17,9 +33,18 @@ retry_config = types.HttpRetryOptions(
     http_status_codes=[429, 500, 503, 504],
 )
 
-def create_product_catalog_agent() -> LlmAgent:
+def create_product_catalog_agent(model=None, **agent_kwargs) -> LlmAgent:
+    """
+    `model` overrides the default Gemini model (e.g. a scripted stand-in
+    for offline benchmarks). `agent_kwargs` are passed on to the LlmAgent
+    (e.g. transfer restrictions when it runs as an in-process sub-agent).
+    """
+    if model is None:
+        require_google_api_key()
+        model = Gemini(model="gemini-2.5-flash-lite", retry_options=retry_config)
+
     agent = LlmAgent(
-        model=Gemini(model="gemini-2.5-flash-lite", retry_options=retry_config),
+        model=model,
         name="product_catalog_agent",
         description=(
     "External vendor's product catalog agent that supports product discovery "
@@ -34,9 +59,13 @@ You have access to a real electronics product dataset.
 
 You can perform the following actions using tools:
 - Look up a specific product using get_product_info
+- Look up and compare several products in ONE call using get_products_info
 - List available product categories using list_categories
 - List available brands (optionally filtered by category) using list_brands
 - List products by category and/or brand using list_products
+- Search for products by approximate name using search_catalog
+- Find products by price range, availability, store and weight using
+  search_products
 
 TOOL USAGE RULES:
 
@@ -49,9 +78,29 @@ TOOL USAGE RULES:
 - If the user asks to browse or see products from a category or brand:
   use list_products.
 
+- list_products and list_brands return one page and the total count.
+  When the user asks for more results, call the same tool again with the
+  same filters and the "Next cursor" value from the previous result.
+  Use sort="price_asc" or sort="price_desc" when the user asks for the
+  cheapest or most expensive products. Never show cursors to the user.
+
 - ONLY use get_product_info when the user is clearly asking about
   a specific product.
 
+- When the user asks to compare products, or asks about two or more
+  specific products, call get_products_info ONCE with all the names
+  instead of calling get_product_info for each.
+
+- If the user gives constraints such as a budget ("under $100"),
+  stock status ("in stock"), a store ("at Best Buy"), a weight limit or
+  asks for the cheapest / most expensive options: call search_products
+  ONCE with all of them instead of listing products and looking each one
+  up with get_product_info.
+
+- If the product name may be misspelled, partial or reordered, or
+  get_product_info finds nothing, call search_catalog ONCE and use
+  the top-ranked candidate instead of retrying with other spellings.
+
 - Never invent product data.
 - If no data is found, say so clearly.
 
@@ -74,12 +123,9 @@ If no data is found, explicitly say:
 Be professional and helpful.
 """,
 
-        tools=[
-    get_product_info,
-    list_categories,
-    list_brands,
-    list_products,
-],
+        # Off the event loop on the bounded tool pool unless CATALOG_TOOL_WORKERS=0
+        tools=[async_tool(tool) for tool in CATALOG_TOOLS] if CATALOG_TOOL_WORKERS > 0 else CATALOG_TOOLS,
 
+        **agent_kwargs,
     )
     return agent
@@ -0,0 +1,262 @@
+import functools
+import inspect
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Hashable
+
+
+_UNSET = object()
+
+
+def normalize_arg(value: Any) -> Hashable:
+    """
+    Cache-key form of a tool argument: strings are lowercased and stripped,
+    exactly as the catalog indexes normalize names (inner whitespace is
+    kept, since it can change a match); lists become tuples.
+    """
+    if isinstance(value, str):
+        return value.lower().strip()
+    if isinstance(value, (list, tuple)):
+        return tuple(normalize_arg(v) for v in value)
+    return value
+
+
+# ----------------------------
+# In-flight calls (single flight)
+# ----------------------------
+
+class Flight:
+    """
+    One computation in progress; identical calls arriving meanwhile block on
+    `result()` instead of computing it again.
+    """
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.value: Any = None
+        self.error: BaseException | None = None
+
+    def finish(self, value: Any = None, error: BaseException | None = None) -> None:
+        self.value = value
+        self.error = error
+        self.done.set()
+
+    def result(self) -> Any:
+        self.done.wait()
+        if self.error is not None:
+            raise self.error
+        return self.value
+
+
+# ----------------------------
+# Tool result cache (LRU + TTL)
+# ----------------------------
+
+class ToolResultCache:
+    """
+    Bounded memoization for catalog tool outputs.
+
+    Entries are evicted least-recently-used once `maxsize` is reached and
+    expire `ttl` seconds after they were stored. `version_fn` returns the
+    current dataset version; when it changes, the whole cache is dropped
+    so no result computed from an older dataset is ever served.
+
+    It also tracks computations in flight, so concurrent identical calls
+    share one (see `Flight`); `coalesced` counts the calls that waited for
+    another instead of computing.
+    """
+
+    def __init__(
+        self,
+        maxsize: int = 1024,
+        ttl: float = 300.0,
+        version_fn: Callable[[], Hashable] = lambda: None,
+    ):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.version_fn = version_fn
+
+        self._entries: OrderedDict[Hashable, tuple[float, Any]] = OrderedDict()
+        # (dataset version, key) -> computation in progress
+        self._flights: dict[tuple[Hashable, Hashable], Flight] = {}
+        self._version = None
+        self._lock = threading.Lock()
+
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+        self.invalidations = 0
+        self.coalesced = 0
+
+    def _check_version(self) -> None:
+        version = self.version_fn()
+        if version != self._version:
+            if self._entries:
+                self.invalidations += 1
+            self._entries.clear()
+            self._version = version
+
+    def get(self, key: Hashable) -> tuple[bool, Any]:
+        with self._lock:
+            self._check_version()
+
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return False, None
+
+            stored_at, value = entry
+            if time.monotonic() - stored_at > self.ttl:
+                del self._entries[key]
+                self.expirations += 1
+                self.misses += 1
+                return False, None
+
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return True, value
+
+    def peek(self, key: Hashable) -> tuple[bool, Any]:
+        """
+        Like `get`, but a miss is not counted: the caller is about to run
+        the tool, which looks the key up again.
+        """
+        with self._lock:
+            self._check_version()
+
+            entry = self._entries.get(key)
+            if entry is None or time.monotonic() - entry[0] > self.ttl:
+                return False, None
+
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return True, entry[1]
+
+    def put(self, key: Hashable, value: Any, version: Hashable = _UNSET) -> None:
+        """
+        Store `value`. When `version` is given and the dataset has moved on
+        since the value was computed, the stale result is discarded.
+        """
+        with self._lock:
+            self._check_version()
+            if version is not _UNSET and version != self._version:
+                return
+
+            self._entries[key] = (time.monotonic(), value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def start_flight(self, key: Hashable, version: Hashable) -> tuple[Flight, bool]:
+        """
+        (flight, leader): a new flight the caller must compute and `land`,
+        or the one already computing `key` on this dataset version.
+        """
+        with self._lock:
+            flight = self._flights.get((version, key))
+            if flight is not None:
+                self.coalesced += 1
+                return flight, False
+            flight = self._flights[(version, key)] = Flight()
+            return flight, True
+
+    def note_coalesced(self, count: int = 1) -> None:
+        """
+        Count calls that shared another caller's computation outside
+        `start_flight` (e.g. awaiting an identical call on the event loop).
+        """
+        with self._lock:
+            self.coalesced += count
+
+    def land(self, key: Hashable, version: Hashable, flight: Flight, value: Any = None,
+             error: BaseException | None = None) -> None:
+        with self._lock:
+            if self._flights.get((version, key)) is flight:
+                del self._flights[(version, key)]
+        flight.finish(value, error)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self) -> dict:
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "size": len(self._entries),
+                "maxsize": self.maxsize,
+                "ttl_seconds": self.ttl,
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": self.hits / lookups if lookups else 0.0,
+                "evictions": self.evictions,
+                "expirations": self.expirations,
+                "invalidations": self.invalidations,
+                "coalesced": self.coalesced,
+                "in_flight": len(self._flights),
+            }
+
+
+def cached_tool(cache: ToolResultCache, cacheable: Callable[[Any], bool] | None = None):
+    """
+    Decorator memoizing a tool on its normalized arguments. Concurrent
+    calls with the same normalized arguments run the tool once: the first
+    computes, the others wait for its result (or its exception).
+
+    Results for which `cacheable(result)` is False (e.g. replies that echo
+    the argument as typed) are handed to the waiting calls but not stored.
+
+    Uses functools.wraps, so ADK still sees the original name, signature
+    and docstring when it builds the tool declaration. `wrapper.peek(...)`
+    returns (found, result) from the cache without running the tool, and
+    `wrapper.key(...)` the normalized call both are keyed on.
+    """
+
+    def decorator(func):
+        signature = inspect.signature(func)
+
+        def cache_key(args, kwargs) -> tuple:
+            bound = signature.bind(*args, **kwargs)
+            bound.apply_defaults()
+            return (func.__name__,) + tuple(
+                (name, normalize_arg(value)) for name, value in bound.arguments.items()
+            )
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            key = cache_key(args, kwargs)
+            version = cache.version_fn()
+            found, value = cache.get(key)
+            if found:
+                return value
+
+            flight, leader = cache.start_flight(key, version)
+            if not leader:
+                return flight.result()
+
+            try:
+                value = func(*args, **kwargs)
+            except BaseException as e:
+                cache.land(key, version, flight, error=e)
+                raise
+            # Cached before the flight lands, so later callers hit the cache
+            if cacheable is None or cacheable(value):
+                cache.put(key, value, version=version)
+            cache.land(key, version, flight, value=value)
+            return value
+
+        def peek(*args, **kwargs) -> tuple[bool, Any]:
+            return cache.peek(cache_key(args, kwargs))
+
+        def key(*args, **kwargs) -> tuple:
+            return (cache.version_fn(),) + cache_key(args, kwargs)
+
+        wrapper.peek = peek
+        wrapper.key = key
+        wrapper.cache = cache
+        return wrapper
+
+    return decorator
@@ -0,0 +1,203 @@
+import asyncio
+import functools
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Any, Callable
+
+from src.config import CATALOG_TOOL_QUEUE, CATALOG_TOOL_TIMEOUT, CATALOG_TOOL_WORKERS
+from src.metrics import registry
+
+from .loader import catalog_ready
+
+
+# ----------------------------
+# Metrics
+# ----------------------------
+
+QUEUE_WAIT_SECONDS = registry.histogram(
+    "catalog_tool_queue_wait_seconds", "Time a catalog tool call waited for a pool thread", ("tool",),
+)
+REJECTED = registry.counter(
+    "catalog_tool_rejected_total", "Catalog tool calls turned away because the queue was full", ("tool",),
+)
+TIMEOUTS = registry.counter(
+    "catalog_tool_timeouts_total", "Catalog tool calls that missed their deadline", ("tool",),
+)
+
+BUSY_MESSAGE = "The catalog is busy right now. Please try again in a moment."
+TIMEOUT_MESSAGE = "The catalog lookup took too long. Please try again or narrow the request."
+
+
+class ToolBusy(Exception):
+    pass
+
+
+class ToolTimeout(Exception):
+    pass
+
+
+# ----------------------------
+# Bounded tool executor
+# ----------------------------
+
+class ToolExecutor:
+    """
+    Runs synchronous catalog tools on a bounded thread pool, so a slow scan
+    does not block the event loop serving every other A2A request.
+
+    - At most `max_workers` calls run at once; up to `max_queue` more wait
+      for a thread, and calls beyond that fail fast with `ToolBusy`.
+    - A call not finished within `timeout` seconds raises `ToolTimeout`.
+      A call still waiting for a thread is dropped; one already running
+      cannot be interrupted and finishes in the background (its result
+      still lands in the tool cache).
+
+    The pool is created on first use, so each pre-fork worker gets its own
+    threads.
+    """
+
+    def __init__(self, max_workers: int, max_queue: int, timeout: float):
+        self.max_workers = max_workers
+        self.max_queue = max_queue
+        self.timeout = timeout
+
+        self._pool: ThreadPoolExecutor | None = None
+        self._lock = threading.Lock()
+        self.queued = 0
+        self.running = 0
+        self.completed = 0
+        self.rejected = 0
+        self.timeouts = 0
+
+    def _get_pool(self) -> ThreadPoolExecutor:
+        with self._lock:
+            if self._pool is None:
+                self._pool = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix="catalog-tool")
+            return self._pool
+
+    def _abandon(self, future: Future) -> None:
+        # True if the call never started (or a cancelled wait already
+        # dropped it): it will not run, so it leaves the queue here
+        if future.cancel():
+            with self._lock:
+                self.queued -= 1
+
+    async def run(self, func: Callable[..., Any], *args, **kwargs) -> Any:
+        name = getattr(func, "__name__", "tool")
+        with self._lock:
+            if self.queued >= self.max_queue:
+                self.rejected += 1
+                REJECTED.inc(tool=name)
+                raise ToolBusy(name)
+            self.queued += 1
+
+        submitted = time.perf_counter()
+
+        def call():
+            with self._lock:
+                self.queued -= 1
+                self.running += 1
+            QUEUE_WAIT_SECONDS.observe(time.perf_counter() - submitted, tool=name)
+            try:
+                return func(*args, **kwargs)
+            finally:
+                with self._lock:
+                    self.running -= 1
+                    self.completed += 1
+
+        future = self._get_pool().submit(call)
+        try:
+            return await asyncio.wait_for(asyncio.wrap_future(future), self.timeout)
+        except asyncio.TimeoutError:
+            self._abandon(future)
+            with self._lock:
+                self.timeouts += 1
+            TIMEOUTS.inc(tool=name)
+            raise ToolTimeout(name)
+        except asyncio.CancelledError:
+            self._abandon(future)
+            raise
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "max_workers": self.max_workers,
+                "max_queue": self.max_queue,
+                "timeout_seconds": self.timeout,
+                "queued": self.queued,
+                "running": self.running,
+                "completed": self.completed,
+                "rejected": self.rejected,
+                "timeouts": self.timeouts,
+            }
+
+
+tool_executor = ToolExecutor(
+    max_workers=max(CATALOG_TOOL_WORKERS, 1),
+    max_queue=CATALOG_TOOL_QUEUE,
+    timeout=CATALOG_TOOL_TIMEOUT,
+)
+
+registry.gauge_fn("catalog_tool_queue_depth", "Catalog tool calls waiting for a pool thread",
+                  lambda: tool_executor.stats()["queued"])
+registry.gauge_fn("catalog_tool_running", "Catalog tool calls running on the pool",
+                  lambda: tool_executor.stats()["running"])
+
+
+def async_tool(func: Callable[..., str], executor: ToolExecutor = tool_executor) -> Callable[..., Any]:
+    """
+    Async variant of a synchronous catalog tool for the agent: cached
+    results are returned straight from the event loop, a call identical to
+    one already running awaits that one (without taking a pool thread or a
+    queue slot; counted as coalesced in the tool cache), and everything
+    else runs on `executor`. Busy and timed-out calls return a message the
+    model can relay instead of failing the turn.
+
+    Cache keys include the catalog version, and resolving it loads a cold
+    catalog. Until the catalog is ready, calls therefore skip the cache
+    check and go straight to the pool, where the tool's own cache still
+    coalesces them, so the load never blocks the event loop.
+
+    functools.wraps keeps the name, signature and docstring ADK uses for
+    the tool declaration.
+    """
+    peek = getattr(func, "peek", None)
+    key = getattr(func, "key", None)
+    cache = getattr(func, "cache", None)
+    # (event loop, call key) -> the shared run of that call
+    pending: dict[tuple, asyncio.Future] = {}
+
+    def shared_run(args, kwargs) -> asyncio.Future:
+        if key is None:
+            return asyncio.ensure_future(executor.run(func, *args, **kwargs))
+
+        call = (asyncio.get_running_loop(), key(*args, **kwargs))
+        future = pending.get(call)
+        if future is not None:
+            if cache is not None:
+                cache.note_coalesced()
+            return future
+
+        future = pending[call] = asyncio.ensure_future(executor.run(func, *args, **kwargs))
+        future.add_done_callback(lambda _: pending.pop(call, None))
+        return future
+
+    @functools.wraps(func)
+    async def wrapper(*args, **kwargs):
+        ready = catalog_ready()
+        if ready and peek is not None:
+            found, value = peek(*args, **kwargs)
+            if found:
+                return value
+        try:
+            if not ready:
+                return await executor.run(func, *args, **kwargs)
+            # Shielded: one caller going away does not cancel the others' result
+            return await asyncio.shield(shared_run(args, kwargs))
+        except ToolBusy:
+            return BUSY_MESSAGE
+        except ToolTimeout:
+            return TIMEOUT_MESSAGE
+
+    return wrapper
@@ -0,0 +1,294 @@
+from typing import Callable, Iterable
+
+import numpy as np
+import pandas as pd
+
+
+# ----------------------------
+# Product name index
+# ----------------------------
+
+NGRAM_SIZE = 3
+
+
+def name_ngrams(text: str, n: int = NGRAM_SIZE) -> set[str]:
+    """
+    Character n-grams of an already-normalized string.
+    """
+    return {text[i:i + n] for i in range(len(text) - n + 1)}
+
+
+class ProductNameIndex:
+    """
+    Lookup structure over the normalized product names, built once at load time.
+
+    - `exact` maps a lowercased/stripped name to its name id.
+    - `postings` maps each character trigram to the sorted ids of the names
+      containing it, so substring lookups only verify a handful of candidates
+      instead of scanning every row.
+
+    Rows sharing a name are collapsed into one entry whose `best_row` is the
+    cheapest priced row (or the first row when none is priced), which is the
+    row `get_product_info` reports.
+
+    `orderings` holds every name id in each stable browse order ("name",
+    "price_asc", "price_desc"; ties and unpriced names fall back to name
+    order), so a filtered listing is a mask over a precomputed order.
+    """
+
+    def __init__(self, names: pd.Series, prices: np.ndarray | None = None):
+        normalized = names.astype(str).str.lower().str.strip()
+        valid = names.notna().to_numpy()
+
+        if prices is None:
+            price_values = np.full(len(names), np.nan)
+        else:
+            price_values = np.asarray(prices, dtype=float)
+
+        # Cheapest priced row first, then unpriced rows in dataset order
+        positions = np.arange(len(names))
+        order = np.lexsort((positions, price_values))
+
+        self.exact: dict[str, int] = {}
+        self.names: list[str] = []
+        best_row: list[int] = []
+        best_price: list[float] = []
+        first_row: list[int] = []
+        self.row_name_id = np.full(len(names), -1, dtype=np.int64)
+
+        normalized_values = normalized.to_numpy()
+        for pos in order:
+            if not valid[pos]:
+                continue
+            key = normalized_values[pos]
+            name_id = self.exact.get(key)
+            if name_id is None:
+                self.exact[key] = len(self.names)
+                self.names.append(key)
+                best_row.append(pos)
+                best_price.append(price_values[pos])
+                first_row.append(pos)
+            elif pos < first_row[name_id]:
+                first_row[name_id] = pos
+            self.row_name_id[pos] = self.exact[key]
+
+        self.best_row = np.asarray(best_row, dtype=np.int64)
+        self.best_price = np.asarray(best_price, dtype=float)
+        self.first_row = np.asarray(first_row, dtype=np.int64)
+
+        by_name = np.asarray(
+            sorted(range(len(self.names)), key=self.names.__getitem__), dtype=np.int64,
+        )
+        name_rank = np.empty(len(by_name), dtype=np.int64)
+        name_rank[by_name] = np.arange(len(by_name))
+        # lexsort puts NaN (unpriced) last in both price orders
+        self.orderings: dict[str, np.ndarray] = {
+            "name": by_name,
+            "price_asc": np.lexsort((name_rank, self.best_price)),
+            "price_desc": np.lexsort((name_rank, -self.best_price)),
+        }
+
+        grams: dict[str, list[int]] = {}
+        for name_id, key in enumerate(self.names):
+            for gram in name_ngrams(key):
+                grams.setdefault(gram, []).append(name_id)
+
+        self.postings: dict[str, np.ndarray] = {
+            gram: np.asarray(ids, dtype=np.int32) for gram, ids in grams.items()
+        }
+
+    def __len__(self) -> int:
+        return len(self.names)
+
+    def _substring_candidates(self, query: str) -> np.ndarray:
+        if len(query) < NGRAM_SIZE:
+            return np.arange(len(self.names), dtype=np.int32)
+
+        lists = []
+        for gram in name_ngrams(query):
+            ids = self.postings.get(gram)
+            if ids is None:
+                return np.empty(0, dtype=np.int32)
+            lists.append(ids)
+
+        lists.sort(key=len)
+        candidates = lists[0]
+        for ids in lists[1:]:
+            candidates = np.intersect1d(candidates, ids, assume_unique=True)
+            if len(candidates) == 0:
+                break
+        return candidates
+
+    def find_substring(self, query: str) -> list[int]:
+        """
+        Ids of all names containing `query` verbatim.
+        """
+        return [
+            int(name_id)
+            for name_id in self._substring_candidates(query)
+            if query in self.names[name_id]
+        ]
+
+    def lookup(self, product_name: str) -> int | None:
+        """
+        Resolve a product name to a dataset row position.
+
+        An exact (case-insensitive) name match wins; otherwise the cheapest
+        row among names containing the query. Returns None when nothing matches.
+        """
+        query = product_name.lower().strip()
+
+        name_id = self.exact.get(query)
+        if name_id is not None:
+            return int(self.best_row[name_id])
+
+        matches = self.find_substring(query)
+        if not matches:
+            return None
+
+        ids = np.asarray(matches)
+        prices = self.best_price[ids]
+        if np.isfinite(prices).any():
+            best = ids[np.nanargmin(prices)]
+        else:
+            best = ids[np.argmin(self.first_row[ids])]
+        return int(self.best_row[best])
+
+    def names_in(self, row_mask: np.ndarray) -> np.ndarray:
+        """
+        Boolean mask over name ids: names with at least one row in `row_mask`.
+        """
+        name_ids = self.row_name_id[row_mask]
+        mask = np.zeros(len(self.names), dtype=bool)
+        mask[name_ids[name_ids >= 0]] = True
+        return mask
+
+    def ordered(self, sort: str, name_mask: np.ndarray | None = None) -> np.ndarray:
+        """
+        Name ids selected by `name_mask` (all if None) in browse order `sort`.
+        """
+        order = self.orderings[sort]
+        return order if name_mask is None else order[name_mask[order]]
+
+    def lookup_many(self, product_names: list[str]) -> np.ndarray:
+        """
+        Row positions for several product names at once (-1 where nothing
+        matches). Exact names resolve in one pass over the hash index; only
+        the misses fall back to the substring search of `lookup`.
+        """
+        queries = [name.lower().strip() for name in product_names]
+        name_ids = np.fromiter(
+            (self.exact.get(q, -1) for q in queries), dtype=np.int64, count=len(queries)
+        )
+
+        rows = np.full(len(queries), -1, dtype=np.int64)
+        hits = name_ids >= 0
+        rows[hits] = self.best_row[name_ids[hits]]
+
+        for i in np.flatnonzero(~hits):
+            row = self.lookup(queries[i])
+            if row is not None:
+                rows[i] = row
+        return rows
+
+
+# ----------------------------
+# Row bitmap index (categories, brands)
+# ----------------------------
+
+class RowBitmapIndex:
+    """
+    Inverted index from keys to dataset rows.
+
+    Every distinct column value is expanded into keys once (e.g. category
+    tokens, or the normalized brand), and each key stores the sorted row
+    positions it appears in. Filters are answered as NumPy boolean row
+    bitmaps, so they combine with `&` / `|` across indexes.
+    """
+
+    def __init__(self, values: pd.Series, keys_for: Callable[[str], Iterable[str]]):
+        codes, uniques = pd.factorize(values)
+        self.size = len(values)
+        self.row_codes = codes
+
+        # Row positions grouped by value code (missing values have code -1)
+        order = np.argsort(codes, kind="stable")
+        bounds = np.searchsorted(codes[order], np.arange(len(uniques) + 1))
+
+        self.value_keys: list[tuple[str, ...]] = []
+        parts: dict[str, list[np.ndarray]] = {}
+        for code, value in enumerate(uniques):
+            keys = tuple(dict.fromkeys(keys_for(str(value))))
+            self.value_keys.append(keys)
+            rows = order[bounds[code]:bounds[code + 1]]
+            for key in keys:
+                parts.setdefault(key, []).append(rows)
+
+        self.postings: dict[str, np.ndarray] = {
+            key: np.sort(np.concatenate(rows)).astype(np.int64)
+            for key, rows in parts.items()
+        }
+
+    def rows(self, key: str) -> np.ndarray:
+        return self.postings.get(key, np.empty(0, dtype=np.int64))
+
+    def mask(self, keys: Iterable[str]) -> np.ndarray:
+        """
+        Boolean bitmap of rows matching ANY of `keys`.
+        """
+        mask = np.zeros(self.size, dtype=bool)
+        for key in keys:
+            rows = self.postings.get(key)
+            if rows is not None:
+                mask[rows] = True
+        return mask
+
+    def keys_in(self, mask: np.ndarray | None = None) -> set[str]:
+        """
+        Distinct keys present in the rows selected by `mask` (all rows if None).
+        """
+        codes = self.row_codes if mask is None else self.row_codes[mask]
+        present = np.unique(codes)
+        return {
+            key
+            for code in present[present >= 0]
+            for key in self.value_keys[code]
+        }
+
+
+# ----------------------------
+# Sorted numeric index (prices, weights)
+# ----------------------------
+
+class SortedNumericIndex:
+    """
+    Row positions sorted by a numeric column, for range filters.
+
+    A range is two binary searches over `values`, and the matching rows come
+    out already in ascending order, so "under $100, cheapest first" needs
+    no sort at query time. Rows whose value is missing (NaN) are left out.
+    """
+
+    def __init__(self, values: np.ndarray):
+        values = np.asarray(values, dtype=float)
+        self.size = len(values)
+        present = np.flatnonzero(~np.isnan(values))
+        self.rows = present[np.argsort(values[present], kind="stable")]
+        self.values = values[self.rows]
+
+    def range_rows(self, low: float | None = None, high: float | None = None) -> np.ndarray:
+        """
+        Rows with `low <= value <= high` in ascending value order (None = unbounded).
+        """
+        start = 0 if low is None else int(np.searchsorted(self.values, low, side="left"))
+        end = len(self.values) if high is None else int(np.searchsorted(self.values, high, side="right"))
+        return self.rows[start:max(start, end)]
+
+    def mask(self, low: float | None = None, high: float | None = None) -> np.ndarray:
+        """
+        Boolean bitmap of rows in the range, to combine with other filters.
+        """
+        mask = np.zeros(self.size, dtype=bool)
+        mask[self.range_rows(low, high)] = True
+        return mask
+
@@ -1,16 +1,300 @@
-from src.config import DATA_CSV_PATH
-from src.data.loader import load_products_df, detect_columns
-
-products_df = load_products_df(DATA_CSV_PATH, nrows=2000)
-columns = detect_columns(products_df)
-
-name_col        = columns["name_col"]
-price_min_col   = columns["price_min_col"]
-price_max_col   = columns["price_max_col"]
-availability_col= columns["availability_col"]
-store_col       = columns["store_col"]
-category_col    = columns["category_col"]
-url_col         = columns["url_col"]
-weight_col      = columns["weight_col"]
-brand_col       = columns["brand_col"]
-image_url_col   = columns["image_url_col"]
+import threading
+import time
+
+import pandas as pd
+
+from src.config import DATA_CSV_PATH, DATA_CACHE_DIR, DATA_MAX_ROWS
+from src.data.loader import load_products_df, detect_columns, source_fingerprint
+
+from .indexes import ProductNameIndex, RowBitmapIndex, SortedNumericIndex
+from .search import ProductSearchIndex
+from .store import Availability, ProductStore
+from .text import merchant_key, tokenize
+
+
+# ----------------------------
+# Catalog snapshot
+# ----------------------------
+
+class CatalogSnapshot:
+    """
+    One loaded dataset: its detected columns, the compact product store
+    and the indexes built over it.
+
+    Snapshots are never mutated after construction. Tools grab the current
+    snapshot once per call, so a reload can build a new one in the
+    background and swap it in without readers ever seeing a half-built state.
+    The wide source DataFrame is not retained; tools read from `store`.
+    """
+
+    def __init__(self, products_df: pd.DataFrame, version: str, source: str | None = None):
+        self.version = version
+        self.source = source
+        self.loaded_at = time.time()
+
+        self.columns = detect_columns(products_df)
+        self.name_col         = self.columns["name_col"]
+        self.price_min_col    = self.columns["price_min_col"]
+        self.price_max_col    = self.columns["price_max_col"]
+        self.availability_col = self.columns["availability_col"]
+        self.store_col        = self.columns["store_col"]
+        self.category_col     = self.columns["category_col"]
+        self.url_col          = self.columns["url_col"]
+        self.weight_col       = self.columns["weight_col"]
+        self.brand_col        = self.columns["brand_col"]
+        self.image_url_col    = self.columns["image_url_col"]
+
+        self.store = ProductStore(products_df, self.columns)
+        store = self.store
+
+        # Built once here so lookups never copy or re-normalize the data
+        self.name_index = (
+            ProductNameIndex(store.name.to_series(), store.sort_price)
+            if store.name is not None
+            else None
+        )
+
+        # Category token -> rows and normalized brand -> rows, for discovery filters
+        self.category_index = (
+            RowBitmapIndex(store.category.to_series(), tokenize)
+            if store.category is not None
+            else None
+        )
+        self.brand_index = (
+            RowBitmapIndex(store.brand.to_series(), lambda b: [b.lower().strip()])
+            if store.brand is not None
+            else None
+        )
+
+        # Attribute filters: rows sorted by price / weight for binary-search
+        # ranges, and merchant / availability-state bitmaps
+        self.price_index = (
+            SortedNumericIndex(store.sort_price)
+            if store.sort_price is not None
+            else None
+        )
+        self.weight_index = (
+            SortedNumericIndex(store.weight_lb)
+            if store.weight_lb is not None
+            else None
+        )
+        self.merchant_index = (
+            RowBitmapIndex(store.store.to_series(), lambda m: [merchant_key(m)])
+            if store.store is not None
+            else None
+        )
+        self.availability_index = RowBitmapIndex(
+            pd.Series(pd.Categorical.from_codes(
+                store.availability_state, [state.name.lower() for state in Availability],
+            )),
+            lambda state: [state],
+        )
+
+        # Ranked search over one document per distinct product name
+        self.search_index = None
+        if self.name_index is not None:
+            self.search_index = ProductSearchIndex([
+                " ".join(
+                    value or ""
+                    for value in (record.name, record.brand, record.category)
+                )
+                for record in map(store.record, self.name_index.best_row)
+            ])
+
+    def info(self) -> dict:
+        return {
+            "version": self.version,
+            "source": self.source,
+            "rows": self.store.size,
+            "products": len(self.name_index) if self.name_index is not None else 0,
+            "store_bytes": self.store.nbytes,
+            "loaded_at": self.loaded_at,
+        }
+
+
+def build_snapshot(
+    csv_path: str = DATA_CSV_PATH,
+    nrows: int | None = DATA_MAX_ROWS,
+    cache_dir: str | None = DATA_CACHE_DIR,
+) -> CatalogSnapshot:
+    # Fingerprint before reading, so a file replaced mid-load is picked up
+    # again by the next reload rather than hidden behind a stale version
+    version = source_fingerprint(csv_path, nrows=nrows)
+    products_df = load_products_df(csv_path, nrows=nrows, cache_dir=cache_dir)
+    return CatalogSnapshot(products_df, version=version, source=csv_path)
+
+
+# ----------------------------
+# Current snapshot & hot reload
+# ----------------------------
+
+# Built on first use (or by warm_catalog at server startup), not at import
+_snapshot: CatalogSnapshot | None = None
+_reload_lock = threading.Lock()
+_reload_thread: threading.Thread | None = None
+_warm_thread: threading.Thread | None = None
+_last_reload_error: str | None = None
+
+
+def get_snapshot() -> CatalogSnapshot:
+    """
+    The live snapshot. The first call loads the dataset and builds the
+    indexes; concurrent first callers wait for that one build.
+    """
+    snapshot = _snapshot
+    if snapshot is not None:
+        return snapshot
+    return warm_catalog()
+
+
+def warm_catalog() -> CatalogSnapshot:
+    """
+    Load the dataset and build every index now, if not done yet.
+    """
+    global _snapshot, _last_reload_error
+
+    with _reload_lock:
+        if _snapshot is None:
+            try:
+                _snapshot = build_snapshot()
+            except Exception as e:
+                _last_reload_error = f"{type(e).__name__}: {e}"
+                raise
+            _last_reload_error = None
+        return _snapshot
+
+
+def warm_catalog_in_background() -> threading.Thread:
+    """
+    Start `warm_catalog` on a daemon thread, so a server can accept
+    connections (and answer readiness probes) while the catalog loads.
+    """
+    global _warm_thread
+
+    def run():
+        try:
+            warm_catalog()
+        except Exception:
+            # Recorded in reload_status(); the next get_snapshot() retries
+            pass
+
+    if _warm_thread is None or not _warm_thread.is_alive():
+        _warm_thread = threading.Thread(target=run, name="catalog-warm", daemon=True)
+        _warm_thread.start()
+    return _warm_thread
+
+
+def catalog_ready() -> bool:
+    return _snapshot is not None
+
+
+def reload_catalog(csv_path: str | None = None, force: bool = False) -> CatalogSnapshot:
+    """
+    Build a fresh snapshot and swap it in atomically.
+
+    Skips the rebuild when the source fingerprint is unchanged (unless
+    `force`). Readers keep using the old snapshot until the swap, which is a
+    single reference assignment.
+    """
+    global _snapshot, _last_reload_error
+
+    with _reload_lock:
+        current = _snapshot
+        csv_path = csv_path or (current.source if current is not None else None) or DATA_CSV_PATH
+
+        if (
+            current is not None
+            and not force
+            and source_fingerprint(csv_path, nrows=DATA_MAX_ROWS) == current.version
+        ):
+            return current
+
+        try:
+            snapshot = build_snapshot(csv_path)
+        except Exception as e:
+            _last_reload_error = f"{type(e).__name__}: {e}"
+            raise
+
+        _last_reload_error = None
+        _snapshot = snapshot
+        return snapshot
+
+
+def reload_catalog_in_background(csv_path: str | None = None, force: bool = False) -> bool:
+    """
+    Start `reload_catalog` on a daemon thread.
+
+    Returns False if a background reload is already running.
+    """
+    global _reload_thread
+
+    if _reload_thread is not None and _reload_thread.is_alive():
+        return False
+
+    def run():
+        try:
+            reload_catalog(csv_path, force=force)
+        except Exception:
+            # Recorded in reload_status(); the previous snapshot stays live
+            pass
+
+    _reload_thread = threading.Thread(target=run, name="catalog-reload", daemon=True)
+    _reload_thread.start()
+    return True
+
+
+def reload_status() -> dict:
+    snapshot = _snapshot
+    return {
+        **(snapshot.info() if snapshot is not None else {"version": None}),
+        "ready": snapshot is not None,
+        "reloading": _reload_thread is not None and _reload_thread.is_alive(),
+        "last_error": _last_reload_error,
+    }
+
+
+def watch_catalog_file(interval: float) -> threading.Thread:
+    """
+    Poll the dataset file every `interval` seconds and reload it in the
+    background whenever its fingerprint changes.
+    """
+
+    def run():
+        while True:
+            time.sleep(interval)
+            current = _snapshot
+            if current is None:
+                continue
+            try:
+                changed = source_fingerprint(current.source, nrows=DATA_MAX_ROWS) != current.version
+            except OSError:
+                # File is being replaced; try again on the next tick
+                continue
+            if changed:
+                reload_catalog_in_background()
+
+    thread = threading.Thread(target=run, name="catalog-watch", daemon=True)
+    thread.start()
+    return thread
+
+
+# ----------------------------
+# Backward-compatible module attributes
+# ----------------------------
+
+_SNAPSHOT_ATTRS = {
+    "store", "columns",
+    "name_col", "price_min_col", "price_max_col", "availability_col", "store_col",
+    "category_col", "url_col", "weight_col", "brand_col", "image_url_col",
+    "name_index", "category_index", "brand_index", "search_index",
+    "price_index", "weight_index", "merchant_index", "availability_index",
+}
+
+
+def __getattr__(name):
+    # Always resolved against the current snapshot, so they follow reloads
+    if name in _SNAPSHOT_ATTRS:
+        return getattr(get_snapshot(), name)
+    if name == "dataset_version":
+        return get_snapshot().version
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -0,0 +1,115 @@
+import re
+from array import array
+from collections import Counter
+
+import numpy as np
+import pandas as pd
+
+from .indexes import NGRAM_SIZE
+from .text import tokenize
+
+
+# ----------------------------
+# Ranked product search (BM25)
+# ----------------------------
+
+BM25_K1 = 1.2
+BM25_B = 0.75
+
+# Word matches count for more than a single shared trigram
+WORD_WEIGHT = 2.0
+
+
+def search_terms(text: str) -> Counter:
+    """
+    Terms for one document or query.
+
+    Whole words (`w:` prefix) reward exact tokens, while character trigrams
+    over the text with punctuation and spaces removed make misspelled,
+    hyphenated or reordered model names ("wh1000xm3" vs "WH-1000XM3")
+    still overlap.
+    """
+    terms = Counter(f"w:{token}" for token in tokenize(text))
+    compact = re.sub(r"[^a-z0-9]+", "", text.lower())
+    terms.update(compact[i:i + NGRAM_SIZE] for i in range(len(compact) - NGRAM_SIZE + 1))
+    return terms
+
+
+class ProductSearchIndex:
+    """
+    BM25 index over product name, brand and category.
+
+    Documents are the distinct product names of a `ProductNameIndex`
+    (doc id == name id), so results are not flooded with the same product
+    listed by several merchants. Per-(term, doc) BM25 weights are precomputed
+    at build time; a query is a handful of vectorized score additions plus
+    a top-k partition.
+    """
+
+    def __init__(self, doc_texts: list[str]):
+        self.size = len(doc_texts)
+
+        # Flat (term id, doc, tf) triples in compact int arrays, grouped by term below
+        vocab: dict[str, int] = {}
+        term_ids = array("i")
+        docs = array("i")
+        tfs = array("i")
+        doc_len = np.zeros(self.size, dtype=float)
+        for doc_id, text in enumerate(doc_texts):
+            counts = search_terms(text)
+            term_ids.extend([vocab.setdefault(term, len(vocab)) for term in counts])
+            tfs.extend(counts.values())
+            docs.extend([doc_id] * len(counts))
+            doc_len[doc_id] = sum(counts.values())
+
+        term_codes = np.frombuffer(term_ids, dtype=np.int32)
+        doc_ids = np.frombuffer(docs, dtype=np.int32)
+        tf = np.frombuffer(tfs, dtype=np.int32).astype(float)
+        terms = pd.Index(list(vocab))
+
+        doc_freq = np.bincount(term_codes, minlength=len(terms))
+        idf = np.log(1.0 + (self.size - doc_freq + 0.5) / (doc_freq + 0.5))
+        boost = np.where(terms.str.startswith("w:"), WORD_WEIGHT, 1.0)
+
+        avg_len = doc_len.mean() if self.size else 1.0
+        norm = BM25_K1 * (1.0 - BM25_B + BM25_B * doc_len[doc_ids] / avg_len)
+        weight = (idf * boost)[term_codes] * tf * (BM25_K1 + 1.0) / (tf + norm)
+
+        order = np.argsort(term_codes, kind="stable")
+        bounds = np.searchsorted(term_codes[order], np.arange(len(terms) + 1))
+        doc_ids = doc_ids[order]
+        weight = weight[order].astype(np.float32)
+
+        self.postings: dict[str, tuple[np.ndarray, np.ndarray]] = {
+            term: (doc_ids[bounds[i]:bounds[i + 1]], weight[bounds[i]:bounds[i + 1]])
+            for i, term in enumerate(terms)
+        }
+
+    def scores(self, query: str) -> np.ndarray:
+        """
+        BM25 score of every document for `query` (0 where nothing matches).
+        """
+        scores = np.zeros(self.size, dtype=np.float32)
+        for term, count in search_terms(query).items():
+            posting = self.postings.get(term)
+            if posting is not None:
+                ids, weight = posting
+                scores[ids] += count * weight
+        return scores
+
+    def search(self, query: str, top_k: int = 5) -> list[tuple[int, float]]:
+        """
+        Top-k `(doc_id, score)` pairs for `query`, best first.
+        """
+        scores = self.scores(query)
+
+        matched = np.flatnonzero(scores)
+        if len(matched) == 0:
+            return []
+
+        if len(matched) > top_k:
+            top = np.argpartition(-scores[matched], top_k - 1)[:top_k]
+            matched = matched[top]
+
+        ranked = matched[np.argsort(-scores[matched], kind="stable")]
+        return [(int(doc_id), float(scores[doc_id])) for doc_id in ranked]
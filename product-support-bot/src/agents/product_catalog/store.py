@@ -0,0 +1,328 @@
+import enum
+import re
+
+import numpy as np
+import pandas as pd
+
+
+# ----------------------------
+# Availability enum
+# ----------------------------
+
+class Availability(enum.IntEnum):
+    UNKNOWN = 0
+    IN_STOCK = 1
+    LIMITED_STOCK = 2
+    SPECIAL_ORDER = 3
+    OUT_OF_STOCK = 4
+    DISCONTINUED = 5
+
+
+def classify_availability(text: str | None) -> Availability:
+    """
+    Map the free-text availability values seen in the dataset
+    ("In Stock", "yes", "TRUE", "7 available", "More on the Way", ...)
+    onto a small enum.
+    """
+    if text is None:
+        return Availability.UNKNOWN
+
+    t = str(text).lower().strip()
+
+    if "limited" in t:
+        return Availability.LIMITED_STOCK
+    if "special order" in t or "backorder" in t or "pre-order" in t or "preorder" in t:
+        return Availability.SPECIAL_ORDER
+    if "retired" in t or "discontinued" in t:
+        return Availability.DISCONTINUED
+    if "out of stock" in t or "more on the way" in t or t in {"no", "false", "sold", "sold out"}:
+        return Availability.OUT_OF_STOCK
+    if "in stock" in t or t.endswith("available") or t in {"yes", "true", "instock"}:
+        return Availability.IN_STOCK
+    return Availability.UNKNOWN
+
+
+# ----------------------------
+# Column storage
+# ----------------------------
+
+class CodedColumn:
+    """
+    Categorical column: one int32 code per row (-1 for missing) into a
+    list of interned category strings.
+    """
+
+    __slots__ = ("codes", "categories")
+
+    def __init__(self, codes: np.ndarray, categories: list[str]):
+        self.codes = codes
+        self.categories = categories
+
+    @classmethod
+    def from_series(cls, series: pd.Series) -> "CodedColumn":
+        codes, uniques = pd.factorize(series)
+        return cls(codes.astype(np.int32), [str(u) for u in uniques])
+
+    def value(self, row: int) -> str | None:
+        code = self.codes[row]
+        return self.categories[code] if code >= 0 else None
+
+    def to_series(self) -> pd.Series:
+        return pd.Series(pd.Categorical.from_codes(self.codes, self.categories))
+
+    @property
+    def nbytes(self) -> int:
+        return self.codes.nbytes + sum(len(c) + 49 for c in self.categories)
+
+
+class TextColumn:
+    """
+    Free-text column packed into one UTF-8 buffer plus row offsets, so a
+    row costs its encoded length plus 9 bytes instead of a Python object.
+    """
+
+    __slots__ = ("buffer", "offsets", "valid")
+
+    def __init__(self, buffer: bytes, offsets: np.ndarray, valid: np.ndarray):
+        self.buffer = buffer
+        self.offsets = offsets
+        self.valid = valid
+
+    @classmethod
+    def from_series(cls, series: pd.Series) -> "TextColumn":
+        valid = series.notna().to_numpy()
+        encoded = [
+            str(value).encode("utf-8") if ok else b""
+            for value, ok in zip(series.to_numpy(dtype=object), valid)
+        ]
+        offsets = np.zeros(len(encoded) + 1, dtype=np.int64)
+        np.cumsum([len(e) for e in encoded], out=offsets[1:])
+        return cls(b"".join(encoded), offsets, valid)
+
+    def __len__(self) -> int:
+        return len(self.valid)
+
+    def value(self, row: int) -> str | None:
+        if not self.valid[row]:
+            return None
+        return self.buffer[self.offsets[row]:self.offsets[row + 1]].decode("utf-8")
+
+    def to_series(self) -> pd.Series:
+        return pd.Series([self.value(row) for row in range(len(self))], dtype=object)
+
+    @property
+    def nbytes(self) -> int:
+        return len(self.buffer) + self.offsets.nbytes + self.valid.nbytes
+
+
+def _price_array(series: pd.Series) -> np.ndarray:
+    return pd.to_numeric(series, errors="coerce").to_numpy(dtype=np.float64)
+
+
+# ----------------------------
+# Weight parsing
+# ----------------------------
+
+WEIGHT_RE = re.compile(r"(\d+(?:\.\d+)?)\s*(lbs?|pounds?|oz|ounces?|kgs?|kilograms?|g|grams?)\b")
+
+POUNDS_PER_UNIT = {
+    "lb": 1.0, "pound": 1.0,
+    "oz": 1 / 16, "ounce": 1 / 16,
+    "kg": 2.20462, "kilogram": 2.20462,
+    "g": 0.00220462, "gram": 0.00220462,
+}
+
+
+def parse_weight_lb(text: str | None) -> float:
+    """
+    Weight in pounds from the dataset's free-text weight ("1.2 pounds",
+    "12 oz", "1 lb 4 oz"); NaN when no weight can be read.
+    """
+    if text is None:
+        return np.nan
+    matches = WEIGHT_RE.findall(str(text).lower())
+    if not matches:
+        return np.nan
+    return sum(float(amount) * POUNDS_PER_UNIT[unit.rstrip("s")] for amount, unit in matches)
+
+
+def _weight_array(series: pd.Series) -> np.ndarray:
+    # Parse each distinct string once; -1 (missing) indexes the trailing NaN
+    codes, uniques = pd.factorize(series)
+    parsed = np.array([parse_weight_lb(u) for u in uniques] + [np.nan], dtype=np.float64)
+    return parsed[codes]
+
+
+# ----------------------------
+# Row view
+# ----------------------------
+
+class ProductRecord:
+    """
+    Lightweight view of one product row, used for formatting tool output.
+    Missing values are None.
+    """
+
+    __slots__ = (
+        "row", "name", "brand", "category", "price_min", "price_max",
+        "availability", "availability_state", "store", "weight", "url", "image_url",
+    )
+
+    def __init__(self, **fields):
+        for slot in self.__slots__:
+            setattr(self, slot, fields.get(slot))
+
+
+# ----------------------------
+# Product store
+# ----------------------------
+
+class ProductStore:
+    """
+    Compact, typed copy of the columns the catalog tools use.
+
+    Free text (name, weight, URLs) is packed into `TextColumn` buffers.
+    Prices, and the weight converted to pounds, are float64 arrays (NaN
+    when missing) parsed once at load time.
+    Brand, store, category and availability are categorical codes, and the
+    free-text availability is additionally classified into the
+    `Availability` enum. Columns the dataset lacks are None.
+    """
+
+    def __init__(self, products_df: pd.DataFrame, columns: dict):
+        self.size = len(products_df)
+
+        def column(key):
+            col = columns.get(key)
+            return products_df[col] if col and col in products_df.columns else None
+
+        def text(key):
+            series = column(key)
+            return TextColumn.from_series(series) if series is not None else None
+
+        def coded(key):
+            series = column(key)
+            return CodedColumn.from_series(series) if series is not None else None
+
+        def price(key):
+            series = column(key)
+            return _price_array(series) if series is not None else None
+
+        self.name = text("name_col")
+        self.weight = text("weight_col")
+        self.url = text("url_col")
+        self.image_url = text("image_url_col")
+
+        self.price_min = price("price_min_col")
+        self.price_max = price("price_max_col")
+
+        weight_series = column("weight_col")
+        self.weight_lb = _weight_array(weight_series) if weight_series is not None else None
+
+        self.brand = coded("brand_col")
+        self.store = coded("store_col")
+        self.category = coded("category_col")
+        self.availability = coded("availability_col")
+
+        if self.availability is not None:
+            states = np.array(
+                [classify_availability(c) for c in self.availability.categories] + [Availability.UNKNOWN],
+                dtype=np.int8,
+            )
+            # Code -1 (missing) indexes the trailing UNKNOWN entry
+            self.availability_state = states[self.availability.codes]
+        else:
+            self.availability_state = np.zeros(self.size, dtype=np.int8)
+
+    @property
+    def sort_price(self) -> np.ndarray | None:
+        """
+        Price used to pick the cheapest listing: the minimum price when
+        available, otherwise the maximum.
+        """
+        return self.price_min if self.price_min is not None else self.price_max
+
+    def record(self, row: int) -> ProductRecord:
+        def value(column):
+            return column.value(row) if column is not None else None
+
+        def price(values):
+            if values is None or np.isnan(values[row]):
+                return None
+            return float(values[row])
+
+        return ProductRecord(
+            row=row,
+            name=value(self.name),
+            brand=value(self.brand),
+            category=value(self.category),
+            price_min=price(self.price_min),
+            price_max=price(self.price_max),
+            availability=value(self.availability),
+            availability_state=Availability(int(self.availability_state[row])),
+            store=value(self.store),
+            weight=value(self.weight),
+            url=value(self.url),
+            image_url=value(self.image_url),
+        )
+
+    def records(self, rows: np.ndarray) -> list[ProductRecord | None]:
+        """
+        Records for several rows (None where the row is -1). Numeric and
+        coded columns are gathered with one fancy-index per column.
+        """
+        rows = np.asarray(rows, dtype=np.int64)
+        found = rows >= 0
+        picked = rows[found]
+
+        def prices(values):
+            if values is None:
+                return [None] * len(picked)
+            gathered = values[picked]
+            return [None if np.isnan(v) else float(v) for v in gathered]
+
+        def coded(column):
+            if column is None:
+                return [None] * len(picked)
+            return [column.categories[c] if c >= 0 else None for c in column.codes[picked]]
+
+        def text(column):
+            if column is None:
+                return [None] * len(picked)
+            return [column.value(r) for r in picked]
+
+        fields = {
+            "row": picked.tolist(),
+            "name": text(self.name),
+            "brand": coded(self.brand),
+            "category": coded(self.category),
+            "price_min": prices(self.price_min),
+            "price_max": prices(self.price_max),
+            "availability": coded(self.availability),
+            "availability_state": [Availability(int(s)) for s in self.availability_state[picked]],
+            "store": coded(self.store),
+            "weight": text(self.weight),
+            "url": text(self.url),
+            "image_url": text(self.image_url),
+        }
+
+        gathered = iter([
+            ProductRecord(**{key: values[i] for key, values in fields.items()})
+            for i in range(len(picked))
+        ])
+        return [next(gathered) if ok else None for ok in found]
+
+    @property
+    def nbytes(self) -> int:
+        """
+        Approximate memory held by the store, including string payloads.
+        """
+        total = self.availability_state.nbytes
+        for values in (self.price_min, self.price_max, self.weight_lb):
+            total += values.nbytes if values is not None else 0
+        for column in (
+            self.name, self.weight, self.url, self.image_url,
+            self.brand, self.store, self.category, self.availability,
+        ):
+            total += column.nbytes if column is not None else 0
+        return total
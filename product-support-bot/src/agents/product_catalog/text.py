@@ -0,0 +1,26 @@
+import re
+
+
+# ----------------------------
+# Normalization & tokenization
+# ----------------------------
+
+def tokenize(text: str) -> set[str]:
+    """
+    Normalize and split text into alphanumeric tokens.
+    Handles case, punctuation, commas, &, etc.
+    """
+    text = text.lower()
+    text = re.sub(r"[^a-z0-9 ]+", " ", text)
+    return set(text.split())
+
+
+def merchant_key(text: str) -> str:
+    """
+    Comparable form of a merchant name: "Bestbuy.com", "Best Buy" and
+    "bestbuy" all become "bestbuy".
+    """
+    text = text.lower().strip()
+    text = re.sub(r"\.(com|net|org|co\.uk|ca)$", "", text)
+    return re.sub(r"[^a-z0-9]+", "", text)
+
@@ -1,134 +1,231 @@
-import pandas as pd
-import re
+import hashlib
+
+import numpy as np
+
+from src.config import CATALOG_CACHE_SIZE, CATALOG_CACHE_TTL
+
+from .cache import ToolResultCache, cached_tool, normalize_arg
+from .store import ProductRecord
+from .text import tokenize, merchant_key
 
 
 # ----------------------------
-# Normalization & tokenization
+# Imports from loader
 # ----------------------------
 
-def normalize(series: pd.Series) -> pd.Series:
-    return series.astype(str).str.lower().str.strip()
+from .loader import CatalogSnapshot, get_snapshot
 
 
-def tokenize(text: str) -> set[str]:
-    """
-    Normalize and split text into alphanumeric tokens.
-    Handles case, punctuation, commas, &, etc.
-    """
-    text = text.lower()
-    text = re.sub(r"[^a-z0-9 ]+", " ", text)
-    return set(text.split())
+# Shared by all catalog tools; cleared whenever the dataset version changes
+tool_cache = ToolResultCache(
+    maxsize=CATALOG_CACHE_SIZE,
+    ttl=CATALOG_CACHE_TTL,
+    version_fn=lambda: get_snapshot().version,
+)
 
+NOT_FOUND = "No information found for"
 
-def category_matches(user_category: str, dataset_category: str) -> bool:
-    """
-    Returns True if user category intent overlaps
-    with dataset category tokens.
-    """
-    if not user_category or not dataset_category:
-        return False
 
-    user_tokens = tokenize(user_category)
-    dataset_tokens = tokenize(dataset_category)
-
-    return len(user_tokens & dataset_tokens) > 0
+def all_found(result: str) -> bool:
+    # Not-found replies echo the name as the user typed it, so they stay out
+    # of the cache entry that every spelling of that name shares
+    return NOT_FOUND not in result
 
 
 # ----------------------------
-# Imports from loader
+# Product lookup (indexed)
 # ----------------------------
 
-from .loader import (
-    products_df,
-    name_col,
-    price_min_col,
-    price_max_col,
-    availability_col,
-    store_col,
-    category_col,
-    url_col,
-    weight_col,
-    brand_col,
-    image_url_col,
-)
+def safe_get(value, default="Unknown"):
+    return default if value is None else value
 
 
-# ----------------------------
-# Product lookup (UNCHANGED)
-# ----------------------------
+def price_text(record: ProductRecord) -> str:
+    price_min = safe_get(record.price_min)
+    price_max = safe_get(record.price_max)
+
+    if price_min != "Unknown" and price_max != "Unknown" and price_min != price_max:
+        return f"{price_min} – {price_max}"
+    elif price_max != "Unknown":
+        return f"{price_max}"
+    elif price_min != "Unknown":
+        return f"{price_min}"
+    return "Unknown"
+
+
+def format_price(record: ProductRecord) -> str:
+    text = price_text(record)
+    if " – " in text:
+        return f"Price range: {text}"
+    return f"Price: {text}"
+
+
+def format_product(record: ProductRecord) -> str:
+    lines = [
+        f"Product: {safe_get(record.name)}",
+        f"Brand: {safe_get(record.brand)}",
+        f"Category: {safe_get(record.category)}",
+        format_price(record),
+        f"Availability: {safe_get(record.availability)}",
+        f"Store: {safe_get(record.store)}",
+    ]
+
+    if record.weight is not None:
+        lines.append(f"Weight: {record.weight}")
+
+    url = safe_get(record.url, "")
+    if url:
+        lines.append(f"URL: {url}")
+
+    image_url = safe_get(record.image_url, "")
+    if image_url and image_url != url:
+        lines.append(f"Image URL: {image_url}")
+
+    return "\n".join(lines)
 
+
+@cached_tool(tool_cache, cacheable=all_found)
 def get_product_info(product_name: str) -> str:
     if not isinstance(product_name, str) or not product_name.strip():
         return "Please provide a valid product name."
 
-    query = product_name.lower().strip()
-    df = products_df.copy()
+    catalog = get_snapshot()
 
-    if name_col is None or name_col not in df.columns:
+    if catalog.name_index is None:
         return "Dataset does not contain a valid product name column."
 
-    df["__name_lower__"] = normalize(df[name_col])
+    row_pos = catalog.name_index.lookup(product_name)
 
-    exact_matches = df[df["__name_lower__"] == query]
+    if row_pos is None:
+        message = f"{NOT_FOUND} '{product_name.strip()}'."
+        suggestions = [record.name for record, _ in ranked_matches(catalog, product_name, top_k=3)]
+        if suggestions:
+            message += "\nClosest catalog matches:\n- " + "\n- ".join(suggestions)
+        return message
 
-    if exact_matches.empty:
-        matches = df[df["__name_lower__"].str.contains(query, na=False, regex=False)]
-    else:
-        matches = exact_matches
+    return format_product(catalog.store.record(row_pos))
 
-    if matches.empty:
-        return f"No information found for '{product_name}'."
 
-    best = matches.copy()
+# ----------------------------
+# Batch lookup / comparison
+# ----------------------------
+
+MAX_COMPARE = 10
 
-    sort_price_col = price_min_col if price_min_col else price_max_col
-    if sort_price_col and sort_price_col in df.columns:
-        best["__price_num__"] = pd.to_numeric(best[sort_price_col], errors="coerce")
+# (row label, value getter) for the side-by-side comparison table
+COMPARE_FIELDS = [
+    ("Brand", lambda r: safe_get(r.brand)),
+    ("Category", lambda r: safe_get(r.category)),
+    ("Price", price_text),
+    ("Availability", lambda r: safe_get(r.availability)),
+    ("Store", lambda r: safe_get(r.store)),
+    ("Weight", lambda r: safe_get(r.weight)),
+    ("URL", lambda r: safe_get(r.url, "")),
+]
 
-        priced = best.dropna(subset=["__price_num__"])
-        if not priced.empty:
-            best = priced.sort_values("__price_num__")
-         # else: keep original matches even if price is missing
-    best_row = best.iloc[0]
 
+def _cell(value) -> str:
+    return str(value).replace("|", "/").replace("\n", " ").strip()
 
-    def safe_get(row, col, default="Unknown"):
-        if col and col in row.index and not pd.isna(row[col]):
-            return row[col]
-        return default
 
-    lines = [
-        f"Product: {safe_get(best_row, name_col)}",
-        f"Brand: {safe_get(best_row, brand_col)}",
-        f"Category: {safe_get(best_row, category_col)}",
+@cached_tool(tool_cache, cacheable=all_found)
+def get_products_info(names: list[str]) -> str:
+    """
+    Look up several products at once and compare them side by side.
+
+    Use this instead of repeated get_product_info calls when the user asks
+    to compare products or asks about more than one product in a turn.
+    Returns a table with one column per product (brand, category, price,
+    availability, store, weight, URL) plus any names that were not found.
+    """
+    if isinstance(names, str):
+        names = [names]
+    names = [n for n in (names or []) if isinstance(n, str) and n.strip()][:MAX_COMPARE]
+    if not names:
+        return "Please provide one or more product names."
+
+    catalog = get_snapshot()
+
+    if catalog.name_index is None:
+        return "Dataset does not contain a valid product name column."
+
+    records = catalog.store.records(catalog.name_index.lookup_many(names))
+    found = [record for record in records if record is not None]
+
+    lines = []
+    if found:
+        header = ["Field"] + [f"{i}. {_cell(r.name)}" for i, r in enumerate(found, start=1)]
+        lines.append(f"Comparison of {len(found)} product(s):")
+        lines.append("| " + " | ".join(header) + " |")
+        lines.append("|" + " --- |" * len(header))
+        for label, getter in COMPARE_FIELDS:
+            lines.append("| " + " | ".join([label] + [_cell(getter(r)) for r in found]) + " |")
+
+    for name, record in zip(names, records):
+        if record is None:
+            message = f"{NOT_FOUND} '{name.strip()}'."
+            suggestions = [r.name for r, _ in ranked_matches(catalog, name, top_k=3)]
+            if suggestions:
+                message += " Closest catalog matches: " + "; ".join(suggestions)
+            lines.append(message)
+
+    return "\n".join(lines)
+
+
+# ----------------------------
+# Ranked search
+# ----------------------------
+
+MAX_RANKED_RESULTS = 20
+
+
+def ranked_matches(
+    catalog: CatalogSnapshot,
+    query: str,
+    top_k: int = 5,
+) -> list[tuple[ProductRecord, float]]:
+    """
+    `(record, score)` for the top-k BM25 matches of `query`.
+    """
+    if catalog.search_index is None:
+        return []
+
+    return [
+        (catalog.store.record(int(catalog.name_index.best_row[name_id])), score)
+        for name_id, score in catalog.search_index.search(query, top_k=top_k)
     ]
 
-    price_min = safe_get(best_row, price_min_col)
-    price_max = safe_get(best_row, price_max_col)
 
-    if price_min != "Unknown" and price_max != "Unknown" and price_min != price_max:
-        lines.append(f"Price range: {price_min} – {price_max}")
-    elif price_max != "Unknown":
-        lines.append(f"Price: {price_max}")
-    elif price_min != "Unknown":
-        lines.append(f"Price: {price_min}")
-    else:
-        lines.append("Price: Unknown")
+@cached_tool(tool_cache)
+def search_catalog(query: str, top_k: int = 5) -> str:
+    """
+    Ranked fuzzy search over product names, brands and categories.
+
+    Use this when a product name may be misspelled, partial or reordered
+    (e.g. "sony wh1000xm3 headphones"). Returns the top-k candidate products
+    with relevance scores, best first.
+    """
+    if not isinstance(query, str) or not query.strip():
+        return "Please provide a search query."
 
-    lines.append(f"Availability: {safe_get(best_row, availability_col)}")
-    lines.append(f"Store: {safe_get(best_row, store_col)}")
+    try:
+        top_k = max(1, min(int(top_k), MAX_RANKED_RESULTS))
+    except (TypeError, ValueError):
+        return f"top_k must be a whole number between 1 and {MAX_RANKED_RESULTS}."
 
-    weight = safe_get(best_row, weight_col)
-    if weight != "Unknown":
-        lines.append(f"Weight: {weight}")
+    catalog = get_snapshot()
+    results = ranked_matches(catalog, query, top_k=top_k)
 
-    url = safe_get(best_row, url_col, "")
-    if url:
-        lines.append(f"URL: {url}")
+    if not results:
+        return f"No products found matching '{query}'."
 
-    image_url = safe_get(best_row, image_url_col, "")
-    if image_url and image_url != url:
-        lines.append(f"Image URL: {image_url}")
+    lines = [f"Top matches for '{query}':"]
+    for i, (record, score) in enumerate(results, start=1):
+        price = safe_get(record.price_min, safe_get(record.price_max))
+        lines.append(
+            f"{i}. {record.name} | Brand: {safe_get(record.brand)} | "
+            f"Price: {price} | Score: {score:.2f}"
+        )
 
     return "\n".join(lines)
 
@@ -137,11 +234,15 @@ def get_product_info(product_name: str) -> str:
 # Discovery tools (UPDATED)
 # ----------------------------
 
+@cached_tool(tool_cache)
 def list_categories() -> str:
-    if not category_col or category_col not in products_df.columns:
+    catalog = get_snapshot()
+
+    if catalog.category_index is None:
         return "No category information available."
 
-    categories = normalize(products_df[category_col]).unique()
+    # One entry per distinct category string, normalized like the dataset values
+    categories = {c.lower().strip() for c in catalog.store.category.categories}
 
     if len(categories) == 0:
         return "No categories found."
@@ -149,51 +250,354 @@ def list_categories() -> str:
     return "Available categories:\n- " + "\n- ".join(sorted(categories))
 
 
-def list_brands(category: str | None = None) -> str:
-    df = products_df
+# ----------------------------
+# Attribute search
+# ----------------------------
 
-    if not brand_col or brand_col not in df.columns:
-        return "No brand information available."
+MAX_SEARCH_RESULTS = 50
+SEARCH_SORTS = ("price_asc", "price_desc", "relevance")
+SORT_LABELS = {"price_asc": "lowest price", "price_desc": "highest price", "relevance": "relevance"}
 
+# Availability filter value -> availability states it accepts
+AVAILABILITY_FILTERS = {
+    "in_stock": ("in_stock", "limited_stock"),
+    "limited_stock": ("limited_stock",),
+    "special_order": ("special_order",),
+    "out_of_stock": ("out_of_stock",),
+    "discontinued": ("discontinued",),
+}
+
+
+def optional_number(value) -> float | None:
+    if value is None or (isinstance(value, str) and not value.strip()):
+        return None
+    return float(value)
+
+
+def first_per_product(catalog: CatalogSnapshot, rows: np.ndarray, limit: int) -> tuple[list[int], int]:
+    """
+    The first `limit` rows of `rows` with distinct product names, and the
+    number of distinct products among all of `rows`.
+    """
+    name_ids = catalog.name_index.row_name_id[rows]
+    named = name_ids >= 0
+    rows, name_ids = rows[named], name_ids[named]
+
+    present = np.zeros(len(catalog.name_index), dtype=bool)
+    present[name_ids] = True
+
+    picked, seen = [], set()
+    for row, name_id in zip(rows.tolist(), name_ids.tolist()):
+        if name_id not in seen:
+            seen.add(name_id)
+            picked.append(row)
+            if len(picked) == limit:
+                break
+    return picked, int(present.sum())
+
+
+@cached_tool(tool_cache)
+def search_products(
+    query: str | None = None,
+    category: str | None = None,
+    brand: str | None = None,
+    min_price: float | None = None,
+    max_price: float | None = None,
+    availability: str | None = None,
+    merchant: str | None = None,
+    min_weight_lb: float | None = None,
+    max_weight_lb: float | None = None,
+    sort: str | None = None,
+    top_n: int = 10,
+) -> str:
+    """
+    Find products by price range, availability, merchant and weight in one
+    call, e.g. "headphones under $100 that are in stock".
+
+    - query: optional free text, ranked like search_catalog
+    - category, brand: matched like list_products
+    - min_price, max_price: inclusive price range in USD
+    - availability: "in_stock" (includes limited stock), "limited_stock",
+      "special_order", "out_of_stock" or "discontinued"
+    - merchant: store name, e.g. "Best Buy" or "Walmart.com"
+    - min_weight_lb, max_weight_lb: inclusive weight range in pounds
+    - sort: "price_asc" (default without a query), "price_desc" or
+      "relevance" (default with a query). Price sorts skip unpriced listings.
+
+    Returns the top_n products, each with its best-ranked matching listing
+    (price, availability, store, weight), and the number of matches.
+    """
+    catalog = get_snapshot()
+
+    if catalog.name_index is None:
+        return "Dataset does not contain a valid product name column."
+
+    query = query.strip() if isinstance(query, str) else ""
+    sort = (sort or ("relevance" if query else "price_asc")).lower().strip()
+    if sort not in SEARCH_SORTS:
+        return f"Unknown sort '{sort}'; use one of: {', '.join(SEARCH_SORTS)}."
+    if sort == "relevance" and not query:
+        return "Sorting by relevance needs a query."
+
+    try:
+        min_price, max_price = optional_number(min_price), optional_number(max_price)
+        min_weight_lb, max_weight_lb = optional_number(min_weight_lb), optional_number(max_weight_lb)
+        top_n = max(1, min(int(top_n), MAX_SEARCH_RESULTS))
+    except (TypeError, ValueError):
+        return "Prices, weights and top_n must be numbers."
+
+    # Categorical filters as row bitmaps
+    filters = []
     if category:
-        df = df[
-            products_df[category_col]
-            .dropna()
-            .astype(str)
-            .apply(lambda c: category_matches(category, c))
-        ]
+        if catalog.category_index is None:
+            return "No category information available."
+        filters.append(catalog.category_index.mask(tokenize(category)))
+    if brand:
+        if catalog.brand_index is None:
+            return "No brand information available."
+        filters.append(catalog.brand_index.mask([brand.lower().strip()]))
+    if merchant:
+        if catalog.merchant_index is None:
+            return "No merchant information available."
+        filters.append(catalog.merchant_index.mask([merchant_key(merchant)]))
+    if availability:
+        states = AVAILABILITY_FILTERS.get(availability.lower().strip().replace(" ", "_"))
+        if states is None:
+            return f"Unknown availability '{availability}'; use one of: {', '.join(AVAILABILITY_FILTERS)}."
+        filters.append(catalog.availability_index.mask(states))
+    if min_weight_lb is not None or max_weight_lb is not None:
+        if catalog.weight_index is None:
+            return "No weight information available."
+        filters.append(catalog.weight_index.mask(min_weight_lb, max_weight_lb))
+
+    price_range = min_price is not None or max_price is not None
+    if (price_range or sort != "relevance") and catalog.price_index is None:
+        return "No price information available."
+
+    row_scores = None
+    if query:
+        if catalog.search_index is None or catalog.search_index.size == 0:
+            return "No products found."
+        name_ids = catalog.name_index.row_name_id
+        row_scores = np.where(name_ids >= 0, catalog.search_index.scores(query)[name_ids], 0.0)
+        # With a price sort the query still restricts the rows to matches
+        filters.append(row_scores > 0)
+
+    mask = None
+    for bitmap in filters:
+        mask = bitmap if mask is None else mask & bitmap
+
+    if sort == "relevance":
+        keep = mask.copy()
+        if price_range:
+            keep &= catalog.price_index.mask(min_price, max_price)
+        rows = np.flatnonzero(keep)
+        # Best score first; the cheapest listing first within a product
+        prices = catalog.store.sort_price
+        rows = rows[np.lexsort((
+            prices[rows] if prices is not None else np.zeros(len(rows)),
+            -row_scores[rows],
+        ))]
+    else:
+        # Binary-search range over rows already sorted by price
+        rows = catalog.price_index.range_rows(min_price, max_price)
+        if mask is not None:
+            rows = rows[mask[rows]]
+        if sort == "price_desc":
+            rows = rows[::-1]
+
+    picked, total = first_per_product(catalog, rows, top_n)
+    if not picked:
+        return "No products match these filters."
+
+    lines = [f"{total} matching product(s); top {len(picked)} by {SORT_LABELS[sort]}:"]
+    for i, record in enumerate(catalog.store.records(np.asarray(picked)), start=1):
+        line = (
+            f"{i}. {record.name} | Brand: {safe_get(record.brand)} | Price: {price_text(record)} | "
+            f"Availability: {safe_get(record.availability)} | Store: {safe_get(record.store)}"
+        )
+        if record.weight is not None:
+            line += f" | Weight: {record.weight}"
+        lines.append(line)
+
+    return "\n".join(lines)
+
 
-    brands = normalize(df[brand_col]).dropna().unique()
+# ----------------------------
+# Pagination
+# ----------------------------
+
+PAGE_SIZE = 20
+BRAND_PAGE_SIZE = 50
+MAX_PAGE_SIZE = 100
+PRODUCT_SORTS = ("name", "price_asc", "price_desc")
+
+# Filtered orderings behind the paginated listings. Only the first page of a
+# listing scans the catalog; later pages slice the cached ordering.
+ordering_cache = ToolResultCache(
+    maxsize=CATALOG_CACHE_SIZE,
+    ttl=CATALOG_CACHE_TTL,
+    version_fn=lambda: get_snapshot().version,
+)
+
+
+def listing_key(catalog: CatalogSnapshot, *query) -> str:
+    """
+    Short hash identifying one listing (tool, filters, sort) on one dataset version.
+    """
+    raw = repr((catalog.version,) + tuple(normalize_arg(part) for part in query))
+    return hashlib.blake2b(raw.encode("utf-8"), digest_size=6).hexdigest()
+
+
+def encode_cursor(key: str, offset: int) -> str:
+    # Hex only, so the case-insensitive tool cache key cannot conflate cursors
+    return f"{key}{offset:x}"
+
+
+def decode_cursor(cursor: str, key: str) -> int | None:
+    """
+    Offset encoded in `cursor`, or None when it is malformed or was issued
+    for another listing or dataset version.
+    """
+    cursor = cursor.strip().lower()
+    if not cursor.startswith(key) or len(cursor) == len(key):
+        return None
+    try:
+        return int(cursor[len(key):], 16)
+    except ValueError:
+        return None
+
+
+def clamp_page_size(page_size, default: int) -> int:
+    try:
+        return max(1, min(int(page_size), MAX_PAGE_SIZE))
+    except (TypeError, ValueError):
+        return default
+
+
+def cached_ordering(catalog: CatalogSnapshot, key: str, build):
+    found, ordering = ordering_cache.get(key)
+    if not found:
+        ordering = build()
+        ordering_cache.put(key, ordering, version=catalog.version)
+    return ordering
+
+
+def format_page(title: str, lines: list[str], offset: int, total: int, key: str) -> str:
+    end = offset + len(lines)
+    text = f"{title} {offset + 1}–{end} of {total}:\n- " + "\n- ".join(lines)
+    if end < total:
+        text += f"\nMore results available. Next cursor: {encode_cursor(key, end)}"
+    return text
+
+
+@cached_tool(tool_cache)
+def list_brands(
+    category: str | None = None,
+    page_size: int = BRAND_PAGE_SIZE,
+    cursor: str | None = None,
+) -> str:
+    """
+    List brands in alphabetical order, optionally only those with products
+    in `category`.
+
+    Returns up to `page_size` brands and the total count. When more remain,
+    the result ends with a cursor; pass it back unchanged, with the same
+    category, to get the next page.
+    """
+    catalog = get_snapshot()
+
+    if catalog.brand_index is None:
+        return "No brand information available."
+
+    if category and catalog.category_index is None:
+        return "No category information available."
+
+    page_size = clamp_page_size(page_size, BRAND_PAGE_SIZE)
+    key = listing_key(catalog, "list_brands", category)
+    offset = 0
+    if cursor:
+        offset = decode_cursor(cursor, key)
+        if offset is None:
+            return "Invalid or expired cursor; call list_brands again without a cursor."
+
+    def build() -> list[str]:
+        mask = catalog.category_index.mask(tokenize(category)) if category else None
+        return sorted(catalog.brand_index.keys_in(mask))
+
+    brands = cached_ordering(catalog, key, build)
 
     if len(brands) == 0:
         return "No brands found."
+    if offset >= len(brands):
+        return f"No more brands; all {len(brands)} have been listed."
+
+    return format_page("Available brands", brands[offset:offset + page_size], offset, len(brands), key)
 
-    return "Available brands:\n- " + "\n- ".join(sorted(brands))
 
+@cached_tool(tool_cache)
+def list_products(
+    category: str | None = None,
+    brand: str | None = None,
+    sort: str = "name",
+    page_size: int = PAGE_SIZE,
+    cursor: str | None = None,
+) -> str:
+    """
+    Browse products by category and/or brand, one page at a time.
 
-def list_products(category: str | None = None, brand: str | None = None) -> str:
-    df = products_df
+    `sort` is "name" (A-Z), "price_asc" (cheapest first) or "price_desc".
+    Returns up to `page_size` product names and the total number of
+    matching products. When more remain, the result ends with a cursor;
+    pass it back unchanged, with the same filters and sort, to get the next
+    page.
+    """
+    catalog = get_snapshot()
 
-    if category:
-        df = df[
-            products_df[category_col]
-            .dropna()
-            .astype(str)
-            .apply(lambda c: category_matches(category, c))
-        ]
+    if category and catalog.category_index is None:
+        return "No category information available."
 
-    if brand:
-        df = df[normalize(df[brand_col]) == brand.lower().strip()]
+    if brand and catalog.brand_index is None:
+        return "No brand information available."
 
-    if df.empty:
+    if catalog.name_index is None:
         return "No products found."
 
-    names = (
-        df[name_col]
-        .dropna()
-        .astype(str)
-        .str.strip()
-        .unique()
-    )
-
-    return "Products:\n- " + "\n- ".join(sorted(names[:20]))
+    sort = (sort or "name").lower().strip()
+    if sort not in PRODUCT_SORTS:
+        return f"Unknown sort '{sort}'; use one of: {', '.join(PRODUCT_SORTS)}."
+
+    page_size = clamp_page_size(page_size, PAGE_SIZE)
+    key = listing_key(catalog, "list_products", category, brand, sort)
+    offset = 0
+    if cursor:
+        offset = decode_cursor(cursor, key)
+        if offset is None:
+            return "Invalid or expired cursor; call list_products again without a cursor."
+
+    def build() -> np.ndarray:
+        # Distinct products (name ids) with any row matching the filters
+        mask = np.ones(catalog.store.size, dtype=bool)
+        if category:
+            mask &= catalog.category_index.mask(tokenize(category))
+        if brand:
+            mask &= catalog.brand_index.mask([brand.lower().strip()])
+        return catalog.name_index.ordered(sort, catalog.name_index.names_in(mask))
+
+    name_ids = cached_ordering(catalog, key, build)
+    total = len(name_ids)
+
+    if total == 0:
+        return "No products found."
+    if offset >= total:
+        return f"No more products; all {total} have been listed."
+
+    page = name_ids[offset:offset + page_size]
+    lines = []
+    for record in catalog.store.records(catalog.name_index.best_row[page]):
+        line = record.name.strip()
+        if sort != "name":
+            line += f" | Price: {price_text(record)}"
+        lines.append(line)
+
+    return format_page(f"Products (sorted by {sort})", lines, offset, total, key)
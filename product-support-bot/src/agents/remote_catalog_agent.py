@@ -1,34 +1,52 @@
-from google.adk.agents.remote_a2a_agent import (
-    RemoteA2aAgent,
-    AGENT_CARD_WELL_KNOWN_PATH,
-)
+from google.adk.agents import BaseAgent
 
-def create_remote_catalog_agent() -> RemoteA2aAgent:
+from src.config import CATALOG_MODE, PRODUCT_CATALOG_BASE_URL
+from src.agents.a2a_client import PooledRemoteA2aAgent
+
+CATALOG_MODES = ("a2a", "local")
+
+
+def create_remote_catalog_agent(base_url: str = PRODUCT_CATALOG_BASE_URL) -> PooledRemoteA2aAgent:
     """
     Remote proxy for the Product Catalog Agent, using its A2A agent card.
+
+    Calls share one pooled keep-alive HTTP client and a TTL-cached agent
+    card (see src/agents/a2a_client.py).
     """
-    remote_product_catalog_agent = RemoteA2aAgent(
+    remote_product_catalog_agent = PooledRemoteA2aAgent(
         name="product_catalog_agent",
         description="Remote product catalog agent from external vendor that provides product information.",
-        agent_card=f"http://localhost:8001{AGENT_CARD_WELL_KNOWN_PATH}",
+        base_url=base_url,
     )
     return remote_product_catalog_agent
 
 
+def create_catalog_agent(mode: str = CATALOG_MODE, model=None) -> BaseAgent:
+    """
+    Catalog sub-agent for the customer support agent.
 
+    - "a2a":   RemoteA2aAgent talking to the catalog server (split deployments)
+    - "local": the catalog LlmAgent itself, running in this process, so a
+               catalog turn is a plain sub-agent transfer with no JSON-RPC,
+               HTTP round trip or agent-card fetch
 
+    Both are named `product_catalog_agent`, so the support agent's
+    instruction works unchanged. `model` only applies to local mode.
 
-'''import os
-from google.adk.agents.remote_a2a_agent import RemoteA2aAgent, AGENT_CARD_WELL_KNOWN_PATH
-
-def create_remote_catalog_agent() -> RemoteA2aAgent:
+    The local agent may not transfer back to the support agent or to its
+    peers. Like a remote agent, it answers and ends the turn, and the next
+    turn starts at the support agent again (with its memory tools and the
+    fast-path router); otherwise ADK's Runner would resume later turns at
+    the catalog agent.
     """
-    Remote proxy for the Product Catalog Agent.
-    Uses PRODUCT_CATALOG_BASE_URL if set; otherwise defaults to local dev.
-    """
-    base_url = os.getenv("PRODUCT_CATALOG_BASE_URL", "http://localhost:8001").rstrip("/")
-    return RemoteA2aAgent(
-        name="product_catalog_agent",
-        description="Remote product catalog agent providing product information.",
-        agent_card=f"{base_url}{AGENT_CARD_WELL_KNOWN_PATH}",
-    )'''
+    if mode == "a2a":
+        return create_remote_catalog_agent()
+    if mode == "local":
+        # Imported here so split deployments never load the dataset
+        from src.agents.product_catalog.agent import create_product_catalog_agent
+        return create_product_catalog_agent(
+            model=model,
+            disallow_transfer_to_parent=True,
+            disallow_transfer_to_peers=True,
+        )
+    raise ValueError(f"Unknown CATALOG_MODE {mode!r}; expected one of {CATALOG_MODES}")
@@ -0,0 +1,309 @@
+"""
+Benchmark suite for the product catalog: load time, peak memory and
+per-tool latency on synthetic Datafiniti-shaped datasets.
+
+Runs fully offline (no Gemini calls). Each measurement runs in a fresh
+subprocess so import-time loading and peak RSS are measured cleanly.
+
+Usage:
+    python -m src.benchmarks.bench_catalog --rows 10000 100000 1000000 --out bench.json
+    python -m src.benchmarks.bench_catalog --rows 10000 --compare bench.json
+"""
+import argparse
+import json
+import os
+import platform
+import random
+import resource
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+import numpy as np
+
+from src.benchmarks.synthetic import generate_products_csv
+
+DEFAULT_ROWS = [10_000, 100_000, 1_000_000]
+
+
+# ----------------------------
+# Helpers
+# ----------------------------
+
+def peak_rss_mb() -> float:
+    # ru_maxrss is KiB on Linux and bytes on macOS
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak / (1024 * 1024) if sys.platform == "darwin" else peak / 1024
+
+
+def latency_stats(samples_s: list[float]) -> dict:
+    ms = np.asarray(samples_s) * 1000.0
+    return {
+        "n": len(ms),
+        "p50_ms": round(float(np.percentile(ms, 50)), 4),
+        "p95_ms": round(float(np.percentile(ms, 95)), 4),
+        "p99_ms": round(float(np.percentile(ms, 99)), 4),
+        "mean_ms": round(float(ms.mean()), 4),
+        "max_ms": round(float(ms.max()), 4),
+    }
+
+
+def time_calls(func, args_list: list[tuple]) -> dict:
+    samples = []
+    for args in args_list:
+        start = time.perf_counter()
+        func(*args)
+        samples.append(time.perf_counter() - start)
+    return latency_stats(samples)
+
+
+# ----------------------------
+# Worker (runs in a subprocess)
+# ----------------------------
+
+def tool_workload(snapshot, iterations: int, seed: int = 11) -> dict[str, list[tuple]]:
+    """
+    Argument lists for each tool, sampled from the loaded catalog.
+    """
+    rng = random.Random(seed)
+    store = snapshot.store
+    rows = [rng.randrange(store.size) for _ in range(iterations)]
+    names = [store.name.value(r) or "" for r in rows]
+
+    def misspell(name: str) -> str:
+        if len(name) < 6:
+            return name
+        i = rng.randrange(1, len(name) - 1)
+        return name[:i] + name[i + 1:]
+
+    def partial(name: str) -> str:
+        words = name.split()
+        return " ".join(words[-3:]) if len(words) > 3 else name
+
+    categories = sorted(snapshot.category_index.postings) if snapshot.category_index else [""]
+    brands = sorted(snapshot.brand_index.postings) if snapshot.brand_index else [""]
+
+    return {
+        "get_product_info.exact": [(n,) for n in names],
+        "get_product_info.partial": [(partial(n),) for n in names],
+        "get_product_info.miss": [(misspell(n),) for n in names],
+        "search_catalog": [(misspell(n), 5) for n in names],
+        "get_products_info": [([n, names[i - 1], partial(names[i - 2])],) for i, n in enumerate(names)],
+        "list_categories": [() for _ in rows],
+        "list_brands": [(rng.choice(categories),) for _ in rows],
+        "list_products": [(rng.choice(categories), rng.choice(brands)) for _ in rows],
+        "search_products": [
+            (None, rng.choice(categories), None, None, rng.uniform(50, 500), "in_stock") for _ in rows
+        ],
+    }
+
+
+def run_worker(csv_path: str, cache_dir: str, iterations: int, measure_tools: bool) -> dict:
+    os.environ["DATA_CSV_PATH"] = csv_path
+    os.environ["DATA_CACHE_DIR"] = cache_dir
+    os.environ.pop("DATA_MAX_ROWS", None)
+
+    rss_before = peak_rss_mb()
+    start = time.perf_counter()
+    from src.agents.product_catalog import tools
+    from src.agents.product_catalog.loader import get_snapshot
+    # The dataset loads on first use, not at import
+    snapshot = get_snapshot()
+    load_s = time.perf_counter() - start
+
+    result = {
+        "load_s": round(load_s, 4),
+        "peak_rss_mb": round(peak_rss_mb(), 1),
+        "baseline_rss_mb": round(rss_before, 1),
+        "rows": snapshot.store.size,
+        "products": len(snapshot.name_index) if snapshot.name_index else 0,
+        "store_mb": round(snapshot.store.nbytes / 1e6, 2),
+    }
+
+    if measure_tools:
+        workload = tool_workload(snapshot, iterations)
+        uncached = {}
+        for label, args_list in workload.items():
+            func = getattr(tools, label.split(".")[0])
+            # __wrapped__ bypasses the result cache: this is the compute cost
+            uncached[label] = time_calls(func.__wrapped__, args_list)
+
+        tools.tool_cache.clear()
+        cached = {}
+        for label, args_list in workload.items():
+            func = getattr(tools, label.split(".")[0])
+            func(*args_list[0])
+            cached[label] = time_calls(func, [args_list[0]] * len(args_list))
+
+        result["tools"] = uncached
+        result["tools_cached"] = cached
+
+    return result
+
+
+def spawn_worker(csv_path: str, cache_dir: str, iterations: int, measure_tools: bool) -> dict:
+    cmd = [
+        sys.executable, "-m", "src.benchmarks.bench_catalog", "--worker",
+        "--csv", csv_path, "--cache-dir", cache_dir, "--iterations", str(iterations),
+    ]
+    if measure_tools:
+        cmd.append("--measure-tools")
+
+    out = subprocess.run(cmd, check=True, capture_output=True, text=True)
+    return json.loads(out.stdout.strip().splitlines()[-1])
+
+
+# ----------------------------
+# Orchestration
+# ----------------------------
+
+def git_revision() -> str | None:
+    try:
+        out = subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            capture_output=True, text=True, check=True,
+        )
+        return out.stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def run_suite(rows_list: list[int], workdir: Path, iterations: int) -> dict:
+    results = []
+    for rows in rows_list:
+        csv_path = workdir / f"synthetic_{rows}.csv"
+
+        start = time.perf_counter()
+        if not csv_path.exists():
+            generate_products_csv(str(csv_path), rows)
+        generate_s = time.perf_counter() - start
+
+        cache_dir = workdir / f"cache_{rows}"
+        for stale in cache_dir.glob("*.feather"):
+            stale.unlink()
+
+        print(f"[{rows:>9,} rows] cold load (CSV parse + cache write) ...", file=sys.stderr)
+        cold = spawn_worker(str(csv_path), str(cache_dir), iterations, measure_tools=False)
+
+        print(f"[{rows:>9,} rows] warm load (memory-mapped cache) + tools ...", file=sys.stderr)
+        warm = spawn_worker(str(csv_path), str(cache_dir), iterations, measure_tools=True)
+
+        results.append({
+            "rows": rows,
+            "csv_mb": round(csv_path.stat().st_size / 1e6, 1),
+            "generate_s": round(generate_s, 2),
+            "cold_load": {k: v for k, v in cold.items() if not k.startswith("tools")},
+            "warm_load": {k: v for k, v in warm.items() if not k.startswith("tools")},
+            "tools": warm["tools"],
+            "tools_cached": warm["tools_cached"],
+        })
+
+    return {
+        "meta": {
+            "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+            "git_rev": git_revision(),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "iterations": iterations,
+        },
+        "results": results,
+    }
+
+
+def compare(current: dict, baseline: dict, threshold: float, min_delta_ms: float = 0.05) -> list[str]:
+    """
+    Regressions where a measurement grew by more than `threshold`x against
+    a previous run with the same row count. Changes below a small absolute
+    floor (timer noise on microsecond calls) are ignored.
+    """
+    previous = {r["rows"]: r for r in baseline.get("results", [])}
+    regressions = []
+
+    for result in current["results"]:
+        old = previous.get(result["rows"])
+        if old is None:
+            continue
+
+        # (label, new, old, minimum absolute change worth reporting)
+        pairs = [
+            ("cold_load.load_s", result["cold_load"]["load_s"], old["cold_load"]["load_s"], 0.05),
+            ("warm_load.load_s", result["warm_load"]["load_s"], old["warm_load"]["load_s"], 0.05),
+            ("warm_load.peak_rss_mb", result["warm_load"]["peak_rss_mb"], old["warm_load"]["peak_rss_mb"], 10.0),
+        ]
+        for label, stats in result["tools"].items():
+            if label in old.get("tools", {}):
+                for key in ("p50_ms", "p99_ms"):
+                    pairs.append((f"{label}.{key}", stats[key], old["tools"][label][key], min_delta_ms))
+
+        for label, new_value, old_value, floor in pairs:
+            ratio = new_value / old_value if old_value else 1.0
+            if ratio > threshold and new_value - old_value > floor:
+                regressions.append(
+                    f"{result['rows']:>9,} rows  {label}: {old_value} -> {new_value} ({ratio:.2f}x)"
+                )
+
+    return regressions
+
+
+def print_summary(report: dict) -> None:
+    for result in report["results"]:
+        print(f"\n=== {result['rows']:,} rows ({result['csv_mb']} MB CSV) ===", file=sys.stderr)
+        for phase in ("cold_load", "warm_load"):
+            p = result[phase]
+            print(f"  {phase:<10} {p['load_s']:>8.3f} s   peak RSS {p['peak_rss_mb']:>8.1f} MB", file=sys.stderr)
+        for label, stats in result["tools"].items():
+            print(
+                f"  {label:<26} p50 {stats['p50_ms']:>9.3f} ms   p99 {stats['p99_ms']:>9.3f} ms",
+                file=sys.stderr,
+            )
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, nargs="+", default=DEFAULT_ROWS)
+    parser.add_argument("--iterations", type=int, default=200)
+    parser.add_argument("--workdir", default=os.path.join(tempfile.gettempdir(), "catalog-bench"))
+    parser.add_argument("--out", help="write the JSON report to this file (default: stdout)")
+    parser.add_argument("--compare", help="previous JSON report to check for regressions")
+    parser.add_argument("--threshold", type=float, default=1.25)
+    parser.add_argument("--min-delta-ms", type=float, default=0.05)
+
+    # Internal: single measurement inside a fresh process
+    parser.add_argument("--worker", action="store_true", help=argparse.SUPPRESS)
+    parser.add_argument("--csv", help=argparse.SUPPRESS)
+    parser.add_argument("--cache-dir", help=argparse.SUPPRESS)
+    parser.add_argument("--measure-tools", action="store_true", help=argparse.SUPPRESS)
+
+    args = parser.parse_args()
+
+    if args.worker:
+        print(json.dumps(run_worker(args.csv, args.cache_dir, args.iterations, args.measure_tools)))
+        return
+
+    report = run_suite(args.rows, Path(args.workdir), args.iterations)
+    print_summary(report)
+
+    if args.out:
+        Path(args.out).write_text(json.dumps(report, indent=2))
+    else:
+        print(json.dumps(report, indent=2))
+
+    if args.compare:
+        regressions = compare(
+            report,
+            json.loads(Path(args.compare).read_text()),
+            args.threshold,
+            args.min_delta_ms,
+        )
+        if regressions:
+            print(f"\nRegressions (> {args.threshold}x):", file=sys.stderr)
+            for line in regressions:
+                print("  " + line, file=sys.stderr)
+            sys.exit(1)
+        print("\nNo regressions against baseline.", file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,261 @@
+"""
+Per-turn latency of the customer support agent with the catalog reached
+over A2A (separate catalog server) versus in-process (CATALOG_MODE=local).
+
+By default both agents use a scripted stand-in model, so the run is fully
+offline and the difference is the transport alone (JSON-RPC serialization,
+HTTP round trip, agent-card fetch). `--model gemini` uses the real model for
+end-to-end numbers (needs GOOGLE_API_KEY).
+
+Turns run in conversations of `--session-turns` messages, so follow-up
+turns are measured too. In both modes every turn starts at the support
+agent, which hands the message to the catalog agent.
+
+Usage:
+    python -m src.benchmarks.bench_catalog_mode --turns 100
+    python -m src.benchmarks.bench_catalog_mode --model gemini --turns 20 --out mode.json
+"""
+import argparse
+import asyncio
+import json
+import os
+import random
+import socket
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+from src.benchmarks.bench_catalog import latency_stats
+from src.benchmarks.synthetic import generate_products_csv
+
+MODES = ("a2a", "local")
+
+
+# ----------------------------
+# Environment
+# ----------------------------
+
+def prepare_dataset(workdir: Path, rows: int) -> None:
+    """
+    Point the catalog at a synthetic dataset. Must run before any src.agents
+    import, since config is read at import time.
+    """
+    workdir.mkdir(parents=True, exist_ok=True)
+    csv_path = workdir / f"synthetic_{rows}.csv"
+    if not csv_path.exists():
+        generate_products_csv(str(csv_path), rows)
+
+    os.environ["DATA_CSV_PATH"] = str(csv_path)
+    os.environ["DATA_CACHE_DIR"] = str(workdir / f"cache_{rows}")
+    os.environ.pop("DATA_MAX_ROWS", None)
+
+
+def models(kind: str, latency: float):
+    """
+    (support model, catalog model); None means the agents' default Gemini.
+    """
+    if kind == "gemini":
+        return None, None
+
+    from src.benchmarks.scripted_llm import support_model, catalog_model
+    return support_model(latency), catalog_model(latency)
+
+
+def free_port() -> int:
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+# ----------------------------
+# Catalog server (subprocess, A2A mode)
+# ----------------------------
+
+def serve_catalog(port: int, model_kind: str, latency: float) -> None:
+    import uvicorn
+    from google.adk.a2a.utils.agent_to_a2a import to_a2a
+    from src.agents.product_catalog.agent import create_product_catalog_agent
+
+    _, catalog_model = models(model_kind, latency)
+    app = to_a2a(create_product_catalog_agent(model=catalog_model), host="127.0.0.1", port=port)
+    uvicorn.run(app, host="127.0.0.1", port=port, log_level="warning")
+
+
+def start_catalog_server(args) -> tuple[subprocess.Popen, str]:
+    import httpx
+    from google.adk.agents.remote_a2a_agent import AGENT_CARD_WELL_KNOWN_PATH
+
+    port = free_port()
+    cmd = [
+        sys.executable, "-m", "src.benchmarks.bench_catalog_mode", "--serve-catalog",
+        "--port", str(port), "--model", args.model, "--model-latency", str(args.model_latency),
+        "--rows", str(args.rows), "--workdir", args.workdir,
+    ]
+    proc = subprocess.Popen(cmd)
+    base_url = f"http://127.0.0.1:{port}"
+
+    deadline = time.monotonic() + 120
+    while time.monotonic() < deadline:
+        if proc.poll() is not None:
+            raise RuntimeError("catalog server exited during startup")
+        try:
+            if httpx.get(base_url + AGENT_CARD_WELL_KNOWN_PATH, timeout=1).status_code == 200:
+                return proc, base_url
+        except httpx.HTTPError:
+            pass
+        time.sleep(0.2)
+
+    proc.terminate()
+    raise RuntimeError("catalog server did not start in time")
+
+
+# ----------------------------
+# Turns
+# ----------------------------
+
+def build_support_agent(mode: str, base_url: str | None, support_model, catalog_model):
+    from src.agents.customer_support.agent import create_customer_support_agent
+    from src.agents.remote_catalog_agent import create_catalog_agent, create_remote_catalog_agent
+
+    if mode == "a2a":
+        catalog = create_remote_catalog_agent(base_url)
+    else:
+        catalog = create_catalog_agent("local", model=catalog_model)
+
+    # Every turn should reach the catalog; the fast path would skip it
+    return create_customer_support_agent(model=support_model, catalog_agent=catalog, fast_path=False)
+
+
+async def run_turns(
+    agent, prompts: list[str], warmup: int = 0, session_turns: int = 3,
+) -> tuple[list[float], int, int]:
+    from google.adk.runners import Runner
+    from google.adk.sessions import InMemorySessionService
+    from google.genai import types
+
+    session_service = InMemorySessionService()
+    runner = Runner(agent=agent, app_name="bench", session_service=session_service)
+
+    samples, empty, misrouted = [], 0, 0
+    session = None
+    for i, prompt in enumerate(prompts[:warmup] + prompts):
+        if i % max(session_turns, 1) == 0:
+            session = await session_service.create_session(app_name="bench", user_id="bench")
+        content = types.Content(role="user", parts=[types.Part(text=prompt)])
+
+        start = time.perf_counter()
+        reply, first_author = "", None
+        async for event in runner.run_async(
+            user_id="bench", session_id=session.id, new_message=content,
+        ):
+            first_author = first_author or event.author
+            if event.is_final_response() and event.content and event.content.parts:
+                reply += "".join(p.text or "" for p in event.content.parts)
+        if i >= warmup:
+            samples.append(time.perf_counter() - start)
+            empty += not reply
+            # As over A2A, a follow-up must start at the support agent again
+            misrouted += first_author != agent.name
+
+    return samples, empty, misrouted
+
+
+def sample_prompts(turns: int, seed: int = 5) -> list[str]:
+    from src.agents.product_catalog.loader import get_snapshot
+
+    snapshot = get_snapshot()
+    rng = random.Random(seed)
+    rows = snapshot.name_index.best_row
+    return [
+        "Tell me about " + snapshot.store.name.value(int(rows[rng.randrange(len(rows))]))
+        for _ in range(turns)
+    ]
+
+
+def run_suite(args) -> dict:
+    support_model, catalog_model = models(args.model, args.model_latency)
+    prompts = sample_prompts(args.turns)
+    results = {}
+
+    for mode in args.modes:
+        server, base_url = start_catalog_server(args) if mode == "a2a" else (None, None)
+        try:
+            agent = build_support_agent(mode, base_url, support_model, catalog_model)
+            print(f"[{mode}] {args.turns} turns ...", file=sys.stderr)
+            # One event loop per mode: the pooled A2A client is bound to it
+            samples, empty, misrouted = asyncio.run(
+                run_turns(agent, prompts, warmup=args.warmup, session_turns=args.session_turns)
+            )
+        finally:
+            if server is not None:
+                server.terminate()
+                server.wait()
+
+        results[mode] = {**latency_stats(samples), "empty_replies": empty, "misrouted_turns": misrouted}
+        if mode == "a2a":
+            from src.agents.a2a_client import a2a_client_stats
+            results[mode]["a2a_client"] = a2a_client_stats()
+
+    report = {
+        "meta": {
+            "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+            "model": args.model,
+            "model_latency_s": args.model_latency,
+            "rows": args.rows,
+            "turns": args.turns,
+            "session_turns": args.session_turns,
+        },
+        "results": results,
+    }
+    if "a2a" in results and "local" in results:
+        report["a2a_overhead_ms"] = {
+            key: round(results["a2a"][key] - results["local"][key], 4)
+            for key in ("p50_ms", "p99_ms", "mean_ms")
+        }
+    return report
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--modes", nargs="+", choices=MODES, default=list(MODES))
+    parser.add_argument("--model", choices=("scripted", "gemini"), default="scripted")
+    parser.add_argument("--model-latency", type=float, default=0.0,
+                        help="simulated seconds per scripted model call")
+    parser.add_argument("--turns", type=int, default=100)
+    parser.add_argument("--warmup", type=int, default=3)
+    parser.add_argument("--session-turns", type=int, default=3, help="turns per conversation")
+    parser.add_argument("--rows", type=int, default=10_000)
+    parser.add_argument("--workdir", default=os.path.join(tempfile.gettempdir(), "catalog-bench"))
+    parser.add_argument("--out", help="write the JSON report to this file (default: stdout)")
+
+    # Internal: the A2A catalog server for one run
+    parser.add_argument("--serve-catalog", action="store_true", help=argparse.SUPPRESS)
+    parser.add_argument("--port", type=int, help=argparse.SUPPRESS)
+
+    args = parser.parse_args()
+    prepare_dataset(Path(args.workdir), args.rows)
+
+    if args.serve_catalog:
+        serve_catalog(args.port, args.model, args.model_latency)
+        return
+
+    report = run_suite(args)
+    for mode, stats in report["results"].items():
+        print(
+            f"  {mode:<6} p50 {stats['p50_ms']:>9.2f} ms   p99 {stats['p99_ms']:>9.2f} ms"
+            f"   mean {stats['mean_ms']:>9.2f} ms",
+            file=sys.stderr,
+        )
+    if "a2a_overhead_ms" in report:
+        print(f"  A2A overhead per turn: {report['a2a_overhead_ms']}", file=sys.stderr)
+
+    if args.out:
+        Path(args.out).write_text(json.dumps(report, indent=2))
+    else:
+        print(json.dumps(report, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,121 @@
+"""
+Turn latency of the session backends.
+
+Runs the same turns through a Runner with the in-memory and the SQLite
+session service, against the non-LLM memory probe agent from
+`load_gradio_sessions`, so the numbers isolate the session store: every turn
+reads the session, appends the user message and the reply, and writes a
+`user:` state delta. `--users` conversations run concurrently.
+
+The SQLite run then closes the service, opens the same database again and
+checks that every user's last stored value survived the "restart".
+
+Usage:
+    python -m src.benchmarks.bench_session_service --users 20 --turns 50
+"""
+import argparse
+import asyncio
+import json
+import os
+import sys
+import tempfile
+import time
+
+from google.adk.runners import Runner
+from google.genai import types
+
+from src.benchmarks.bench_catalog import latency_stats
+from src.benchmarks.load_gradio_sessions import MEMORY_KEY, MemoryProbeAgent
+
+APP_NAME = "bench_sessions"
+
+
+async def run_user(runner: Runner, service, user: int, turns: int) -> list[float]:
+    user_id, session_id = f"user-{user}", f"session-{user}"
+    await service.create_session(app_name=APP_NAME, user_id=user_id, session_id=session_id)
+
+    samples = []
+    for turn in range(turns):
+        content = types.Content(role="user", parts=[types.Part(text=f"remember u{user}-t{turn}")])
+        start = time.perf_counter()
+        async for _ in runner.run_async(user_id=user_id, session_id=session_id, new_message=content):
+            pass
+        samples.append(time.perf_counter() - start)
+    return samples
+
+
+async def bench_backend(service, users: int, turns: int) -> dict:
+    runner = Runner(
+        agent=MemoryProbeAgent(name="memory_probe", delay=0.0),
+        app_name=APP_NAME,
+        session_service=service,
+    )
+    start = time.perf_counter()
+    results = await asyncio.gather(*[run_user(runner, service, user, turns) for user in range(users)])
+    wall = time.perf_counter() - start
+
+    return {
+        "wall_s": round(wall, 3),
+        "turns_per_s": round(users * turns / wall, 1),
+        "turn_latency": latency_stats([s for samples in results for s in samples]),
+    }
+
+
+async def check_durability(db_path: str, users: int, turns: int) -> int:
+    """
+    Users whose last value is missing after reopening the database.
+    """
+    from src.sqlite_session_service import SqliteSessionService
+
+    service = SqliteSessionService(db_path=db_path)
+    missing = 0
+    for user in range(users):
+        session = await service.get_session(
+            app_name=APP_NAME, user_id=f"user-{user}", session_id=f"session-{user}",
+        )
+        missing += session is None or session.state.get(MEMORY_KEY) != f"u{user}-t{turns - 1}"
+    service.close()
+    return missing
+
+
+async def run(users: int, turns: int, db_path: str) -> dict:
+    from src.memory_session_service import BoundedInMemorySessionService
+    from src.sqlite_session_service import SqliteSessionService
+
+    report = {"users": users, "turns_per_user": turns}
+    report["memory"] = await bench_backend(BoundedInMemorySessionService(), users, turns)
+
+    sqlite_service = SqliteSessionService(db_path=db_path)
+    report["sqlite"] = await bench_backend(sqlite_service, users, turns)
+    report["sqlite"]["writer"] = {
+        key: value for key, value in sqlite_service.stats().items() if key.startswith("write_")
+    }
+
+    # Measures the write-behind backlog drained at shutdown
+    start = time.perf_counter()
+    sqlite_service.close()
+    report["sqlite"]["close_s"] = round(time.perf_counter() - start, 3)
+
+    report["sqlite"]["missing_after_restart"] = await check_durability(db_path, users, turns)
+    return report
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--users", type=int, default=20)
+    parser.add_argument("--turns", type=int, default=50)
+    parser.add_argument("--db", default=None, help="SQLite file (default: a temporary file)")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        db_path = args.db or os.path.join(tmp, "sessions.db")
+        report = asyncio.run(run(args.users, args.turns, db_path))
+    print(json.dumps(report, indent=2))
+
+    if report["sqlite"]["missing_after_restart"]:
+        print("❌ Session state was lost across a restart", file=sys.stderr)
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,162 @@
+"""
+Startup cost: how long importing each entry point takes, and how long the
+catalog then takes to become ready.
+
+Every measurement runs in a fresh subprocess, so nothing is already
+imported or loaded. Imports must stay cheap: the catalog dataset, its
+indexes and the agents are built on first use (or by the servers'
+background warm-up), not at import. The warm-up is measured separately on
+a synthetic Datafiniti-shaped CSV, cold (CSV parse) and warm (columnar
+cache).
+
+No Gemini calls are made; the agents are only constructed.
+
+Usage:
+    python -m src.benchmarks.bench_startup --rows 100000 --repeat 5
+"""
+import argparse
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+from src.benchmarks.bench_catalog import latency_stats, peak_rss_mb
+from src.benchmarks.synthetic import generate_products_csv
+
+IMPORT_TARGETS = [
+    "src.config",
+    "src.agents.product_catalog.tools",
+    "src.agents.product_catalog.agent",
+    "src.agents.customer_support.agent",
+    "src.server.product_catalog_server",
+    "src.server.customer_support_server",
+]
+
+
+# ----------------------------
+# Worker (runs in a subprocess)
+# ----------------------------
+
+def run_import_worker(module: str) -> dict:
+    import importlib
+
+    start = time.perf_counter()
+    importlib.import_module(module)
+    import_s = time.perf_counter() - start
+
+    from src.agents.product_catalog.loader import catalog_ready
+
+    return {
+        "import_s": round(import_s, 4),
+        "peak_rss_mb": round(peak_rss_mb(), 1),
+        # Must stay False: importing never loads the dataset
+        "catalog_loaded": catalog_ready(),
+    }
+
+
+def run_warm_worker() -> dict:
+    start = time.perf_counter()
+    from src.agents.product_catalog.loader import warm_catalog
+    import_s = time.perf_counter() - start
+
+    start = time.perf_counter()
+    snapshot = warm_catalog()
+    warm_s = time.perf_counter() - start
+
+    return {
+        "import_s": round(import_s, 4),
+        "warm_s": round(warm_s, 4),
+        "rows": snapshot.store.size,
+        "peak_rss_mb": round(peak_rss_mb(), 1),
+    }
+
+
+def spawn_worker(args: list[str], env: dict) -> dict:
+    cmd = [sys.executable, "-m", "src.benchmarks.bench_startup", "--worker", *args]
+    out = subprocess.run(cmd, check=True, capture_output=True, text=True, env=env)
+    return json.loads(out.stdout.strip().splitlines()[-1])
+
+
+# ----------------------------
+# Orchestration
+# ----------------------------
+
+def run_suite(rows: int, repeat: int, workdir: Path) -> dict:
+    workdir.mkdir(parents=True, exist_ok=True)
+    csv_path = workdir / f"synthetic_{rows}.csv"
+    if not csv_path.exists():
+        generate_products_csv(str(csv_path), rows)
+    cache_dir = workdir / f"cache_{rows}"
+
+    env = {
+        **os.environ,
+        "DATA_CSV_PATH": str(csv_path),
+        "DATA_CACHE_DIR": str(cache_dir),
+        "CATALOG_WATCH_INTERVAL": "0",
+        # The agents check for a key when built; nothing is sent to Gemini
+        "GOOGLE_API_KEY": os.environ.get("GOOGLE_API_KEY") or "offline-benchmark",
+    }
+    env.pop("DATA_MAX_ROWS", None)
+
+    imports = {}
+    for module in IMPORT_TARGETS:
+        print(f"import {module} ...", file=sys.stderr)
+        runs = [spawn_worker(["--module", module], env) for _ in range(repeat)]
+        imports[module] = {
+            "import": latency_stats([r["import_s"] for r in runs]),
+            "peak_rss_mb": max(r["peak_rss_mb"] for r in runs),
+            "catalog_loaded": any(r["catalog_loaded"] for r in runs),
+        }
+
+    for stale in cache_dir.glob("*.feather"):
+        stale.unlink()
+    print(f"[{rows:,} rows] warm-up, cold (CSV parse + cache write) ...", file=sys.stderr)
+    cold = spawn_worker(["--warm"], env)
+    print(f"[{rows:,} rows] warm-up, warm (memory-mapped cache) ...", file=sys.stderr)
+    warm = [spawn_worker(["--warm"], env) for _ in range(repeat)]
+
+    return {
+        "rows": rows,
+        "imports": imports,
+        "warm_up": {
+            "cold": cold,
+            "warm": {
+                "warm": latency_stats([r["warm_s"] for r in warm]),
+                "peak_rss_mb": max(r["peak_rss_mb"] for r in warm),
+            },
+        },
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, default=100_000)
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--workdir", default=os.path.join(tempfile.gettempdir(), "catalog-bench"))
+
+    # Internal: single measurement inside a fresh process
+    parser.add_argument("--worker", action="store_true", help=argparse.SUPPRESS)
+    parser.add_argument("--module", help=argparse.SUPPRESS)
+    parser.add_argument("--warm", action="store_true", help=argparse.SUPPRESS)
+
+    args = parser.parse_args()
+
+    if args.worker:
+        result = run_warm_worker() if args.warm else run_import_worker(args.module)
+        print(json.dumps(result))
+        return
+
+    report = run_suite(args.rows, args.repeat, Path(args.workdir))
+    print(json.dumps(report, indent=2))
+
+    loaded = [module for module, stats in report["imports"].items() if stats["catalog_loaded"]]
+    if loaded:
+        print(f"❌ Importing loaded the catalog: {', '.join(loaded)}", file=sys.stderr)
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
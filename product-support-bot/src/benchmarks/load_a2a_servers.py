@@ -0,0 +1,548 @@
+"""
+Load test for the A2A servers: throughput ceiling, latency, errors and
+memory growth under many concurrent sessions.
+
+Virtual users send A2A `message/send` requests, each holding one
+conversation (one A2A context, i.e. one server session) for
+`--turns-per-session` turns before starting a new one. Conversations mix
+discovery (categories, brands, price-filtered search), product lookups and
+memory follow-ups ("I prefer <brand>", "How much does it weigh?").
+
+By default the servers are started here with stand-in models (the support
+agent always hands over to the catalog; the catalog agent picks its tool
+from the message wording), so the run is offline and measures the servers
+themselves: A2A serialization, session store, tools, event loop.
+`--support-url` / `--catalog-url` target servers that are already running
+instead (e.g. with Gemini).
+
+Profiles:
+  constant  `--users` sessions for `--duration` seconds
+  step      start at `--users` and add `--step-users` every `--step-seconds`
+            up to `--max-users`; one report per step, to find the ceiling
+  soak      `--users` sessions for `--duration` seconds, sampling server RSS
+            and session store size every `--sample-interval` seconds
+
+Each step reports throughput, latency (p50/p95/p99), errors by kind, the
+server's event loop lag (from its /metrics) and the load generator's own
+loop lag (if that is high, the generator is the bottleneck).
+
+Usage:
+    python -m src.benchmarks.load_a2a_servers --users 20 --duration 30
+    python -m src.benchmarks.load_a2a_servers --profile step --users 10 --step-users 10 --max-users 100
+    python -m src.benchmarks.load_a2a_servers --profile soak --users 50 --duration 1800 --out soak.json
+    python -m src.benchmarks.load_a2a_servers --target catalog --users 50
+"""
+import argparse
+import asyncio
+import json
+import os
+import random
+import re
+import subprocess
+import sys
+import tempfile
+import time
+import uuid
+from collections import Counter
+from pathlib import Path
+
+from src.benchmarks.bench_catalog import latency_stats
+from src.benchmarks.bench_catalog_mode import free_port, prepare_dataset
+from src.metrics import sample_event_loop_lag
+
+PROFILES = ("constant", "step", "soak")
+TARGETS = ("support", "catalog")
+
+# Conversation flows and how often a session picks each
+FLOWS = {
+    "discovery": [
+        "What products do you have?",
+        "Which brands do you carry in {category}?",
+        "Show me {category} products under $300",
+    ],
+    "lookup": [
+        "Tell me about the {product}.",
+        "Is it in stock?",
+        "Tell me about the {product_2}.",
+        "Compare them",
+    ],
+    "memory": [
+        "I prefer {brand}.",
+        "Tell me about the {product}.",
+        "How much does it weigh?",
+        "What is my favorite brand?",
+    ],
+}
+FLOW_WEIGHTS = {"discovery": 1, "lookup": 2, "memory": 1}
+
+LAG_METRIC = "event_loop_lag_seconds"
+
+
+# ----------------------------
+# Servers (subprocesses, stand-in models)
+# ----------------------------
+
+def serve(target: str, port: int, latency: float) -> None:
+    import uvicorn
+
+    from src.benchmarks.scripted_llm import routed_catalog_model, support_model
+
+    if target == "catalog":
+        from starlette.responses import Response
+        from starlette.routing import Route
+
+        from src.agents.product_catalog.a2a_app import create_a2a_app
+        from src.agents.product_catalog.loader import warm_catalog
+        from src.metrics import CONTENT_TYPE, registry
+
+        async def metrics(request):
+            return Response(registry.render(), media_type=CONTENT_TYPE)
+
+        warm_catalog()
+        app = create_a2a_app(port=port, model=routed_catalog_model(latency))
+        app.router.routes.append(Route("/metrics", metrics, methods=["GET"]))
+    else:
+        from src.agents.customer_support.agent import create_customer_support_agent, set_customer_support_agent
+
+        # Catalog URL and session settings come from the environment
+        set_customer_support_agent(create_customer_support_agent(model=support_model(latency)))
+        from src.server.customer_support_server import app
+
+    uvicorn.run(app, host="127.0.0.1", port=port, log_level="warning")
+
+
+def start_server(target: str, args, env: dict) -> tuple[subprocess.Popen, str]:
+    import httpx
+    from google.adk.agents.remote_a2a_agent import AGENT_CARD_WELL_KNOWN_PATH
+
+    port = free_port()
+    cmd = [
+        sys.executable, "-m", "src.benchmarks.load_a2a_servers", "--serve", target,
+        "--port", str(port), "--model-latency", str(args.model_latency),
+    ]
+    proc = subprocess.Popen(cmd, env=env)
+    base_url = f"http://127.0.0.1:{port}"
+
+    deadline = time.monotonic() + 120
+    while time.monotonic() < deadline:
+        if proc.poll() is not None:
+            raise RuntimeError(f"{target} server exited during startup")
+        try:
+            if httpx.get(base_url + AGENT_CARD_WELL_KNOWN_PATH, timeout=1).status_code == 200:
+                return proc, base_url
+        except httpx.HTTPError:
+            pass
+        time.sleep(0.2)
+
+    proc.terminate()
+    raise RuntimeError(f"{target} server did not start in time")
+
+
+def rss_mb(pid: int | None) -> float | None:
+    """
+    Resident memory of a local server process (Linux only).
+    """
+    if pid is None:
+        return None
+    try:
+        with open(f"/proc/{pid}/status") as f:
+            for line in f:
+                if line.startswith("VmRSS:"):
+                    return round(int(line.split()[1]) / 1024, 1)
+    except OSError:
+        pass
+    return None
+
+
+# ----------------------------
+# Server-side observations
+# ----------------------------
+
+def parse_histogram(text: str, name: str) -> tuple[list[tuple[float, float]], float, float]:
+    """
+    (cumulative buckets, sum, count) of an unlabelled histogram in a
+    Prometheus text scrape.
+    """
+    buckets, total, count = [], 0.0, 0.0
+    bucket_re = re.compile(rf'^{name}_bucket\{{le="([^"]+)"\}} (\S+)$')
+    for line in text.splitlines():
+        if match := bucket_re.match(line):
+            buckets.append((float(match.group(1)), float(match.group(2))))
+        elif line.startswith(f"{name}_sum "):
+            total = float(line.split()[1])
+        elif line.startswith(f"{name}_count "):
+            count = float(line.split()[1])
+    return buckets, total, count
+
+
+def lag_between(before, after) -> dict | None:
+    """
+    Event loop lag observed between two scrapes: mean, and the bucket bound
+    under which 99% of samples fell.
+    """
+    if before is None or after is None:
+        return None
+    count = after[2] - before[2]
+    if count <= 0:
+        return None
+
+    p99_ms = None
+    old_counts = dict(before[0])
+    for bound, new in after[0]:
+        if new - old_counts.get(bound, 0.0) >= 0.99 * count:
+            p99_ms = bound * 1000
+            break
+    return {
+        "samples": int(count),
+        "mean_ms": round((after[1] - before[1]) / count * 1000, 3),
+        "p99_ms_le": p99_ms,
+    }
+
+
+async def scrape_lag(client, base_url: str):
+    try:
+        response = await client.get(base_url + "/metrics")
+    except Exception:
+        return None
+    if response.status_code != 200:
+        return None
+    return parse_histogram(response.text, LAG_METRIC)
+
+
+async def session_stats(client, base_url: str) -> dict | None:
+    try:
+        response = await client.get(base_url + "/stats/sessions")
+    except Exception:
+        return None
+    return response.json() if response.status_code == 200 else None
+
+
+# ----------------------------
+# Virtual users
+# ----------------------------
+
+class LoadError(Exception):
+    def __init__(self, kind: str):
+        super().__init__(kind)
+        self.kind = kind
+
+
+class Stage:
+    """
+    Results of one load level, recorded by whichever request finishes while
+    it is current.
+    """
+
+    def __init__(self, users: int):
+        self.users = users
+        self.started = time.perf_counter()
+        self.latencies: list[float] = []
+        self.errors: Counter = Counter()
+        self.client_lag: list[float] = []
+
+
+async def send_message(client, url: str, text: str, context_id: str | None) -> str | None:
+    """
+    One A2A `message/send` call; returns the context id to continue with.
+    """
+    import httpx
+
+    message = {
+        "kind": "message",
+        "role": "user",
+        "messageId": uuid.uuid4().hex,
+        "parts": [{"kind": "text", "text": text}],
+    }
+    if context_id:
+        message["contextId"] = context_id
+    payload = {"jsonrpc": "2.0", "id": uuid.uuid4().hex, "method": "message/send", "params": {"message": message}}
+
+    try:
+        response = await client.post(url, json=payload)
+    except httpx.TimeoutException:
+        raise LoadError("timeout")
+    except httpx.HTTPError as e:
+        raise LoadError(type(e).__name__)
+
+    if response.status_code != 200:
+        raise LoadError(f"http_{response.status_code}")
+    try:
+        body = response.json()
+    except ValueError:
+        raise LoadError("invalid_json")
+    if "error" in body:
+        raise LoadError(f"rpc_{body['error'].get('code')}")
+
+    result = body.get("result") or {}
+    if (result.get("status") or {}).get("state") == "failed":
+        raise LoadError("task_failed")
+    return result.get("contextId") or context_id
+
+
+def conversation(rng: random.Random, products: list[dict], turns: int) -> list[str]:
+    flow = rng.choices(list(FLOW_WEIGHTS), weights=list(FLOW_WEIGHTS.values()))[0]
+    values = rng.choice(products)
+    messages = FLOWS[flow]
+    return [
+        messages[i % len(messages)].format(**values)
+        for i in range(turns)
+    ]
+
+
+async def virtual_user(client, url: str, state: dict, products: list[dict], seed: int, args) -> None:
+    rng = random.Random(seed)
+    while True:
+        context_id = None
+        for text in conversation(rng, products, args.turns_per_session):
+            start = time.perf_counter()
+            try:
+                context_id = await send_message(client, url, text, context_id)
+            except LoadError as e:
+                state["stage"].errors[e.kind] += 1
+            else:
+                state["stage"].latencies.append(time.perf_counter() - start)
+            if args.think_time:
+                await asyncio.sleep(rng.uniform(0, 2 * args.think_time))
+
+
+def sample_products(count: int, seed: int) -> list[dict]:
+    """
+    Placeholder values for the messages, from the dataset the servers load.
+    """
+    from src.agents.product_catalog.loader import get_snapshot
+
+    snapshot = get_snapshot()
+    store = snapshot.store
+    rows = snapshot.name_index.best_row
+    rng = random.Random(seed)
+
+    products = []
+    for _ in range(count):
+        first, second = (int(rows[rng.randrange(len(rows))]) for _ in range(2))
+        products.append({
+            "product": store.name.value(first) or "",
+            "product_2": store.name.value(second) or "",
+            "brand": store.brand.value(first) or "",
+            "category": store.category.value(first) or "",
+        })
+    return products
+
+
+# ----------------------------
+# Profiles
+# ----------------------------
+
+def stage_levels(args) -> list[tuple[int, float]]:
+    """
+    (users, seconds) for each stage of the profile.
+    """
+    if args.profile != "step":
+        return [(args.users, args.duration)]
+    levels = range(args.users, max(args.max_users, args.users) + 1, max(args.step_users, 1))
+    return [(users, args.step_seconds) for users in levels]
+
+
+def stage_report(stage: Stage, wall: float, lag: dict | None) -> dict:
+    requests = len(stage.latencies) + sum(stage.errors.values())
+    return {
+        "users": stage.users,
+        "duration_s": round(wall, 1),
+        "requests": requests,
+        "throughput_rps": round(len(stage.latencies) / wall, 2) if wall else 0.0,
+        "latency": latency_stats(stage.latencies) if stage.latencies else None,
+        "errors": dict(stage.errors),
+        "error_rate": round(sum(stage.errors.values()) / requests, 4) if requests else 0.0,
+        "server_loop_lag": lag,
+        "client_loop_lag": latency_stats(stage.client_lag) if stage.client_lag else None,
+    }
+
+
+async def run_load(args, url: str, servers: dict[str, tuple[str, int | None]], products: list[dict]) -> dict:
+    import httpx
+
+    target_url = servers[args.target][0]
+    support_url = servers["support"][0] if "support" in servers else None
+    limits = httpx.Limits(max_connections=None, max_keepalive_connections=None)
+
+    stages, timeline, users = [], [], []
+    state = {"stage": None}
+    lag_task = None
+
+    async with httpx.AsyncClient(timeout=args.timeout, limits=limits) as client:
+
+        async def observe() -> dict:
+            sample = {"t_s": round(time.perf_counter() - started, 1)}
+            for name, (_, pid) in servers.items():
+                sample[f"{name}_rss_mb"] = rss_mb(pid)
+            if support_url is not None:
+                stats = await session_stats(client, support_url)
+                if stats is not None:
+                    sample["live_sessions"] = stats.get("live_sessions")
+                    sample["session_approx_bytes"] = stats.get("approx_bytes")
+            return sample
+
+        async def soak_sampler():
+            while True:
+                await asyncio.sleep(args.sample_interval)
+                sample = await observe()
+                sample["completed"] = sum(len(s.latencies) for s in stages) + len(state["stage"].latencies)
+                timeline.append(sample)
+
+        started = time.perf_counter()
+        timeline.append(await observe())
+        sampler = asyncio.create_task(soak_sampler()) if args.profile == "soak" else None
+
+        try:
+            for level, seconds in stage_levels(args):
+                stage = Stage(level)
+                state["stage"] = stage
+                if lag_task is not None:
+                    lag_task.cancel()
+                lag_task = asyncio.create_task(sample_event_loop_lag(stage.client_lag.append))
+                lag_before = await scrape_lag(client, target_url)
+
+                while len(users) < level:
+                    seed = args.seed + len(users)
+                    users.append(asyncio.create_task(virtual_user(client, url, state, products, seed, args)))
+
+                print(f"[{args.profile}] {level} users for {seconds:.0f} s ...", file=sys.stderr)
+                await asyncio.sleep(seconds)
+                wall = time.perf_counter() - stage.started
+
+                report = stage_report(stage, wall, lag_between(lag_before, await scrape_lag(client, target_url)))
+                report["end"] = await observe()
+                stages.append(report)
+
+                failed = report["error_rate"]
+                p99 = (report["latency"] or {}).get("p99_ms")
+                print(
+                    f"  {report['throughput_rps']:>8.1f} req/s   p99 {p99 if p99 is not None else '-':>9} ms"
+                    f"   errors {failed:.2%}",
+                    file=sys.stderr,
+                )
+        finally:
+            for task in users + [t for t in (sampler, lag_task) if t is not None]:
+                task.cancel()
+            await asyncio.gather(*users, *(t for t in (sampler, lag_task) if t is not None), return_exceptions=True)
+
+    report = {"stages": stages}
+    if args.profile == "soak":
+        report["timeline"] = timeline
+        report["growth"] = growth(timeline)
+    return report
+
+
+def growth(timeline: list[dict]) -> dict:
+    """
+    Mean of the second half of the soak minus the mean of the first half,
+    per sampled value: steady memory stays near 0.
+    """
+    samples = timeline[1:]
+    half = len(samples) // 2
+    if half == 0:
+        return {}
+
+    result = {}
+    for key in samples[0]:
+        if key in ("t_s", "completed"):
+            continue
+        first = [s[key] for s in samples[:half] if s.get(key) is not None]
+        second = [s[key] for s in samples[half:] if s.get(key) is not None]
+        if first and second:
+            result[key] = round(sum(second) / len(second) - sum(first) / len(first), 2)
+    return result
+
+
+def run_suite(args) -> dict:
+    # The servers read the dataset settings prepare_dataset put in the environment
+    env = {**os.environ, "CATALOG_WATCH_INTERVAL": "0"}
+
+    servers: dict[str, tuple[str, int | None]] = {}
+    procs = []
+    try:
+        catalog_url = args.catalog_url
+        if catalog_url is None and (args.target == "catalog" or args.support_url is None):
+            proc, catalog_url = start_server("catalog", args, env)
+            procs.append(proc)
+            servers["catalog"] = (catalog_url, proc.pid)
+        elif catalog_url is not None:
+            servers["catalog"] = (catalog_url.rstrip("/"), None)
+
+        if args.target == "support":
+            if args.support_url is None:
+                support_env = {**env, "CATALOG_MODE": "a2a", "PRODUCT_CATALOG_BASE_URL": catalog_url}
+                proc, support_url = start_server("support", args, support_env)
+                procs.append(proc)
+                servers["support"] = (support_url, proc.pid)
+            else:
+                servers["support"] = (args.support_url.rstrip("/"), None)
+
+        products = sample_products(200, args.seed)
+        url = servers[args.target][0] + "/"
+        result = asyncio.run(run_load(args, url, servers, products))
+    finally:
+        for proc in procs:
+            proc.terminate()
+            proc.wait()
+
+    return {
+        "meta": {
+            "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+            "profile": args.profile,
+            "target": args.target,
+            "servers": {name: url for name, (url, _) in servers.items()},
+            "model": "stand-in" if not (args.support_url or args.catalog_url) else "as deployed",
+            "model_latency_s": args.model_latency,
+            "turns_per_session": args.turns_per_session,
+            "think_time_s": args.think_time,
+            "rows": args.rows or None,
+        },
+        **result,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--profile", choices=PROFILES, default="constant")
+    parser.add_argument("--target", choices=TARGETS, default="support")
+    parser.add_argument("--users", type=int, default=10, help="concurrent sessions (first step for --profile step)")
+    parser.add_argument("--duration", type=float, default=30, help="seconds (constant and soak)")
+    parser.add_argument("--step-users", type=int, default=10)
+    parser.add_argument("--step-seconds", type=float, default=30)
+    parser.add_argument("--max-users", type=int, default=100)
+    parser.add_argument("--sample-interval", type=float, default=10, help="soak sampling period in seconds")
+    parser.add_argument("--turns-per-session", type=int, default=4)
+    parser.add_argument("--think-time", type=float, default=0.0, help="mean pause between a user's turns")
+    parser.add_argument("--timeout", type=float, default=60)
+    parser.add_argument("--model-latency", type=float, default=0.0,
+                        help="simulated seconds per stand-in model call")
+    parser.add_argument("--support-url", help="use a running support server instead of starting one")
+    parser.add_argument("--catalog-url", help="use a running catalog server instead of starting one")
+    parser.add_argument("--rows", type=int, default=10_000,
+                        help="rows of the synthetic dataset; 0 uses the configured DATA_CSV_PATH")
+    parser.add_argument("--seed", type=int, default=17)
+    parser.add_argument("--workdir", default=os.path.join(tempfile.gettempdir(), "catalog-bench"))
+    parser.add_argument("--out", help="write the JSON report to this file (default: stdout)")
+
+    # Internal: one server for the run
+    parser.add_argument("--serve", choices=TARGETS, help=argparse.SUPPRESS)
+    parser.add_argument("--port", type=int, help=argparse.SUPPRESS)
+
+    args = parser.parse_args()
+
+    if args.serve:
+        serve(args.serve, args.port, args.model_latency)
+        return
+
+    if args.rows:
+        prepare_dataset(Path(args.workdir), args.rows)
+
+    report = run_suite(args)
+    if args.out:
+        Path(args.out).write_text(json.dumps(report, indent=2))
+    else:
+        print(json.dumps(report, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,128 @@
+"""
+Load test for per-client sessions in the Gradio chat handler.
+
+N simulated browser sessions chat in parallel through `chat_stream`, backed
+by a non-LLM agent that remembers one value per user in `user:` state and
+echoes the previous one along with the length of the session history. Every
+reply is checked against the value that client stored on its previous turn
+and the history length of its own conversation, so any cross-talk between
+sessions (shared state or interleaved events) shows up as a mismatch.
+Wall time is compared with the fully serialized time.
+
+Usage:
+    python -m src.benchmarks.load_gradio_sessions --users 50 --turns 5 --delay 0.2
+"""
+import argparse
+import asyncio
+import json
+import os
+import random
+import sys
+import time
+from typing import AsyncGenerator
+
+from google.adk.agents import BaseAgent
+from google.adk.agents.invocation_context import InvocationContext
+from google.adk.events import Event, EventActions
+from google.genai import types
+
+from src.benchmarks.bench_catalog import latency_stats
+
+MEMORY_KEY = "user:last_product"
+
+
+class MemoryProbeAgent(BaseAgent):
+    """
+    Replies with the value stored by the user's previous turn and the number
+    of events in the session, then stores the value in this turn's message.
+    `delay` stands in for model time; it is jittered so turns of different
+    users interleave unpredictably.
+    """
+
+    delay: float = 0.2
+
+    async def _run_async_impl(self, ctx: InvocationContext) -> AsyncGenerator[Event, None]:
+        message = "".join(p.text or "" for p in ctx.user_content.parts) if ctx.user_content else ""
+        previous = ctx.session.state.get(MEMORY_KEY)
+        history = len(ctx.session.events)
+
+        await asyncio.sleep(self.delay * random.uniform(0.5, 1.5))
+
+        yield Event(
+            invocation_id=ctx.invocation_id,
+            author=self.name,
+            branch=ctx.branch,
+            content=types.Content(role="model", parts=[types.Part(text=f"previous={previous} events={history}")]),
+            actions=EventActions(state_delta={MEMORY_KEY: message.removeprefix("remember ")}),
+        )
+
+
+async def simulate_user(chat_stream, runner, user: int, turns: int) -> tuple[list[float], int]:
+    client_key = f"load-{user}"
+    samples, mismatches = [], 0
+
+    for turn in range(turns):
+        # Own history so far: one user message and one reply per earlier turn,
+        # plus this turn's user message
+        previous = f"u{user}-t{turn - 1}" if turn else None
+        expected = f"previous={previous} events={2 * turn + 1}"
+        start = time.perf_counter()
+        reply = ""
+        async for partial in chat_stream(f"remember u{user}-t{turn}", client_key, turn_runner=runner):
+            reply = partial
+        samples.append(time.perf_counter() - start)
+        mismatches += reply != expected
+
+    return samples, mismatches
+
+
+async def run(users: int, turns: int, delay: float) -> dict:
+    from google.adk.runners import Runner
+    from src.ui import gradio_app
+
+    runner = Runner(
+        agent=MemoryProbeAgent(name="memory_probe", delay=delay),
+        app_name=gradio_app.APP_NAME,
+        session_service=gradio_app.session_service,
+    )
+
+    start = time.perf_counter()
+    results = await asyncio.gather(*[
+        simulate_user(gradio_app.chat_stream, runner, user, turns) for user in range(users)
+    ])
+    wall = time.perf_counter() - start
+
+    samples = [s for user_samples, _ in results for s in user_samples]
+    serialized = users * turns * delay
+    return {
+        "users": users,
+        "turns_per_user": turns,
+        "agent_delay_s": delay,
+        "wall_s": round(wall, 3),
+        "serialized_s": round(serialized, 3),
+        "concurrency_speedup": round(serialized / wall, 1),
+        "cross_talk_mismatches": sum(m for _, m in results),
+        "turn_latency": latency_stats(samples),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--users", type=int, default=50)
+    parser.add_argument("--turns", type=int, default=5)
+    parser.add_argument("--delay", type=float, default=0.2, help="simulated agent seconds per turn")
+    args = parser.parse_args()
+
+    # The UI module builds the real support agent at import; it is never called
+    os.environ.setdefault("GOOGLE_API_KEY", "offline-benchmark")
+
+    report = asyncio.run(run(args.users, args.turns, args.delay))
+    print(json.dumps(report, indent=2))
+
+    if report["cross_talk_mismatches"]:
+        print("❌ Sessions leaked state between users", file=sys.stderr)
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,257 @@
+"""
+Offline replay of scripted support conversations.
+
+Each transcript in `src/benchmarks/transcripts/` lists the user turns of one
+conversation and, for each turn, the model steps recorded for it: the
+function calls the agents made, in order, and optionally their text replies.
+The harness drives the customer support agent through a Runner, with the
+catalog agent in-process and a `ReplayLlm` playing those steps back. The
+real tools, memory, agent transfers and session handling all run; nothing
+touches the network and no API key is needed.
+
+Every turn starts at customer_support_agent, as it does over A2A: the
+in-process catalog agent cannot transfer back, so it answers and ends the
+turn, and the next message goes to the support agent again. Per turn the
+harness reports wall time, LLM calls, tool calls, catalog hops (transfers
+into product_catalog_agent; in a split deployment each is one A2A
+message/send round trip) and bytes exchanged with the model and the tools.
+A turn whose calls differ from the recorded ones is flagged, and the run
+exits 1.
+
+Transcripts may use the placeholders {product}, {product_2}, {brand} and
+{category}, which are filled from the loaded catalog, so they replay on any
+dataset.
+
+Usage:
+    python -m src.benchmarks.replay_conversations --repeat 20
+    python -m src.benchmarks.replay_conversations src/benchmarks/transcripts/product_follow_up.json
+    python -m src.benchmarks.replay_conversations --rows 0   # configured dataset
+"""
+import argparse
+import asyncio
+import json
+import os
+import random
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+from src.benchmarks.bench_catalog import latency_stats
+from src.benchmarks.bench_catalog_mode import prepare_dataset
+
+TRANSCRIPT_DIR = Path(__file__).resolve().parent / "transcripts"
+APP_NAME = "replay"
+CATALOG_AGENT = "product_catalog_agent"
+
+
+# ----------------------------
+# Transcripts
+# ----------------------------
+
+def load_transcripts(paths: list[str]) -> list[dict]:
+    files = [Path(p) for p in paths] or sorted(TRANSCRIPT_DIR.glob("*.json"))
+    return [json.loads(f.read_text()) for f in files]
+
+
+def catalog_placeholders(seed: int) -> dict[str, str]:
+    """
+    Values for the transcript placeholders, sampled from the live catalog.
+    """
+    from src.agents.product_catalog.loader import get_snapshot
+
+    snapshot = get_snapshot()
+    store = snapshot.store
+    rows = snapshot.name_index.best_row
+    first, second = (int(rows[i]) for i in random.Random(seed).sample(range(len(rows)), 2))
+    return {
+        "product": store.name.value(first) or "",
+        "product_2": store.name.value(second) or "",
+        "brand": store.brand.value(first) or "",
+        "category": store.category.value(first) or "",
+    }
+
+
+def fill(value, placeholders: dict[str, str]):
+    if isinstance(value, str):
+        for key, replacement in placeholders.items():
+            value = value.replace("{" + key + "}", replacement)
+        return value
+    if isinstance(value, list):
+        return [fill(v, placeholders) for v in value]
+    if isinstance(value, dict):
+        return {k: fill(v, placeholders) for k, v in value.items()}
+    return value
+
+
+# ----------------------------
+# Replay
+# ----------------------------
+
+def build_agent(llm, fast_path: bool):
+    from src.agents.customer_support.agent import create_customer_support_agent
+    from src.agents.remote_catalog_agent import create_catalog_agent
+
+    return create_customer_support_agent(
+        model=llm,
+        catalog_agent=create_catalog_agent("local", model=llm),
+        fast_path=fast_path,
+    )
+
+
+def calls_match(observed: list[list[str]], steps: list[dict]) -> bool:
+    expected = [(step.get("agent"), step["call"]) for step in steps if "call" in step]
+    return len(observed) == len(expected) and all(
+        name == expected_name and (expected_agent is None or author == expected_agent)
+        for (author, name), (expected_agent, expected_name) in zip(observed, expected)
+    )
+
+
+async def run_turn(runner, llm, user_id: str, session_id: str, turn: dict) -> dict:
+    from google.genai import types
+
+    llm.load(turn["steps"])
+    content = types.Content(role="user", parts=[types.Part(text=turn["user"])])
+    observed, hops, tool_bytes, reply = [], 0, 0, ""
+    previous_author = None
+
+    start = time.perf_counter()
+    async for event in runner.run_async(user_id=user_id, session_id=session_id, new_message=content):
+        if event.author == CATALOG_AGENT and previous_author != CATALOG_AGENT:
+            hops += 1
+        previous_author = event.author
+
+        for call in event.get_function_calls():
+            observed.append([event.author, call.name])
+            tool_bytes += len(json.dumps(call.args or {}, default=str))
+        for response in event.get_function_responses():
+            tool_bytes += len(json.dumps(response.response, default=str))
+        if event.is_final_response() and event.content and event.content.parts:
+            reply += "".join(p.text or "" for p in event.content.parts)
+    wall = time.perf_counter() - start
+
+    return {
+        "wall_s": wall,
+        "llm_calls": llm.calls,
+        "tool_calls": len(observed),
+        "catalog_hops": hops,
+        "llm_bytes_sent": llm.bytes_sent,
+        "llm_bytes_received": llm.bytes_received,
+        "tool_bytes": tool_bytes,
+        "reply_chars": len(reply),
+        "matched": calls_match(observed, turn["steps"]) and not llm.steps,
+        "observed_calls": observed,
+    }
+
+
+async def replay(transcript: dict, runner, session_service, llm, repeat: int) -> dict:
+    turns = transcript["turns"]
+    samples: list[list[float]] = [[] for _ in turns]
+    first_run: list[dict] = []
+
+    for run in range(repeat):
+        # A fresh user per run, so `user:` memory does not leak between runs
+        user_id = f"replay-{transcript['name']}-{run}"
+        session = await session_service.create_session(app_name=APP_NAME, user_id=user_id)
+        for i, turn in enumerate(turns):
+            try:
+                result = await run_turn(runner, llm, user_id, session.id, turn)
+            except Exception as e:
+                return {"name": transcript["name"], "error": f"turn {i + 1}: {type(e).__name__}: {e}"}
+            samples[i].append(result.pop("wall_s"))
+            if run == 0:
+                first_run.append(result)
+
+    report_turns = []
+    for turn, result, wall in zip(turns, first_run, samples):
+        if result["matched"]:
+            del result["observed_calls"]
+        report_turns.append({"user": turn["user"], "wall": latency_stats(wall), **result})
+
+    totals = {
+        key: sum(t[key] for t in report_turns)
+        for key in ("llm_calls", "tool_calls", "catalog_hops", "llm_bytes_sent", "llm_bytes_received", "tool_bytes")
+    }
+    return {"name": transcript["name"], "turns": report_turns, "totals": totals}
+
+
+async def run_suite(transcripts: list[dict], repeat: int, model_latency: float, fast_path: bool) -> list[dict]:
+    from google.adk.runners import Runner
+
+    from src.benchmarks.scripted_llm import ReplayLlm
+    from src.memory_session_service import create_session_service
+
+    llm = ReplayLlm(latency=model_latency)
+    session_service = create_session_service("memory")
+    runner = Runner(agent=build_agent(llm, fast_path), app_name=APP_NAME, session_service=session_service)
+    return [await replay(t, runner, session_service, llm, repeat) for t in transcripts]
+
+
+def print_summary(results: list[dict]) -> None:
+    for result in results:
+        print(f"\n=== {result['name']} ===", file=sys.stderr)
+        if "error" in result:
+            print(f"  ❌ {result['error']}", file=sys.stderr)
+            continue
+        for i, turn in enumerate(result["turns"], 1):
+            print(
+                f"  {'✓' if turn['matched'] else '✗'} turn {i}  p50 {turn['wall']['p50_ms']:>8.2f} ms"
+                f"   llm {turn['llm_calls']}  tools {turn['tool_calls']}  hops {turn['catalog_hops']}"
+                f"   llm bytes {turn['llm_bytes_sent']:>7} / {turn['llm_bytes_received']:<5}"
+                f"  tool bytes {turn['tool_bytes']}",
+                file=sys.stderr,
+            )
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("transcripts", nargs="*", help="transcript files (default: all in transcripts/)")
+    parser.add_argument("--repeat", type=int, default=5, help="replays of each conversation, for wall time")
+    parser.add_argument("--rows", type=int, default=10_000,
+                        help="rows of the synthetic dataset; 0 uses the configured DATA_CSV_PATH")
+    parser.add_argument("--model-latency", type=float, default=0.0,
+                        help="simulated seconds per model call")
+    parser.add_argument("--fast-path", action="store_true",
+                        help="enable the fast-path router (turns it answers skip the recorded steps)")
+    parser.add_argument("--seed", type=int, default=3, help="seed for the placeholder products")
+    parser.add_argument("--workdir", default=os.path.join(tempfile.gettempdir(), "catalog-bench"))
+    parser.add_argument("--out", help="write the JSON report to this file (default: stdout)")
+    args = parser.parse_args()
+
+    if args.rows:
+        prepare_dataset(Path(args.workdir), args.rows)
+    # The catalog agent runs in-process; this also enables the router's product fast paths
+    os.environ["CATALOG_MODE"] = "local"
+
+    placeholders = catalog_placeholders(args.seed)
+    transcripts = [fill(t, placeholders) for t in load_transcripts(args.transcripts)]
+    results = asyncio.run(run_suite(transcripts, args.repeat, args.model_latency, args.fast_path))
+    print_summary(results)
+
+    report = {
+        "meta": {
+            "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+            "rows": args.rows or None,
+            "repeat": args.repeat,
+            "model_latency_s": args.model_latency,
+            "fast_path": args.fast_path,
+            "placeholders": placeholders,
+        },
+        "conversations": results,
+    }
+    if args.out:
+        Path(args.out).write_text(json.dumps(report, indent=2))
+    else:
+        print(json.dumps(report, indent=2))
+
+    failed = [
+        r["name"] for r in results
+        if "error" in r or (not args.fast_path and not all(t["matched"] for t in r["turns"]))
+    ]
+    if failed:
+        print(f"\n❌ Replay diverged from the transcript: {', '.join(failed)}", file=sys.stderr)
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,205 @@
+"""
+Deterministic stand-in for Gemini, for offline benchmarks.
+
+A `ScriptedLlm` answers a new user message with one scripted function call
+(e.g. `transfer_to_agent` or `get_product_info`) and answers the resulting
+function response with a short text reply. With no `tool_call`, it replies
+with text immediately. `latency` adds a fixed per-call delay to mimic model
+time without any network access. In streaming mode text replies arrive as
+partial word chunks followed by the complete message.
+
+A `ReplayLlm` instead plays back recorded steps (function calls or text
+replies) in order, whichever agent is calling, for replaying whole
+conversations.
+"""
+import asyncio
+import json
+import re
+from typing import AsyncGenerator, Callable
+
+from google.adk.models.base_llm import BaseLlm
+from google.adk.models.llm_request import LlmRequest
+from google.adk.models.llm_response import LlmResponse
+from google.genai import types
+
+
+CONTEXT_PREFIX = "For context:"
+
+
+def latest_user_text(llm_request: LlmRequest) -> str:
+    """
+    Text of the most recent user message, skipping the "For context:"
+    messages ADK builds from other agents' events.
+    """
+    for content in reversed(llm_request.contents or []):
+        if content.role != "user":
+            continue
+        texts = [part.text for part in (content.parts or []) if part.text]
+        if any(t.startswith(CONTEXT_PREFIX) for t in texts):
+            continue
+        if texts:
+            return " ".join(t.strip() for t in texts)
+    return ""
+
+
+def function_responses(llm_request: LlmRequest) -> list[types.FunctionResponse]:
+    """
+    Function responses in the last message of the request, if any.
+    """
+    last = llm_request.contents[-1] if llm_request.contents else None
+    if last is None:
+        return []
+    return [part.function_response for part in (last.parts or []) if part.function_response]
+
+
+def echo_responses(responses: list[types.FunctionResponse]) -> str:
+    """
+    Stand-in reply to tool results: the results themselves, truncated.
+    """
+    return "; ".join(json.dumps(r.response, default=str)[:500] for r in responses) or "OK"
+
+
+class ScriptedLlm(BaseLlm):
+    model: str = "scripted"
+    tool_call: Callable[[str], tuple[str, dict]] | None = None
+    latency: float = 0.0
+
+    async def generate_content_async(
+        self, llm_request: LlmRequest, stream: bool = False
+    ) -> AsyncGenerator[LlmResponse, None]:
+        if self.latency:
+            await asyncio.sleep(self.latency)
+
+        responses = function_responses(llm_request)
+
+        if responses or self.tool_call is None:
+            part = types.Part(text=echo_responses(responses))
+        else:
+            name, args = self.tool_call(latest_user_text(llm_request))
+            part = types.Part(function_call=types.FunctionCall(name=name, args=args))
+
+        if stream and part.text:
+            # SSE-style delivery: word chunks marked partial, then the full message
+            words = part.text.split(" ")
+            for i, word in enumerate(words):
+                chunk = word if i == len(words) - 1 else word + " "
+                yield LlmResponse(
+                    content=types.Content(role="model", parts=[types.Part(text=chunk)]),
+                    partial=True,
+                )
+                if self.latency:
+                    await asyncio.sleep(self.latency / len(words))
+
+        yield LlmResponse(
+            content=types.Content(role="model", parts=[part]),
+            usage_metadata=types.GenerateContentResponseUsageMetadata(
+                prompt_token_count=0, candidates_token_count=0, total_token_count=0,
+            ),
+        )
+
+
+class ReplayLlm(BaseLlm):
+    """
+    Plays back recorded model steps in order. Each step is either
+    `{"call": name, "args": {...}}` or `{"text": "..."}`. Once the loaded
+    steps run out, tool results are echoed back as the reply, so a turn
+    always ends.
+
+    One instance serves every agent of a conversation: the steps are the
+    order in which the agents called the model. Calls and the bytes sent
+    to and received from the model are counted until the next `load`.
+    """
+
+    model: str = "replay"
+    latency: float = 0.0
+    steps: list[dict] = []
+    calls: int = 0
+    bytes_sent: int = 0
+    bytes_received: int = 0
+
+    def load(self, steps: list[dict]) -> None:
+        self.steps = list(steps)
+        self.calls = 0
+        self.bytes_sent = 0
+        self.bytes_received = 0
+
+    async def generate_content_async(
+        self, llm_request: LlmRequest, stream: bool = False
+    ) -> AsyncGenerator[LlmResponse, None]:
+        if self.latency:
+            await asyncio.sleep(self.latency)
+
+        self.calls += 1
+        # What a real model API would receive: the history plus the
+        # config (system instruction and tool declarations)
+        self.bytes_sent += sum(len(c.model_dump_json(exclude_none=True)) for c in llm_request.contents or [])
+        if llm_request.config is not None:
+            self.bytes_sent += len(llm_request.config.model_dump_json(exclude_none=True))
+
+        step = self.steps.pop(0) if self.steps else None
+        if step is not None and "call" in step:
+            part = types.Part(function_call=types.FunctionCall(name=step["call"], args=step.get("args") or {}))
+        elif step is not None:
+            part = types.Part(text=step["text"])
+        else:
+            part = types.Part(text=echo_responses(function_responses(llm_request)))
+
+        content = types.Content(role="model", parts=[part])
+        self.bytes_received += len(content.model_dump_json(exclude_none=True))
+        yield LlmResponse(
+            content=content,
+            usage_metadata=types.GenerateContentResponseUsageMetadata(
+                prompt_token_count=0, candidates_token_count=0, total_token_count=0,
+            ),
+        )
+
+
+def transfer_to_catalog(_text: str) -> tuple[str, dict]:
+    return "transfer_to_agent", {"agent_name": "product_catalog_agent"}
+
+
+def lookup_product(text: str) -> tuple[str, dict]:
+    return "get_product_info", {"product_name": text}
+
+
+BRANDS_IN_RE = re.compile(r"brands .*\bin (.+?)\??$", re.IGNORECASE)
+PRODUCTS_UNDER_RE = re.compile(r"show me (.+) products under \$(\d+)", re.IGNORECASE)
+TELL_ME_ABOUT_RE = re.compile(r"tell me about (?:the )?(.+?)\.?$", re.IGNORECASE)
+
+
+def route_catalog_request(text: str) -> tuple[str, dict]:
+    """
+    Pick the catalog tool a real model would call for the load-test messages
+    (category list, brands in a category, price-filtered search, product
+    lookup), so tool costs follow the message mix.
+    """
+    if "products do you have" in text.lower():
+        return "list_categories", {}
+    if match := BRANDS_IN_RE.search(text):
+        return "list_brands", {"category": match.group(1)}
+    if match := PRODUCTS_UNDER_RE.search(text):
+        return "search_products", {"category": match.group(1), "max_price": float(match.group(2))}
+    if match := TELL_ME_ABOUT_RE.search(text):
+        return "get_product_info", {"product_name": match.group(1)}
+    return "get_product_info", {"product_name": text}
+
+
+def support_model(latency: float = 0.0) -> ScriptedLlm:
+    """
+    Customer support stand-in: always delegates to the catalog agent.
+    """
+    return ScriptedLlm(tool_call=transfer_to_catalog, latency=latency)
+
+
+def catalog_model(latency: float = 0.0) -> ScriptedLlm:
+    """
+    Product catalog stand-in: looks up the user's message as a product name.
+    """
+    return ScriptedLlm(tool_call=lookup_product, latency=latency)
+
+
+def routed_catalog_model(latency: float = 0.0) -> ScriptedLlm:
+    """
+    Product catalog stand-in that picks the tool from the message wording.
+    """
+    return ScriptedLlm(tool_call=route_catalog_request, latency=latency)
@@ -0,0 +1,107 @@
+import csv
+import random
+from pathlib import Path
+
+# Same header as the Datafiniti electronics pricing export
+DATAFINITI_COLUMNS = [
+    "id", "prices.amountMax", "prices.amountMin", "prices.availability",
+    "prices.condition", "prices.currency", "prices.dateSeen", "prices.isSale",
+    "prices.merchant", "prices.shipping", "prices.sourceURLs", "asins", "brand",
+    "categories", "dateAdded", "dateUpdated", "ean", "imageURLs", "keys",
+    "manufacturer", "manufacturerNumber", "name", "primaryCategories",
+    "sourceURLs", "upc", "weight",
+]
+
+BRANDS = [
+    "Sony", "Samsung", "LG", "Boytone", "Sanus", "Bose", "JBL", "Logitech",
+    "Apple", "Panasonic", "Pioneer", "Yamaha", "Canon", "Nikon", "Garmin",
+    "Toshiba", "Vizio", "Polk Audio", "Klipsch", "Denon", "Onkyo", "Sennheiser",
+    "Beats", "Microsoft", "Dell", "HP", "Lenovo", "Asus", "Acer", "Netgear",
+]
+
+CATEGORIES = {
+    "Headphones": "Headphones,Bluetooth & Wireless Headphones,Audio,Electronics",
+    "TV": "TVs,Home Entertainment,4K Ultra HD TVs,Electronics",
+    "Speaker": "Speakers,Home Audio & Theater,Portable Bluetooth Speakers",
+    "Home Theater System": "Home Audio & Theater,Home Theater Systems,Electronics",
+    "Mount": "TV Mounts,Mounts & Stands,Home Entertainment",
+    "Laptop": "Computers,Laptops,PC Laptops & Netbooks",
+    "Camera": "Cameras & Camcorders,Digital Cameras,Electronics",
+    "Router": "Networking,Wireless Routers,Computers",
+    "Receiver": "Home Audio & Theater,AV Receivers & Amplifiers",
+    "Smartwatch": "Wearable Technology,Smartwatches,Electronics",
+}
+
+MERCHANTS = ["Bestbuy.com", "Walmart.com", "Amazon.com", "bhphotovideo.com", "ebay.com"]
+
+AVAILABILITY = [
+    "In Stock", "In Stock", "In Stock", "yes", "TRUE", "Special Order",
+    "More on the Way", "Out Of Stock", "Retired", "7 available", "",
+]
+
+WEIGHT_UNITS = ["pounds", "lbs", "oz", "ounces"]
+
+
+def synthetic_row(rng: random.Random, i: int, model_space: int) -> list:
+    brand = rng.choice(BRANDS)
+    kind = rng.choice(list(CATEGORIES))
+    model = f"{brand[:2].upper()}-{rng.randint(100, 100 + model_space)}{rng.choice('ABCDXZ')}"
+    name = f"{brand} - {model} {kind}"
+
+    price_max = round(rng.uniform(9.99, 2999.99), 2)
+    price_min = price_max if rng.random() < 0.7 else round(price_max * rng.uniform(0.7, 0.99), 2)
+    if rng.random() < 0.05:
+        price_min = price_max = ""
+
+    weight = f"{round(rng.uniform(0.2, 60), 1)} {rng.choice(WEIGHT_UNITS)}" if rng.random() < 0.9 else ""
+    slug = model.lower()
+
+    return [
+        f"AV{i:010d}",
+        price_max,
+        price_min,
+        rng.choice(AVAILABILITY),
+        "New",
+        "USD",
+        "2018-01-29T14:00:00Z",
+        rng.choice(["TRUE", "FALSE"]),
+        rng.choice(MERCHANTS),
+        rng.choice(["Free Shipping", "Value", ""]),
+        f"https://www.example.com/site/{slug}.p",
+        f"B0{rng.randint(10_000_000, 99_999_999)}",
+        brand,
+        CATEGORIES[kind],
+        "2015-05-18T14:14:56Z",
+        "2018-06-13T19:39:02Z",
+        rng.randint(10**11, 10**12 - 1),
+        f"https://images.example.com/{slug}.jpg",
+        f"{brand.lower()}/{slug}",
+        brand,
+        model,
+        name,
+        "Electronics",
+        f"https://www.example.com/product/{slug}",
+        rng.randint(10**11, 10**12 - 1),
+        weight,
+    ]
+
+
+def generate_products_csv(path: str, rows: int, seed: int = 7) -> Path:
+    """
+    Write a Datafiniti-shaped product CSV with `rows` rows.
+
+    Roughly three listings share each product name (different merchants
+    and prices), as in the real export. The output is deterministic for a
+    given seed and row count.
+    """
+    rng = random.Random(seed)
+    model_space = max(rows // (3 * len(BRANDS)), 10)
+
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with path.open("w", newline="", encoding="utf-8") as f:
+        writer = csv.writer(f)
+        writer.writerow(DATAFINITI_COLUMNS)
+        for i in range(rows):
+            writer.writerow(synthetic_row(rng, i, model_space))
+    return path
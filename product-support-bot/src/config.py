@@ -14,8 +14,77 @@ DATA_CSV_PATH = os.getenv(
     str(BASE_DIR / "data" / "DatafinitiElectronicsProductsPricingData.csv"),
 )
 
-# API key for Gemini 
+# Columnar cache of the parsed dataset (empty string disables it)
+DATA_CACHE_DIR = os.getenv("DATA_CACHE_DIR", str(BASE_DIR / "data" / ".cache")) or None
+
+# Optional cap on catalog rows; the full dataset is loaded by default
+DATA_MAX_ROWS = int(os.getenv("DATA_MAX_ROWS")) if os.getenv("DATA_MAX_ROWS") else None
+
+# Catalog tool result cache
+CATALOG_CACHE_SIZE = int(os.getenv("CATALOG_CACHE_SIZE", "1024"))
+CATALOG_CACHE_TTL = float(os.getenv("CATALOG_CACHE_TTL", "300"))
+
+# Catalog hot reload: poll interval for the dataset file in seconds (0 disables)
+# and the token required by the /admin/catalog endpoints (not served without one)
+CATALOG_WATCH_INTERVAL = float(os.getenv("CATALOG_WATCH_INTERVAL", "0"))
+CATALOG_ADMIN_TOKEN = os.getenv("CATALOG_ADMIN_TOKEN")
+
+# Catalog server profile: "dev" (single process, auto-reload) or "prod"
+# (pre-fork workers sharing one loaded catalog); 0 workers = one per CPU
+CATALOG_SERVER_PROFILE = os.getenv("CATALOG_SERVER_PROFILE", "dev").lower()
+CATALOG_WORKERS = int(os.getenv("CATALOG_WORKERS", "0")) or os.cpu_count() or 1
+CATALOG_HOST = os.getenv("CATALOG_HOST", "0.0.0.0")
+CATALOG_PORT = int(os.getenv("PORT", "8001"))
+
+# Catalog tools run on a bounded thread pool, off the event loop: worker
+# threads (0 runs them inline on the loop), calls allowed to wait for a
+# thread before new ones are turned away, and seconds before a call gives up
+CATALOG_TOOL_WORKERS = int(os.getenv("CATALOG_TOOL_WORKERS", str(min(32, os.cpu_count() or 1))))
+CATALOG_TOOL_QUEUE = int(os.getenv("CATALOG_TOOL_QUEUE", "64"))
+CATALOG_TOOL_TIMEOUT = float(os.getenv("CATALOG_TOOL_TIMEOUT", "10"))
+
+# Where the customer support agent reaches the catalog:
+# "a2a" (remote catalog server, split deployments) or "local" (in-process sub-agent)
+CATALOG_MODE = os.getenv("CATALOG_MODE", "a2a").lower()
+
+# Remote catalog (A2A mode): base URL and the pooled HTTP client used for it
+PRODUCT_CATALOG_BASE_URL = os.getenv("PRODUCT_CATALOG_BASE_URL", "http://localhost:8001").rstrip("/")
+A2A_MAX_CONNECTIONS = int(os.getenv("A2A_MAX_CONNECTIONS", "100"))
+A2A_MAX_KEEPALIVE = int(os.getenv("A2A_MAX_KEEPALIVE", "20"))
+A2A_KEEPALIVE_EXPIRY = float(os.getenv("A2A_KEEPALIVE_EXPIRY", "30"))
+A2A_CONNECT_TIMEOUT = float(os.getenv("A2A_CONNECT_TIMEOUT", "5"))
+A2A_READ_TIMEOUT = float(os.getenv("A2A_READ_TIMEOUT", "600"))
+A2A_POOL_TIMEOUT = float(os.getenv("A2A_POOL_TIMEOUT", "10"))
+A2A_HTTP2 = os.getenv("A2A_HTTP2", "0").lower() in ("1", "true", "yes")
+A2A_CARD_TTL = float(os.getenv("A2A_CARD_TTL", "300"))
+
+# Customer support: answer unambiguous turns (exact product names, memory
+# questions) directly from tools before calling the LLM
+SUPPORT_FAST_PATH = os.getenv("SUPPORT_FAST_PATH", "1").lower() not in ("0", "false", "no")
+
+# Gradio UI: chat turns handled concurrently and the queue size beyond that
+UI_CONCURRENCY_LIMIT = int(os.getenv("UI_CONCURRENCY_LIMIT", "16"))
+UI_QUEUE_MAX_SIZE = int(os.getenv("UI_QUEUE_MAX_SIZE", "64"))
+
+# Session store: most sessions kept (least recently used evicted first),
+# idle seconds before a session expires (0 disables) and events kept per session
+SESSION_MAX_SESSIONS = int(os.getenv("SESSION_MAX_SESSIONS", "1000"))
+SESSION_IDLE_TTL = float(os.getenv("SESSION_IDLE_TTL", "1800"))
+SESSION_MAX_EVENTS = int(os.getenv("SESSION_MAX_EVENTS", "200"))
+
+# Session backend: "memory" (lost on restart) or "sqlite" (local WAL database,
+# written behind the request path in batches every SESSION_DB_FLUSH_INTERVAL seconds)
+SESSION_BACKEND = os.getenv("SESSION_BACKEND", "memory").lower()
+SESSION_DB_PATH = os.getenv("SESSION_DB_PATH", str(BASE_DIR / "data" / "sessions.db"))
+SESSION_DB_FLUSH_INTERVAL = float(os.getenv("SESSION_DB_FLUSH_INTERVAL", "0.05"))
+
+# API key for Gemini. Checked when a Gemini-backed agent is built rather than
+# at import, so modules (and offline tools, tests, benchmarks) import without it
 GOOGLE_API_KEY = os.getenv("GOOGLE_API_KEY")
 
-if not GOOGLE_API_KEY:
-    raise ValueError("GOOGLE_API_KEY is not set in the environment variables.")
\ No newline at end of file
+
+def require_google_api_key() -> str:
+    key = os.getenv("GOOGLE_API_KEY") or GOOGLE_API_KEY
+    if not key:
+        raise ValueError("GOOGLE_API_KEY is not set in the environment variables.")
+    return key
@@ -1,7 +1,229 @@
+import hashlib
+import os
+import re
+from pathlib import Path
+from typing import Iterator
+
+import numpy as np
 import pandas as pd
+from pandas.api.types import union_categoricals
+
+# Bump when the on-disk cache layout or dtype rules change
+CACHE_FORMAT_VERSION = 2
+CHUNK_SIZE = 50_000
+
+
+def load_products_df(
+    csv_path: str,
+    nrows: int | None = None,
+    cache_dir: str | None = None,
+    chunksize: int = CHUNK_SIZE,
+) -> pd.DataFrame:
+    """
+    Load the product catalog.
+
+    Only the columns the catalog uses are parsed, in chunks with explicit
+    dtypes. When `cache_dir` is given, each chunk is appended to a columnar
+    (Feather) cache keyed by a fingerprint of the source as soon as it is
+    parsed, so peak memory stays around one chunk, and the frame is then
+    memory-mapped from that file; later loads map it without parsing the
+    CSV again. Text columns stay in the mapped Arrow buffers
+    (pyarrow-backed strings) rather than being copied into Python string
+    objects.
+    """
+    if cache_dir is None:
+        return read_products_csv(csv_path, nrows=nrows, chunksize=chunksize)
+
+    try:
+        import pyarrow  # noqa: F401
+    except ImportError:
+        # pyarrow is optional; without it we always parse the CSV
+        return read_products_csv(csv_path, nrows=nrows, chunksize=chunksize)
+
+    cache_path = cache_path_for(csv_path, cache_dir, nrows=nrows)
+    if cache_path.exists():
+        return read_feather_cache(cache_path)
+
+    cache_path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = cache_path.with_suffix(f".{os.getpid()}.tmp")
+    try:
+        write_feather_cache(csv_path, tmp_path, nrows=nrows, chunksize=chunksize)
+        os.replace(tmp_path, cache_path)
+    finally:
+        if tmp_path.exists():
+            tmp_path.unlink()
+    remove_stale_caches(csv_path, cache_path)
+
+    return read_feather_cache(cache_path)
+
+
+def write_feather_cache(
+    csv_path: str,
+    path: Path,
+    nrows: int | None = None,
+    chunksize: int = CHUNK_SIZE,
+) -> None:
+    """
+    Stream the CSV into an uncompressed Feather (Arrow IPC) file, writing
+    each chunk's record batches as soon as it is parsed. Chunks are read without categoricals: per-chunk
+    categories would give every batch a different dictionary.
+    """
+    import pyarrow as pa
+
+    header = pd.read_csv(csv_path, nrows=0)
+    dtypes, price_cols = column_dtypes(header, categorical=False)
+    schema = pa.schema([
+        (col, pa.float64() if col in price_cols else pa.string())
+        for col in dtypes
+    ])
+
+    # Uncompressed so the cache can be memory-mapped
+    with pa.OSFile(str(path), "wb") as sink, pa.ipc.new_file(sink, schema) as writer:
+        for chunk in iter_products_csv(csv_path, nrows=nrows, chunksize=chunksize, categorical=False):
+            writer.write_table(pa.Table.from_pandas(chunk, schema=schema, preserve_index=False))
+
+
+def read_feather_cache(cache_path: Path) -> pd.DataFrame:
+    import pyarrow as pa
+    import pyarrow.feather as feather
+
+    table = feather.read_table(str(cache_path), memory_map=True)
+    try:
+        # pandas 3's "str" dtype: pyarrow-backed, NaN for missing values
+        string_dtype = pd.StringDtype("pyarrow", na_value=np.nan)
+    except TypeError:
+        # pandas < 2.3 only has Python string objects with NaN
+        return table.to_pandas(split_blocks=True)
+
+    # Strings become pyarrow-backed columns that reference the mapped file;
+    # split_blocks keeps other columns from being consolidated into fresh
+    # 2-D copies
+    types = {pa.string(): string_dtype, pa.large_string(): string_dtype}
+    return table.to_pandas(split_blocks=True, types_mapper=types.get)
+
+
+def remove_stale_caches(csv_path: str, cache_path: Path) -> None:
+    """
+    Delete caches of the same source written for older fingerprints.
+
+    Processes still reading an old file keep their mapping; the file is
+    freed once they close it.
+    """
+    pattern = re.compile(re.escape(Path(csv_path).stem) + r"-[0-9a-f]{16}\.feather")
+    for path in cache_path.parent.iterdir():
+        if path != cache_path and pattern.fullmatch(path.name):
+            try:
+                path.unlink()
+            except OSError:
+                pass
+
+
+# ----------------------------
+# Streaming CSV ingestion
+# ----------------------------
+
+def source_fingerprint(csv_path: str, nrows: int | None = None) -> str:
+    """
+    Cheap fingerprint of the source file: path, size and mtime, plus the
+    load options that change the parsed result.
+    """
+    stat = os.stat(csv_path)
+    key = "|".join([
+        str(Path(csv_path).resolve()),
+        str(stat.st_size),
+        str(stat.st_mtime_ns),
+        str(nrows),
+        str(CACHE_FORMAT_VERSION),
+    ])
+    return hashlib.sha1(key.encode("utf-8")).hexdigest()[:16]
+
+
+def cache_path_for(csv_path: str, cache_dir: str, nrows: int | None = None) -> Path:
+    fingerprint = source_fingerprint(csv_path, nrows=nrows)
+    return Path(cache_dir) / f"{Path(csv_path).stem}-{fingerprint}.feather"
+
+
+def column_dtypes(header: pd.DataFrame, categorical: bool = True) -> tuple[dict, list[str]]:
+    """
+    Explicit read dtypes for the detected columns, the only ones the
+    catalog uses (the keys double as `usecols`).
+
+    Brand, merchant and category are low-cardinality and stored as
+    categoricals (unless `categorical` is False); everything else is read
+    as text. Price columns are returned separately and converted to
+    numbers after parsing.
+    """
+    columns = detect_columns(header)
+    used = set(columns.values())
+
+    categorical_cols = {
+        columns[key]
+        for key in ("brand_col", "store_col", "category_col")
+        if columns[key] and categorical
+    }
+    price_cols = [
+        columns[key]
+        for key in ("price_min_col", "price_max_col")
+        if columns[key]
+    ]
+
+    dtypes = {}
+    for col in header.columns:
+        if col not in used:
+            continue
+        if col in categorical_cols:
+            dtypes[col] = "category"
+        else:
+            dtypes[col] = str
+
+    return dtypes, price_cols
+
+
+def iter_products_csv(
+    csv_path: str,
+    nrows: int | None = None,
+    chunksize: int = CHUNK_SIZE,
+    categorical: bool = True,
+) -> Iterator[pd.DataFrame]:
+    header = pd.read_csv(csv_path, nrows=0)
+    dtypes, price_cols = column_dtypes(header, categorical=categorical)
+
+    reader = pd.read_csv(csv_path, usecols=list(dtypes), dtype=dtypes, nrows=nrows, chunksize=chunksize)
+    with reader:
+        for chunk in reader:
+            for col in price_cols:
+                chunk[col] = pd.to_numeric(chunk[col], errors="coerce")
+            yield chunk
+
+
+def read_products_csv(
+    csv_path: str,
+    nrows: int | None = None,
+    chunksize: int = CHUNK_SIZE,
+) -> pd.DataFrame:
+    """
+    The catalog frame built in memory, for loads without a Feather cache
+    (no `cache_dir`, or pyarrow not installed).
+    """
+    chunks = list(iter_products_csv(csv_path, nrows=nrows, chunksize=chunksize))
+
+    if len(chunks) == 1:
+        return chunks[0]
+
+    # Assemble one column at a time, taking it out of the chunks as we go,
+    # so each column's chunk pieces are released once it is assembled
+    columns = {}
+    for col in list(chunks[0].columns):
+        pieces = [chunk.pop(col) for chunk in chunks]
+        if isinstance(pieces[0].dtype, pd.CategoricalDtype):
+            # Each chunk has its own categories; union them to keep the dtype
+            columns[col] = pd.Series(union_categoricals(pieces), name=col)
+        else:
+            columns[col] = pd.concat(pieces, ignore_index=True)
+        del pieces
+
+    return pd.DataFrame(columns, copy=False)
 
-def load_products_df(csv_path: str, nrows: int = 2000) -> pd.DataFrame:
-    return pd.read_csv(csv_path, nrows=nrows)
 
 def detect_columns(products_df: pd.DataFrame) -> dict:
     def find_col(substrings, default=None):
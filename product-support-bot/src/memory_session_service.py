@@ -1,13 +1,234 @@
 # src/memory_session_service.py
 
-from google.adk.sessions import InMemorySessionStore, SessionService
+import json
+import threading
+import time
+from collections import OrderedDict, deque
+from typing import Any, Optional
 
+from google.adk.events import Event
+from google.adk.sessions import InMemorySessionService, Session
 
-class InMemorySessionService(SessionService):
+from src.config import SESSION_BACKEND, SESSION_IDLE_TTL, SESSION_MAX_EVENTS, SESSION_MAX_SESSIONS
+
+SessionKey = tuple[str, str, str]  # (app_name, user_id, session_id)
+
+SESSION_BACKENDS = ("memory", "sqlite")
+
+
+def _approx_bytes(value: Any) -> int:
+    """
+    Rough in-memory footprint of a session value: the size of its JSON form.
+    """
+    if hasattr(value, "model_dump_json"):
+        return len(value.model_dump_json(exclude_none=True))
+    return len(json.dumps(value, default=str))
+
+
+class BoundedInMemorySessionService(InMemorySessionService):
+    """
+    ADK's in-memory session service with bounded memory.
+
+    - At most `max_sessions` sessions are kept; creating one more evicts the
+      least recently used session.
+    - Sessions not read or written for `idle_ttl` seconds expire.
+    - Each session stores at most `max_events` events. Older events are
+      dropped a whole turn at a time (from one user message to the next), so
+      a function call is never separated from its response. Session state
+      is kept, so memory such as `user:last_product` survives compaction.
+
+    When the last session of a user goes away, that user's `user:` state is
+    dropped as well, unless `keep_user_state` is set.
     """
-    Simple wrapper so we can easily share a single session service
-    between tests, Gradio app, etc.
+
+    def __init__(
+        self,
+        max_sessions: int = SESSION_MAX_SESSIONS,
+        idle_ttl: float = SESSION_IDLE_TTL,
+        max_events: int = SESSION_MAX_EVENTS,
+        keep_user_state: bool = False,
+    ):
+        super().__init__()
+        self.max_sessions = max_sessions
+        self.idle_ttl = idle_ttl
+        self.max_events = max_events
+        self.keep_user_state = keep_user_state
+
+        # Session key -> last access time, least recently used first
+        self._access: OrderedDict[SessionKey, float] = OrderedDict()
+        # Session key -> approximate size of each stored event, oldest first
+        self._event_bytes: dict[SessionKey, deque[int]] = {}
+        self._lock = threading.Lock()
+
+        self.evictions = 0
+        self.expirations = 0
+        self.compacted_events = 0
+
+    # ----------------------------
+    # Bookkeeping
+    # ----------------------------
+
+    def _touch(self, key: SessionKey) -> None:
+        self._access[key] = time.monotonic()
+        self._access.move_to_end(key)
+
+    def _drop(self, key: SessionKey) -> None:
+        """
+        Remove a session from storage (and its user's state if orphaned).
+        """
+        app_name, user_id, session_id = key
+        self._access.pop(key, None)
+        self._event_bytes.pop(key, None)
+
+        user_sessions = self.sessions.get(app_name, {}).get(user_id)
+        if user_sessions is None:
+            return
+        user_sessions.pop(session_id, None)
+        if not user_sessions:
+            del self.sessions[app_name][user_id]
+            if not self.keep_user_state:
+                self.user_state.get(app_name, {}).pop(user_id, None)
+
+    def _expire_idle(self) -> None:
+        if self.idle_ttl <= 0:
+            return
+        deadline = time.monotonic() - self.idle_ttl
+        while self._access:
+            key, last_access = next(iter(self._access.items()))
+            if last_access > deadline:
+                break
+            self._drop(key)
+            self.expirations += 1
+
+    def _evict_over_capacity(self) -> None:
+        while len(self._access) > self.max_sessions:
+            key = next(iter(self._access))
+            self._drop(key)
+            self.evictions += 1
+
+    def _compact(self, key: SessionKey, session: Session) -> None:
+        """
+        Trim the oldest whole turns once a session holds more than `max_events`.
+        """
+        excess = len(session.events) - self.max_events
+        if excess <= 0:
+            return
+
+        # Cut at the first user message at or after `excess`; if the current
+        # turn alone is over the cap, wait until the next turn starts
+        cut = next(
+            (i for i in range(excess, len(session.events)) if session.events[i].author == "user"),
+            None,
+        )
+        if cut is None:
+            return
+
+        del session.events[:cut]
+        sizes = self._event_bytes.get(key)
+        if sizes is not None:
+            for _ in range(min(cut, len(sizes))):
+                sizes.popleft()
+        self.compacted_events += cut
+
+    # ----------------------------
+    # SessionService API
+    # ----------------------------
+
+    async def create_session(
+        self,
+        *,
+        app_name: str,
+        user_id: str,
+        state: Optional[dict[str, Any]] = None,
+        session_id: Optional[str] = None,
+    ) -> Session:
+        with self._lock:
+            self._expire_idle()
+        session = await super().create_session(
+            app_name=app_name, user_id=user_id, state=state, session_id=session_id,
+        )
+        with self._lock:
+            key = (app_name, user_id, session.id)
+            self._event_bytes[key] = deque()
+            self._touch(key)
+            self._evict_over_capacity()
+        return session
+
+    async def get_session(self, *, app_name: str, user_id: str, session_id: str, config=None) -> Optional[Session]:
+        with self._lock:
+            self._expire_idle()
+            key = (app_name, user_id, session_id)
+            if key in self._access:
+                self._touch(key)
+        return await super().get_session(
+            app_name=app_name, user_id=user_id, session_id=session_id, config=config,
+        )
+
+    async def delete_session(self, *, app_name: str, user_id: str, session_id: str) -> None:
+        with self._lock:
+            self._drop((app_name, user_id, session_id))
+
+    async def append_event(self, session: Session, event: Event) -> Event:
+        event = await super().append_event(session=session, event=event)
+        if event.partial:
+            return event
+
+        with self._lock:
+            key = (session.app_name, session.user_id, session.id)
+            stored = self.sessions.get(session.app_name, {}).get(session.user_id, {}).get(session.id)
+            if stored is None:
+                # Evicted or expired while the turn was running
+                return event
+
+            self._event_bytes.setdefault(key, deque()).append(_approx_bytes(event))
+            self._touch(key)
+            self._compact(key, stored)
+            return event
+
+    # ----------------------------
+    # Gauges
+    # ----------------------------
+
+    def stats(self) -> dict:
+        with self._lock:
+            state_bytes = sum(
+                _approx_bytes(session.state)
+                for users in self.sessions.values()
+                for sessions in users.values()
+                for session in sessions.values()
+            )
+            state_bytes += sum(
+                _approx_bytes(state) for users in self.user_state.values() for state in users.values()
+            )
+            state_bytes += sum(_approx_bytes(state) for state in self.app_state.values())
+            event_bytes = sum(sum(sizes) for sizes in self._event_bytes.values())
+
+            return {
+                "live_sessions": len(self._access),
+                "max_sessions": self.max_sessions,
+                "idle_ttl_seconds": self.idle_ttl,
+                "max_events_per_session": self.max_events,
+                "events_held": sum(len(sizes) for sizes in self._event_bytes.values()),
+                "approx_bytes": event_bytes + state_bytes,
+                "evictions": self.evictions,
+                "expirations": self.expirations,
+                "compacted_events": self.compacted_events,
+            }
+
+
+def create_session_service(backend: str = SESSION_BACKEND, **kwargs) -> BoundedInMemorySessionService:
     """
+    Session service for the support agent.
 
-    def __init__(self):
-        super().__init__(session_store=InMemorySessionStore())
+    - "memory": bounded in-memory store; sessions are lost on restart
+    - "sqlite": the same store as a cache in front of a local SQLite
+                database, so sessions and user preferences survive restarts
+                and can be shared by processes on one host
+    """
+    if backend == "memory":
+        return BoundedInMemorySessionService(**kwargs)
+    if backend == "sqlite":
+        # Imported here so the in-memory backend never touches sqlite
+        from src.sqlite_session_service import SqliteSessionService
+        return SqliteSessionService(**kwargs)
+    raise ValueError(f"Unknown SESSION_BACKEND {backend!r}; expected one of {SESSION_BACKENDS}")
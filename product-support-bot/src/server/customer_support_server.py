@@ -1,14 +1,86 @@
 from fastapi import FastAPI
+from fastapi.responses import JSONResponse, PlainTextResponse
 from google.adk.a2a.utils.agent_to_a2a import to_a2a
 
-from src.agents.customer_support.agent import customer_support_agent
+from src.agents.customer_support.agent import get_customer_support_agent
+from src.agents.customer_support.router import router_stats
+from src.agents.a2a_client import a2a_client_stats
+from src.agents.instrumentation import (
+    InstrumentedRunner,
+    instrument_agent,
+    instrument_session_service,
+    start_event_loop_lag_monitor,
+)
+from src.memory_session_service import create_session_service
+from src.config import CATALOG_MODE
+from src.metrics import CONTENT_TYPE, registry
 
 app = FastAPI()
 
+customer_support_agent = get_customer_support_agent()
+
+if CATALOG_MODE == "local":
+    # The in-process catalog loads its dataset on first use; start loading it
+    # when the server starts so the first turn does not pay for it
+    from src.agents.product_catalog.loader import catalog_ready, warm_catalog_in_background
+
+    app.router.add_event_handler("startup", warm_catalog_in_background)
+
+# Conversations live in a bounded store instead of ADK's default unbounded one
+session_service = create_session_service()
+
+# Per-stage timings (agents, LLM calls, A2A hop, tools, session I/O) and token counts
+instrument_agent(customer_support_agent)
+instrument_session_service(session_service)
+app.router.add_event_handler("startup", start_event_loop_lag_monitor)
+registry.gauge_fn("sessions_live", "Sessions held by the session service",
+                  lambda: session_service.stats()["live_sessions"])
+registry.gauge_fn("sessions_approx_bytes", "Approximate bytes held by the session service",
+                  lambda: session_service.stats()["approx_bytes"])
+
+runner = InstrumentedRunner(
+    agent=customer_support_agent,
+    app_name=customer_support_agent.name,
+    session_service=session_service,
+)
+
 # Turn the agent into an A2A ASGI app and expose its routes
-a2a_app = to_a2a(customer_support_agent)
+a2a_app = to_a2a(customer_support_agent, runner=runner)
 app.router.routes.extend(a2a_app.router.routes)
 
 @app.get("/health")
 def health():
     return {"status": "ok"}
+
+
+@app.get("/ready")
+def ready():
+    # Readiness probe; with an in-process catalog, 503 until its dataset is loaded
+    if CATALOG_MODE == "local" and not catalog_ready():
+        return JSONResponse({"status": "loading"}, status_code=503)
+    return {"status": "ready"}
+
+
+@app.get("/stats/router")
+def fast_path_stats():
+    # Fraction of turns answered by the fast-path router without the LLM
+    return router_stats.snapshot()
+
+
+@app.get("/stats/a2a")
+def a2a_stats():
+    # Connection reuse / pool saturation of the catalog A2A client, for sizing
+    # A2A_MAX_CONNECTIONS and A2A_MAX_KEEPALIVE
+    return a2a_client_stats()
+
+
+@app.get("/stats/sessions")
+def session_stats():
+    # Live sessions and approximate bytes held, for sizing SESSION_MAX_* / SESSION_IDLE_TTL
+    return session_service.stats()
+
+
+@app.get("/metrics", response_class=PlainTextResponse)
+def metrics():
+    # Prometheus scrape endpoint
+    return PlainTextResponse(registry.render(), media_type=CONTENT_TYPE)
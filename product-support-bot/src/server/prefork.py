@@ -0,0 +1,182 @@
+import gc
+import os
+import signal
+import socket
+import time
+
+import uvicorn
+
+
+# ----------------------------
+# Pre-fork supervisor
+# ----------------------------
+
+# Set in the supervisor before forking, so workers inherit it and know whom
+# to signal for a catalog reload
+supervisor_pid: int | None = None
+
+
+def _bind(host: str, port: int) -> socket.socket:
+    sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+    sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+    sock.bind((host, port))
+    sock.listen(2048)
+    sock.set_inheritable(True)
+    return sock
+
+
+def _run_worker(app, sock: socket.socket, log_level: str) -> None:
+    # The supervisor's handlers must not run in a worker; uvicorn installs
+    # its own SIGINT/SIGTERM handlers for graceful shutdown
+    signal.signal(signal.SIGHUP, signal.SIG_IGN)
+    signal.signal(signal.SIGUSR1, signal.SIG_IGN)
+
+    server = uvicorn.Server(uvicorn.Config(app, log_level=log_level))
+    server.run(sockets=[sock])
+
+
+def _spawn(app, sock: socket.socket, log_level: str) -> int:
+    pid = os.fork()
+    if pid == 0:
+        code = 0
+        try:
+            _run_worker(app, sock, log_level)
+        except BaseException:
+            code = 1
+        finally:
+            os._exit(code)
+    return pid
+
+
+def _freeze_heap() -> None:
+    """
+    Move every object allocated so far (the loaded catalog and its indexes)
+    into the GC's permanent generation. Collections in the workers then never
+    touch those objects, so their pages stay shared copy-on-write instead of
+    being copied into each worker.
+    """
+    gc.collect()
+    gc.freeze()
+
+
+def serve_prefork(
+    app,
+    host: str,
+    port: int,
+    workers: int,
+    reload_fn=None,
+    changed_fn=None,
+    watch_interval: float = 0.0,
+    log_level: str = "info",
+) -> None:
+    """
+    Serve `app` from `workers` forked processes sharing one listening socket.
+
+    Everything the supervisor loaded before calling this (the catalog
+    snapshot) is inherited read-only by the workers via fork copy-on-write,
+    so adding workers does not multiply the dataset in memory.
+
+    Signals to the supervisor:
+    - SIGHUP:  `reload_fn(force=False)`, then roll the workers if it built a
+               new snapshot
+    - SIGUSR1: same with force=True
+    - SIGTERM / SIGINT: graceful shutdown of all workers
+
+    With `watch_interval` > 0, `changed_fn()` is polled and a change triggers
+    the same reload. Workers that exit unexpectedly are restarted.
+    """
+    global supervisor_pid
+
+    supervisor_pid = os.getpid()
+    sock = _bind(host, port)
+    pending: dict[str, bool] = {"stop": False, "reload": False, "force": False}
+
+    def on_stop(signum, frame):
+        pending["stop"] = True
+
+    def on_reload(signum, frame):
+        pending["reload"] = True
+        pending["force"] = pending["force"] or signum == signal.SIGUSR1
+
+    signal.signal(signal.SIGTERM, on_stop)
+    signal.signal(signal.SIGINT, on_stop)
+    signal.signal(signal.SIGHUP, on_reload)
+    signal.signal(signal.SIGUSR1, on_reload)
+
+    _freeze_heap()
+    children = {_spawn(app, sock, log_level) for _ in range(workers)}
+    print(f"🚀 Pre-fork server on {host}:{port}: supervisor {supervisor_pid}, {workers} workers")
+
+    next_check = time.monotonic() + watch_interval
+    retiring: set[int] = set()
+
+    while not pending["stop"]:
+        time.sleep(0.2)
+
+        # Reap exited workers; restart the ones we did not retire
+        while True:
+            try:
+                pid, _ = os.waitpid(-1, os.WNOHANG)
+            except ChildProcessError:
+                break
+            if pid == 0:
+                break
+            if pid in retiring:
+                retiring.discard(pid)
+            elif pid in children:
+                children.discard(pid)
+                if not pending["stop"]:
+                    print(f"⚠️ Worker {pid} exited; restarting")
+                    children.add(_spawn(app, sock, log_level))
+
+        if watch_interval > 0 and changed_fn is not None and time.monotonic() >= next_check:
+            next_check = time.monotonic() + watch_interval
+            try:
+                if changed_fn():
+                    pending["reload"] = True
+            except OSError:
+                # File is being replaced; try again on the next tick
+                pass
+
+        if pending["reload"] and reload_fn is not None:
+            force = pending["force"]
+            pending["reload"] = pending["force"] = False
+            try:
+                rolled = reload_fn(force=force)
+            except Exception as e:
+                print(f"⚠️ Catalog reload failed; workers keep the current snapshot: {e}")
+                continue
+            if not rolled:
+                continue
+
+            # New generation first, then retire the old one: no gap in service
+            _freeze_heap()
+            old = children
+            children = {_spawn(app, sock, log_level) for _ in range(workers)}
+            for pid in old:
+                os.kill(pid, signal.SIGTERM)
+            retiring |= old
+            print(f"🔄 Catalog reloaded; rolled {workers} workers")
+
+    for pid in children | retiring:
+        try:
+            os.kill(pid, signal.SIGTERM)
+        except ProcessLookupError:
+            pass
+    for pid in children | retiring:
+        try:
+            os.waitpid(pid, 0)
+        except ChildProcessError:
+            pass
+    sock.close()
+
+
+def request_reload(force: bool = False) -> bool:
+    """
+    From a worker: ask the supervisor to reload the catalog and roll all
+    workers. Returns False when not running under the pre-fork supervisor.
+    """
+    if supervisor_pid is None or supervisor_pid == os.getpid():
+        return False
+    os.kill(supervisor_pid, signal.SIGUSR1 if force else signal.SIGHUP)
+    return True
@@ -1,21 +1,162 @@
-from src.config import GOOGLE_API_KEY
+from src.config import (
+    CATALOG_ADMIN_TOKEN,
+    CATALOG_WATCH_INTERVAL,
+    CATALOG_SERVER_PROFILE,
+    CATALOG_WORKERS,
+    CATALOG_HOST,
+    CATALOG_PORT,
+    DATA_MAX_ROWS,
+)
+from src.data.loader import source_fingerprint
 from src.agents.product_catalog.a2a_app import create_a2a_app
+from src.agents.product_catalog.loader import (
+    catalog_ready,
+    get_snapshot,
+    reload_catalog,
+    reload_catalog_in_background,
+    reload_status,
+    warm_catalog,
+    warm_catalog_in_background,
+    watch_catalog_file,
+)
+from src.agents.product_catalog.executor import tool_executor
+from src.agents.product_catalog.tools import tool_cache
+from src.metrics import CONTENT_TYPE, registry
+from src.server import prefork
+from starlette.requests import Request
+from starlette.responses import JSONResponse, Response
+from starlette.routing import Route
+import hmac
 import uvicorn
 import os
 
-# Create the A2A FastAPI app
-app = create_a2a_app(port=8001)
+# Create the A2A FastAPI app. Importing this module does not load the
+# dataset: each server process starts loading it in the background when it
+# starts, and /ready reports when the catalog and its indexes are built.
+app = create_a2a_app(port=CATALOG_PORT, on_startup=[warm_catalog_in_background])
 
 
-if __name__ == "__main__":
-    uvicorn.run(
-        "src.server.product_catalog_server:app",
-        host="0.0.0.0",
-        port=8001,
-        reload=True,
+# ------------------------------------------------------------
+# Catalog admin: status and zero-downtime reload
+# ------------------------------------------------------------
+def _authorized(request: Request) -> bool:
+    token = request.headers.get("x-admin-token", "")
+    return bool(CATALOG_ADMIN_TOKEN) and hmac.compare_digest(token.encode(), CATALOG_ADMIN_TOKEN.encode())
+
+
+async def catalog_status(request: Request):
+    if not _authorized(request):
+        return JSONResponse({"error": "forbidden"}, status_code=403)
+    return JSONResponse({
+        **reload_status(),
+        "tool_executor": tool_executor.stats(),
+        "pid": os.getpid(),
+        "supervisor_pid": prefork.supervisor_pid,
+    })
+
+
+async def catalog_reload(request: Request):
+    """
+    Rebuild the catalog snapshot in the background; requests keep being
+    served from the current snapshot until the new one is swapped in.
+    Pass ?force=1 to rebuild even if the source file is unchanged.
+
+    Under the prod profile the supervisor reloads once and rolls every
+    worker, instead of each worker building its own copy.
+    """
+    if not _authorized(request):
+        return JSONResponse({"error": "forbidden"}, status_code=403)
+
+    force = request.query_params.get("force") == "1"
+    if prefork.request_reload(force=force):
+        return JSONResponse({"status": "reloading", "scope": "all_workers", **reload_status()}, status_code=202)
+
+    started = reload_catalog_in_background(force=force)
+    return JSONResponse(
+        {"status": "reloading" if started else "already_reloading", **reload_status()},
+        status_code=202,
     )
 
 
+# ------------------------------------------------------------
+# Prometheus metrics (per worker under the prod profile)
+# ------------------------------------------------------------
+registry.gauge_fn("catalog_rows", "Rows in the live catalog snapshot",
+                  lambda: get_snapshot().store.size if catalog_ready() else 0)
+registry.gauge_fn("catalog_tool_cache_entries", "Entries in the catalog tool result cache",
+                  lambda: tool_cache.stats()["size"])
+registry.gauge_fn("catalog_tool_cache_hit_ratio", "Hit ratio of the catalog tool result cache",
+                  lambda: tool_cache.stats()["hit_rate"])
+registry.counter_fn("catalog_tool_coalesced_total", "Catalog tool calls that shared an identical in-flight call",
+                    lambda: tool_cache.stats()["coalesced"])
+registry.gauge_fn("catalog_tool_in_flight", "Distinct catalog tool computations in progress",
+                  lambda: tool_cache.stats()["in_flight"])
+
+
+async def metrics(request: Request):
+    return Response(registry.render(), media_type=CONTENT_TYPE)
+
+
+async def ready(request: Request):
+    # Readiness probe: 503 until the catalog snapshot and indexes are built
+    return JSONResponse(reload_status(), status_code=200 if catalog_ready() else 503)
+
+
+app.router.routes.extend([
+    Route("/metrics", metrics, methods=["GET"]),
+    Route("/ready", ready, methods=["GET"]),
+])
+
+# The server listens on all interfaces and a reload rebuilds the whole
+# catalog, so the admin endpoints only exist when a token protects them
+if CATALOG_ADMIN_TOKEN:
+    app.router.routes.extend([
+        Route("/admin/catalog", catalog_status, methods=["GET"]),
+        Route("/admin/catalog/reload", catalog_reload, methods=["POST"]),
+    ])
+
+# When run as __main__ (prod profile) the supervisor polls the file itself
+# and rolls the workers; a watcher thread would only reload one process
+if CATALOG_WATCH_INTERVAL > 0 and __name__ != "__main__":
+    watch_catalog_file(CATALOG_WATCH_INTERVAL)
+
+
+# ------------------------------------------------------------
+# Serving profiles
+# ------------------------------------------------------------
+def _reload_for_workers(force: bool = False) -> bool:
+    previous = get_snapshot()
+    return reload_catalog(force=force) is not previous
+
+
+def _source_changed() -> bool:
+    snapshot = get_snapshot()
+    return source_fingerprint(snapshot.source, nrows=DATA_MAX_ROWS) != snapshot.version
+
+
+if __name__ == "__main__":
+    if CATALOG_SERVER_PROFILE == "prod":
+        # Load the catalog and indexes once here; the workers are forked
+        # from this process and share them copy-on-write
+        warm_catalog()
+        prefork.serve_prefork(
+            app,
+            host=CATALOG_HOST,
+            port=CATALOG_PORT,
+            workers=CATALOG_WORKERS,
+            reload_fn=_reload_for_workers,
+            changed_fn=_source_changed,
+            watch_interval=CATALOG_WATCH_INTERVAL,
+        )
+    else:
+        uvicorn.run(
+            "src.server.product_catalog_server:app",
+            host=CATALOG_HOST,
+            port=CATALOG_PORT,
+            reload=True,
+        )
+
+
 
 '''import os
 from src.agents.product_catalog.a2a_app import create_a2a_app
@@ -0,0 +1,492 @@
+# src/sqlite_session_service.py
+
+import asyncio
+import json
+import queue
+import sqlite3
+import threading
+import time
+from collections import Counter, deque
+from pathlib import Path
+from typing import Any, Hashable, Optional
+
+from google.adk.events import Event
+from google.adk.sessions import Session
+from google.adk.sessions.base_session_service import ListSessionsResponse
+from google.adk.sessions.state import State
+
+from src.config import SESSION_DB_FLUSH_INTERVAL, SESSION_DB_PATH
+from src.memory_session_service import BoundedInMemorySessionService, SessionKey
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS sessions (
+    app_name TEXT NOT NULL,
+    user_id TEXT NOT NULL,
+    id TEXT NOT NULL,
+    state TEXT NOT NULL,
+    update_time REAL NOT NULL,
+    PRIMARY KEY (app_name, user_id, id)
+);
+CREATE TABLE IF NOT EXISTS events (
+    seq INTEGER PRIMARY KEY AUTOINCREMENT,
+    app_name TEXT NOT NULL,
+    user_id TEXT NOT NULL,
+    session_id TEXT NOT NULL,
+    event TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS events_by_session ON events (app_name, user_id, session_id, seq);
+CREATE TABLE IF NOT EXISTS user_state_keys (
+    app_name TEXT NOT NULL,
+    user_id TEXT NOT NULL,
+    key TEXT NOT NULL,
+    value TEXT NOT NULL,
+    PRIMARY KEY (app_name, user_id, key)
+);
+CREATE TABLE IF NOT EXISTS app_state_keys (
+    app_name TEXT NOT NULL,
+    key TEXT NOT NULL,
+    value TEXT NOT NULL,
+    PRIMARY KEY (app_name, key)
+);
+"""
+
+UPSERT_SESSION = "INSERT OR REPLACE INTO sessions (app_name, user_id, id, state, update_time) VALUES (?, ?, ?, ?, ?)"
+# User and app state are stored one row per key, so writers on several
+# processes only ever replace the keys they changed
+UPSERT_USER_KEY = "INSERT OR REPLACE INTO user_state_keys (app_name, user_id, key, value) VALUES (?, ?, ?, ?)"
+UPSERT_APP_KEY = "INSERT OR REPLACE INTO app_state_keys (app_name, key, value) VALUES (?, ?, ?)"
+INSERT_EVENT = "INSERT INTO events (app_name, user_id, session_id, event) VALUES (?, ?, ?, ?)"
+DELETE_SESSION = "DELETE FROM sessions WHERE app_name = ? AND user_id = ? AND id = ?"
+DELETE_EVENTS = "DELETE FROM events WHERE app_name = ? AND user_id = ? AND session_id = ?"
+# Keep only a session's newest ? events (the ones compaction left in memory)
+PRUNE_EVENTS = (
+    "DELETE FROM events WHERE app_name = ? AND user_id = ? AND session_id = ? AND seq < ("
+    "SELECT MIN(seq) FROM (SELECT seq FROM events WHERE app_name = ? AND user_id = ? AND session_id = ?"
+    " ORDER BY seq DESC LIMIT ?))"
+)
+
+
+def split_state_delta(delta: dict[str, Any]) -> tuple[dict[str, Any], dict[str, Any]]:
+    """
+    The `app:` and `user:` keys of a state delta, without their prefixes.
+    """
+    app_delta, user_delta = {}, {}
+    for key, value in delta.items():
+        if key.startswith(State.APP_PREFIX):
+            app_delta[key[len(State.APP_PREFIX):]] = value
+        elif key.startswith(State.USER_PREFIX):
+            user_delta[key[len(State.USER_PREFIX):]] = value
+    return app_delta, user_delta
+
+
+def connect(path: str) -> sqlite3.Connection:
+    """
+    SQLite connection in WAL mode: readers never block the writer, and
+    several processes on one host can share the file.
+    """
+    conn = sqlite3.connect(path, check_same_thread=False, timeout=30.0)
+    conn.execute("PRAGMA journal_mode=WAL")
+    # In WAL mode NORMAL only fsyncs at checkpoints; a crash can lose the
+    # last commits but never corrupts the database
+    conn.execute("PRAGMA synchronous=NORMAL")
+    return conn
+
+
+class WriteBehindQueue:
+    """
+    Background writer applying queued statements in batched transactions.
+
+    Callers enqueue a statement with the key of the row it writes and
+    return immediately. The writer thread waits `flush_interval` seconds
+    after the first write to collect a batch, then commits it in one
+    transaction. Statements that replace a whole row (state snapshots) are
+    coalesced: only the last one per key in a batch runs, so a burst of
+    state deltas costs one row write.
+    """
+
+    def __init__(self, conn: sqlite3.Connection, flush_interval: float = 0.05, max_batch: int = 1000):
+        self.conn = conn
+        self.flush_interval = flush_interval
+        self.max_batch = max_batch
+
+        self._queue: queue.Queue = queue.Queue()
+        self._pending: Counter = Counter()
+        self._pending_lock = threading.Lock()
+
+        self.batches = 0
+        self.statements = 0
+        self.coalesced = 0
+        self.errors = 0
+
+        self._thread = threading.Thread(target=self._run, name="session-writer", daemon=True)
+        self._thread.start()
+
+    def put(self, key: Hashable, sql: str, params: tuple, coalesce: bool = False) -> None:
+        with self._pending_lock:
+            self._pending[key] += 1
+        self._queue.put((key, coalesce, sql, params))
+
+    def pending(self, key: Optional[Hashable] = None) -> int:
+        """
+        Queued statements not yet committed, in total or for one key.
+        """
+        if key is None:
+            return self._queue.unfinished_tasks
+        with self._pending_lock:
+            return self._pending[key]
+
+    def flush(self) -> None:
+        """
+        Block until everything queued so far is committed.
+        """
+        self._queue.join()
+
+    def close(self) -> None:
+        self.flush()
+        self._queue.put(None)
+        self._thread.join()
+
+    def _run(self) -> None:
+        while True:
+            item = self._queue.get()
+            if item is None:
+                self._queue.task_done()
+                return
+
+            batch = [item]
+            deadline = time.monotonic() + self.flush_interval
+            while len(batch) < self.max_batch:
+                timeout = deadline - time.monotonic()
+                if timeout <= 0:
+                    break
+                try:
+                    item = self._queue.get(timeout=timeout)
+                except queue.Empty:
+                    break
+                if item is None:
+                    # Stop after committing what was collected
+                    self._queue.task_done()
+                    self._queue.put(None)
+                    break
+                batch.append(item)
+
+            self._commit(batch)
+            with self._pending_lock:
+                for key, *_ in batch:
+                    self._pending[key] -= 1
+                    if not self._pending[key]:
+                        del self._pending[key]
+            for _ in batch:
+                self._queue.task_done()
+
+    def _commit(self, batch: list) -> None:
+        # Keep only the last row-replacing statement per key, in queue order
+        last = {key: i for i, (key, coalesce, _, _) in enumerate(batch) if coalesce}
+        statements = [
+            (sql, params) for i, (key, coalesce, sql, params) in enumerate(batch)
+            if not coalesce or last[key] == i
+        ]
+        try:
+            with self.conn:
+                for sql, params in statements:
+                    self.conn.execute(sql, params)
+        except sqlite3.Error as e:
+            self.errors += 1
+            print(f"⚠️ Session write-behind batch of {len(statements)} statements failed: {e}")
+            return
+        self.batches += 1
+        self.statements += len(statements)
+        self.coalesced += len(batch) - len(statements)
+
+
+class SqliteSessionService(BoundedInMemorySessionService):
+    """
+    Durable session service backed by a local SQLite database.
+
+    Reads are served from the bounded in-memory store, which acts as a cache:
+    a session that is not cached (evicted, expired, created by another
+    process or before a restart) is loaded from the database with its
+    state and its most recent `max_events` events.
+
+    Writes are write-behind: new sessions, events, session state snapshots
+    and the user/app state keys each event changes are queued and committed
+    in batches by a background thread, so a turn never waits on disk.
+    Events that compaction trims are deleted from the database too.
+    Evicting a session from the cache does not delete it; only
+    `delete_session` does, and user state is kept even then, so preferences
+    outlive both sessions and restarts.
+
+    Several processes on one host can share the database file. A cached
+    session is reloaded when the database holds a newer version of it, and
+    user and app state are re-read on every `get_session`, so an update made
+    by another process is seen on the next turn. Database reads run in a
+    worker thread (a read may first wait for queued writes), never on the
+    event loop.
+    """
+
+    def __init__(self, db_path: str = SESSION_DB_PATH, flush_interval: float = SESSION_DB_FLUSH_INTERVAL, **kwargs):
+        super().__init__(**kwargs)
+        self.db_path = db_path
+        Path(db_path).parent.mkdir(parents=True, exist_ok=True)
+
+        self._reader = connect(db_path)
+        self._reader.executescript(SCHEMA)
+        self._reader_lock = threading.Lock()
+        self.writer = WriteBehindQueue(connect(db_path), flush_interval=flush_interval)
+
+        self.db_loads = 0
+        self.db_reloads = 0
+
+    # ----------------------------
+    # Database reads
+    # ----------------------------
+
+    def _query(self, key: Optional[Hashable], sql: str, params: tuple) -> list[tuple]:
+        # A read of a row with writes still queued (any row when `key` is None)
+        # waits for them to commit. Blocks: call from a worker thread.
+        if self.writer.pending(key):
+            self.writer.flush()
+        with self._reader_lock:
+            return self._reader.execute(sql, params).fetchall()
+
+    def _read_shared_state(self, app_name: str, user_id: str) -> tuple[dict, dict]:
+        """
+        The stored app and user state, as `(app_state, user_state)`.
+        """
+        app_rows = self._query(
+            ("app", app_name), "SELECT key, value FROM app_state_keys WHERE app_name = ?", (app_name,),
+        )
+        user_rows = self._query(
+            ("user", app_name, user_id),
+            "SELECT key, value FROM user_state_keys WHERE app_name = ? AND user_id = ?", (app_name, user_id),
+        )
+        return (
+            {key: json.loads(value) for key, value in app_rows},
+            {key: json.loads(value) for key, value in user_rows},
+        )
+
+    def _read_session(self, key: SessionKey) -> Optional[tuple]:
+        """
+        A stored session as `(state, update_time, event texts, app_state,
+        user_state)`, or None if it does not exist.
+        """
+        app_name, user_id, _ = key
+        rows = self._query(
+            ("session",) + key,
+            "SELECT state, update_time FROM sessions WHERE app_name = ? AND user_id = ? AND id = ?", key,
+        )
+        if not rows:
+            return None
+        state, update_time = rows[0]
+
+        event_rows = self._query(
+            ("session",) + key,
+            "SELECT event FROM events WHERE app_name = ? AND user_id = ? AND session_id = ?"
+            " ORDER BY seq DESC LIMIT ?",
+            key + (self.max_events,),
+        )
+        texts = [text for (text,) in reversed(event_rows)]
+        return (json.loads(state), update_time, texts) + self._read_shared_state(app_name, user_id)
+
+    def _read_update_time(self, key: SessionKey) -> Optional[float]:
+        with self._reader_lock:
+            row = self._reader.execute(
+                "SELECT update_time FROM sessions WHERE app_name = ? AND user_id = ? AND id = ?", key,
+            ).fetchone()
+        return row[0] if row else None
+
+    def _set_shared_state(self, app_name: str, user_id: str, app_state: dict, user_state: dict) -> None:
+        """
+        Replace the cached app and user state with what was read from the
+        database, unless this process has writes to them still queued (the
+        cached copy is then the newer one).
+        """
+        if not self.writer.pending(("app", app_name)):
+            self.app_state[app_name] = app_state
+        if not self.writer.pending(("user", app_name, user_id)):
+            self.user_state.setdefault(app_name, {})[user_id] = user_state
+
+    async def _refresh_shared_state(self, app_name: str, user_id: str) -> None:
+        app_state, user_state = await asyncio.to_thread(self._read_shared_state, app_name, user_id)
+        self._set_shared_state(app_name, user_id, app_state, user_state)
+
+    async def _load_session(self, key: SessionKey) -> bool:
+        """
+        Load a session from the database into the cache; False if it does not exist.
+        """
+        stored = await asyncio.to_thread(self._read_session, key)
+        if stored is None:
+            return False
+        state, update_time, texts, app_state, user_state = stored
+
+        app_name, user_id, session_id = key
+        events = [Event.model_validate_json(text) for text in texts]
+        # Start at a turn boundary, as compaction would have
+        first_turn = next((i for i, e in enumerate(events) if e.author == "user"), len(events))
+        events, texts = events[first_turn:], texts[first_turn:]
+
+        self._set_shared_state(app_name, user_id, app_state, user_state)
+        self.sessions.setdefault(app_name, {}).setdefault(user_id, {})[session_id] = Session(
+            id=session_id,
+            app_name=app_name,
+            user_id=user_id,
+            state=state,
+            events=events,
+            last_update_time=update_time,
+        )
+        with self._lock:
+            self._event_bytes[key] = deque(len(text) for text in texts)
+            self._touch(key)
+            self._evict_over_capacity()
+        return True
+
+    async def _is_stale(self, key: SessionKey) -> bool:
+        """
+        True when another process stored a newer version of a cached session.
+        """
+        app_name, user_id, session_id = key
+        cached = self.sessions.get(app_name, {}).get(user_id, {}).get(session_id)
+        if cached is None:
+            return False
+        update_time = await asyncio.to_thread(self._read_update_time, key)
+        return update_time is not None and update_time > cached.last_update_time
+
+    # ----------------------------
+    # Database writes
+    # ----------------------------
+
+    def _queue_session(self, session: Session) -> None:
+        """
+        Queue a snapshot of the stored session's own state.
+        """
+        app_name, user_id = session.app_name, session.user_id
+        stored = self.sessions[app_name][user_id][session.id]
+        self.writer.put(
+            ("session", app_name, user_id, session.id),
+            UPSERT_SESSION,
+            (app_name, user_id, session.id, json.dumps(stored.state, default=str), stored.last_update_time),
+            coalesce=True,
+        )
+
+    def _queue_state_delta(self, app_name: str, user_id: str, delta: Optional[dict[str, Any]]) -> None:
+        """
+        Queue the user and app state keys a state delta changes.
+        """
+        app_delta, user_delta = split_state_delta(delta or {})
+        for key, value in user_delta.items():
+            self.writer.put(
+                ("user", app_name, user_id), UPSERT_USER_KEY, (app_name, user_id, key, json.dumps(value, default=str)),
+            )
+        for key, value in app_delta.items():
+            self.writer.put(("app", app_name), UPSERT_APP_KEY, (app_name, key, json.dumps(value, default=str)))
+
+    # ----------------------------
+    # SessionService API
+    # ----------------------------
+
+    async def create_session(
+        self,
+        *,
+        app_name: str,
+        user_id: str,
+        state: Optional[dict[str, Any]] = None,
+        session_id: Optional[str] = None,
+    ) -> Session:
+        if session_id and (app_name, user_id, session_id) not in self._access:
+            # An existing stored session makes the create below fail as it should
+            await self._load_session((app_name, user_id, session_id))
+        await self._refresh_shared_state(app_name, user_id)
+
+        session = await super().create_session(
+            app_name=app_name, user_id=user_id, state=state, session_id=session_id,
+        )
+        self._queue_session(session)
+        self._queue_state_delta(app_name, user_id, state)
+        return session
+
+    async def get_session(self, *, app_name: str, user_id: str, session_id: str, config=None) -> Optional[Session]:
+        key = (app_name, user_id, session_id)
+        with self._lock:
+            self._expire_idle()
+            cached = key in self._access
+
+        if cached and await self._is_stale(key):
+            with self._lock:
+                self._drop(key)
+            self.db_reloads += 1
+            cached = False
+        if cached:
+            await self._refresh_shared_state(app_name, user_id)
+        else:
+            if not await self._load_session(key):
+                return None
+            self.db_loads += 1
+
+        return await super().get_session(
+            app_name=app_name, user_id=user_id, session_id=session_id, config=config,
+        )
+
+    async def list_sessions(self, *, app_name: str, user_id: Optional[str] = None) -> ListSessionsResponse:
+        sql = "SELECT user_id, id, state, update_time FROM sessions WHERE app_name = ?"
+        params: tuple = (app_name,)
+        if user_id is not None:
+            sql += " AND user_id = ?"
+            params += (user_id,)
+        return ListSessionsResponse(sessions=[
+            Session(id=sid, app_name=app_name, user_id=uid, state=json.loads(state), last_update_time=update_time)
+            for uid, sid, state, update_time in await asyncio.to_thread(self._query, None, sql, params)
+        ])
+
+    async def delete_session(self, *, app_name: str, user_id: str, session_id: str) -> None:
+        await super().delete_session(app_name=app_name, user_id=user_id, session_id=session_id)
+
+        # Stored user state is kept, so preferences carry over to the user's next session
+        key = (app_name, user_id, session_id)
+        self.writer.put(("session",) + key, DELETE_EVENTS, key)
+        self.writer.put(("session",) + key, DELETE_SESSION, key, coalesce=True)
+
+    async def append_event(self, session: Session, event: Event) -> Event:
+        compacted = self.compacted_events
+        event = await super().append_event(session=session, event=event)
+        if event.partial:
+            return event
+
+        stored = self.sessions.get(session.app_name, {}).get(session.user_id, {}).get(session.id)
+        if stored is None:
+            return event
+
+        key = (session.app_name, session.user_id, session.id)
+        self.writer.put(("session",) + key, INSERT_EVENT, key + (event.model_dump_json(exclude_none=True),))
+        if self.compacted_events != compacted:
+            # This append trimmed old turns from memory; drop them from the database as well
+            self.writer.put(("session",) + key, PRUNE_EVENTS, key + key + (len(stored.events),))
+        self._queue_session(session)
+        if event.actions:
+            self._queue_state_delta(session.app_name, session.user_id, event.actions.state_delta)
+        return event
+
+    def close(self) -> None:
+        """
+        Commit everything still queued and close the database.
+        """
+        self.writer.close()
+        self.writer.conn.close()
+        self._reader.close()
+
+    # ----------------------------
+    # Gauges
+    # ----------------------------
+
+    def stats(self) -> dict:
+        stats = super().stats()
+        stats.update({
+            "db_path": self.db_path,
+            "db_loads": self.db_loads,
+            "db_reloads": self.db_reloads,
+            "write_queue_pending": self.writer.pending(),
+            "write_batches": self.writer.batches,
+            "write_statements": self.writer.statements,
+            "write_coalesced": self.writer.coalesced,
+            "write_errors": self.writer.errors,
+        })
+        return stats
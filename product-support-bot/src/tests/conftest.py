@@ -0,0 +1,3 @@
+# test_support_agent.py is a manual script that talks to the live agents
+# (run it with `python -m src.tests.test_support_agent`), not a pytest module
+collect_ignore = ["test_support_agent.py"]
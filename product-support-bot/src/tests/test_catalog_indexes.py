@@ -0,0 +1,94 @@
+import numpy as np
+import pandas as pd
+
+from src.agents.product_catalog.indexes import ProductNameIndex, RowBitmapIndex, SortedNumericIndex
+from src.agents.product_catalog.text import tokenize
+
+
+# ----------------------------
+# ProductNameIndex
+# ----------------------------
+
+NAMES = pd.Series(["Sony TV", "sony tv ", "Bose QC35 Headphones", None, "Apple iPad"])
+PRICES = np.array([500.0, 400.0, 300.0, 10.0, np.nan])
+
+
+def test_exact_lookup_is_case_insensitive_and_picks_cheapest_row():
+    index = ProductNameIndex(NAMES, PRICES)
+
+    assert len(index) == 3
+    assert index.lookup("SONY TV") == 1
+    assert index.lookup("  apple ipad ") == 4
+
+
+def test_substring_lookup_and_misses():
+    index = ProductNameIndex(NAMES, PRICES)
+
+    assert index.lookup("qc35") == 2
+    assert index.lookup("tv") == 1
+    assert index.lookup("nintendo") is None
+
+
+def test_substring_lookup_prefers_priced_then_first_row():
+    index = ProductNameIndex(pd.Series(["Cable A", "Cable B", "Cable C"]), np.array([np.nan, 9.0, 5.0]))
+    assert index.lookup("cable") == 2
+
+    unpriced = ProductNameIndex(pd.Series(["Cable B", "Cable A"]))
+    assert unpriced.lookup("cable") == 0
+
+
+def test_lookup_many_matches_lookup():
+    index = ProductNameIndex(NAMES, PRICES)
+    queries = ["sony tv", "headphones", "nothing here", "APPLE IPAD"]
+
+    rows = index.lookup_many(queries)
+
+    assert rows.tolist() == [1, 2, -1, 4]
+    assert rows.tolist() == [index.lookup(q) if index.lookup(q) is not None else -1 for q in queries]
+
+
+def test_orderings_and_names_in():
+    index = ProductNameIndex(NAMES, PRICES)
+    sony, bose, apple = index.exact["sony tv"], index.exact["bose qc35 headphones"], index.exact["apple ipad"]
+
+    assert index.ordered("name").tolist() == [apple, bose, sony]
+    # Unpriced names sort last in both price orders
+    assert index.ordered("price_asc").tolist() == [bose, sony, apple]
+    assert index.ordered("price_desc").tolist() == [sony, bose, apple]
+
+    row_mask = np.array([True, False, False, True, False])
+    name_mask = index.names_in(row_mask)
+    assert index.ordered("name", name_mask).tolist() == [sony]
+
+
+# ----------------------------
+# RowBitmapIndex
+# ----------------------------
+
+def test_row_bitmap_index_masks_and_keys():
+    categories = pd.Series(["TVs,Electronics", "Headphones,Audio", None, "TVs,Home Theater"])
+    index = RowBitmapIndex(categories, tokenize)
+
+    assert index.rows("tvs").tolist() == [0, 3]
+    assert index.rows("missing").tolist() == []
+    assert index.mask(["audio", "theater"]).tolist() == [False, True, False, True]
+    assert index.mask(["missing"]).tolist() == [False] * 4
+
+    assert index.keys_in(np.array([True, False, True, False])) == {"tvs", "electronics"}
+    assert "headphones" in index.keys_in()
+
+
+# ----------------------------
+# SortedNumericIndex
+# ----------------------------
+
+def test_sorted_numeric_index_ranges_in_ascending_order():
+    index = SortedNumericIndex(np.array([30.0, np.nan, 10.0, 20.0, 10.0]))
+
+    assert index.range_rows().tolist() == [2, 4, 3, 0]
+    assert index.range_rows(low=15).tolist() == [3, 0]
+    assert index.range_rows(high=20).tolist() == [2, 4, 3]
+    assert index.range_rows(low=10, high=10).tolist() == [2, 4]
+    assert index.range_rows(low=40).tolist() == []
+    assert index.range_rows(low=25, high=15).tolist() == []
+    assert index.mask(low=20).tolist() == [True, False, False, True, False]
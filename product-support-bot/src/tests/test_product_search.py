@@ -0,0 +1,48 @@
+from src.agents.product_catalog.search import ProductSearchIndex, search_terms
+
+
+DOCS = [
+    "sony wh-1000xm3 wireless headphones sony headphones",
+    "bose quietcomfort 35 headphones bose headphones",
+    "sony bravia 55 inch tv sony tvs",
+    "apple ipad air apple tablets",
+]
+
+
+def test_search_terms_mix_words_and_trigrams():
+    terms = search_terms("WH-1000XM3")
+
+    assert terms["w:wh"] == 1
+    assert terms["w:1000xm3"] == 1
+    # Trigrams run over the text without punctuation, bridging the hyphen
+    assert terms["h10"] == 1
+
+
+def test_misspelled_and_compacted_model_names_find_the_product():
+    index = ProductSearchIndex(DOCS)
+
+    assert index.search("wh1000xm3")[0][0] == 0
+    assert index.search("quiet comfort")[0][0] == 1
+    assert index.search("bravia tv")[0][0] == 2
+
+
+def test_results_are_ranked_and_limited_to_top_k():
+    index = ProductSearchIndex(DOCS)
+    results = index.search("sony headphones", top_k=2)
+
+    assert len(results) == 2
+    assert results[0][0] == 0
+    assert results[0][1] >= results[1][1] > 0
+
+
+def test_rare_terms_outweigh_common_ones():
+    index = ProductSearchIndex(["kettle black", "kettle white", "kettle steel", "toaster black"])
+    scores = index.scores("kettle toaster")
+
+    # "toaster" appears in one document, "kettle" in three
+    assert scores[3] > max(scores[:3])
+
+
+def test_no_match_and_empty_index():
+    assert ProductSearchIndex(DOCS).search("zzqx") == []
+    assert ProductSearchIndex([]).search("sony") == []
@@ -0,0 +1,100 @@
+import numpy as np
+import pandas as pd
+
+from src.agents.product_catalog.store import (
+    Availability,
+    ProductStore,
+    TextColumn,
+    classify_availability,
+    parse_weight_lb,
+)
+
+
+COLUMNS = {
+    "name_col": "name",
+    "brand_col": "brand",
+    "category_col": "categories",
+    "price_min_col": "prices.amountMin",
+    "price_max_col": "prices.amountMax",
+    "availability_col": "prices.availability",
+    "weight_col": "weight",
+    # Columns the dataset lacks are None in the store
+    "url_col": "sourceURLs",
+}
+
+
+def make_store() -> ProductStore:
+    df = pd.DataFrame({
+        "name": ["Sony TV", "Bose QC35", None],
+        "brand": ["Sony", None, "Bose"],
+        "categories": ["TVs", "Headphones", "Headphones"],
+        "prices.amountMin": ["499.99", "n/a", None],
+        "prices.amountMax": [599.99, 299.0, None],
+        "prices.availability": ["In Stock", "retired", None],
+        "weight": ["1 lb 4 oz", "250 g", None],
+    })
+    return ProductStore(df, COLUMNS)
+
+
+def test_record_reads_typed_columns():
+    store = make_store()
+    record = store.record(0)
+
+    assert store.size == 3
+    assert record.name == "Sony TV"
+    assert record.brand == "Sony"
+    assert record.price_min == 499.99
+    assert record.price_max == 599.99
+    assert record.availability_state is Availability.IN_STOCK
+    assert record.url is None
+
+
+def test_missing_values_are_none():
+    record = make_store().record(1)
+
+    assert record.brand is None
+    assert record.price_min is None
+    assert record.availability_state is Availability.DISCONTINUED
+    assert make_store().record(2).name is None
+
+
+def test_records_match_record_and_keep_misses():
+    store = make_store()
+    records = store.records(np.array([2, -1, 0]))
+
+    assert records[1] is None
+    for row, record in ((2, records[0]), (0, records[2])):
+        expected = store.record(row)
+        assert all(getattr(record, slot) == getattr(expected, slot) for slot in expected.__slots__)
+
+
+def test_weights_and_sort_price():
+    store = make_store()
+
+    assert store.weight_lb[0] == 1.25
+    assert round(store.weight_lb[1], 4) == round(250 * 0.00220462, 4)
+    assert np.isnan(store.weight_lb[2])
+    # The minimum price is the sort price whenever the column exists
+    assert store.sort_price is store.price_min
+    assert store.nbytes > 0
+
+
+def test_text_column_round_trip():
+    series = pd.Series(["héllo", None, ""])
+    column = TextColumn.from_series(series)
+
+    assert [column.value(row) for row in range(3)] == ["héllo", None, ""]
+    assert column.to_series().tolist() == ["héllo", None, ""]
+
+
+def test_availability_and_weight_parsing():
+    assert classify_availability("7 available") is Availability.IN_STOCK
+    assert classify_availability("More on the Way") is Availability.OUT_OF_STOCK
+    assert classify_availability("Special Order") is Availability.SPECIAL_ORDER
+    assert classify_availability("limited stock") is Availability.LIMITED_STOCK
+    assert classify_availability(None) is Availability.UNKNOWN
+    assert classify_availability("call us") is Availability.UNKNOWN
+
+    assert parse_weight_lb("2 pounds") == 2.0
+    assert parse_weight_lb("8 oz") == 0.5
+    assert np.isnan(parse_weight_lb("heavy"))
@@ -6,12 +6,12 @@ import asyncio
 
 from google.genai import types
 from google.adk.runners import Runner
-from google.adk.sessions import InMemorySessionService
 
 from src.agents.customer_support.agent import customer_support_agent
+from src.memory_session_service import create_session_service
 
 # Shared session service for tests
-session_service = InMemorySessionService()
+session_service = create_session_service()
 app_name = "support_app"
 user_id = "demo_user"
 
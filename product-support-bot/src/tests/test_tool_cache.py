@@ -0,0 +1,169 @@
+import threading
+import time
+
+import pytest
+
+from src.agents.product_catalog.cache import ToolResultCache, cached_tool
+
+
+class Version:
+    """
+    Mutable stand-in for the catalog version.
+    """
+
+    def __init__(self, value=1):
+        self.value = value
+
+    def __call__(self):
+        return self.value
+
+
+def wait_until(condition, timeout: float = 5.0) -> None:
+    deadline = time.monotonic() + timeout
+    while not condition():
+        assert time.monotonic() < deadline, "condition not reached"
+        time.sleep(0.005)
+
+
+# ----------------------------
+# ToolResultCache
+# ----------------------------
+
+def test_version_change_drops_every_entry():
+    version = Version()
+    cache = ToolResultCache(version_fn=version)
+    cache.put("a", 1)
+    cache.put("b", 2)
+
+    assert cache.get("a") == (True, 1)
+
+    version.value = 2
+    assert cache.get("a") == (False, None)
+    assert cache.get("b") == (False, None)
+    assert cache.stats()["invalidations"] == 1
+
+
+def test_result_of_an_older_version_is_not_stored():
+    version = Version()
+    cache = ToolResultCache(version_fn=version)
+    cache.get("a")
+
+    version.value = 2
+    cache.put("a", "stale", version=1)
+
+    assert cache.get("a") == (False, None)
+
+
+def test_lru_eviction_and_ttl_expiry():
+    cache = ToolResultCache(maxsize=2)
+    cache.put("a", 1)
+    cache.put("b", 2)
+    cache.get("a")
+    cache.put("c", 3)
+
+    assert cache.get("b") == (False, None)
+    assert cache.get("a") == (True, 1)
+    assert cache.stats()["evictions"] == 1
+
+    expired = ToolResultCache(ttl=-1)
+    expired.put("a", 1)
+    assert expired.peek("a") == (False, None)
+    assert expired.get("a") == (False, None)
+    assert expired.stats()["expirations"] == 1
+
+
+# ----------------------------
+# cached_tool
+# ----------------------------
+
+def test_cached_tool_shares_results_across_spellings():
+    cache = ToolResultCache()
+    calls = []
+
+    @cached_tool(cache)
+    def lookup(name: str) -> str:
+        calls.append(name)
+        return f"result for {name}"
+
+    assert lookup("  Sony TV ") == "result for   Sony TV "
+    assert lookup("sony tv") == "result for   Sony TV "
+    assert lookup.peek("SONY TV") == (True, "result for   Sony TV ")
+    assert lookup.key("Sony TV") == lookup.key("sony tv ")
+    assert len(calls) == 1
+
+
+def test_cached_tool_skips_results_that_are_not_cacheable():
+    cache = ToolResultCache()
+    calls = []
+
+    @cached_tool(cache, cacheable=lambda result: result != "missing")
+    def lookup(name: str) -> str:
+        calls.append(name)
+        return "missing"
+
+    lookup("a")
+    lookup("a")
+
+    assert len(calls) == 2
+    assert cache.stats()["size"] == 0
+
+
+def test_concurrent_identical_calls_run_once():
+    cache = ToolResultCache()
+    release = threading.Event()
+    calls = []
+
+    @cached_tool(cache)
+    def slow(name: str) -> str:
+        calls.append(name)
+        release.wait(5)
+        return name.upper()
+
+    results = []
+    threads = [threading.Thread(target=lambda: results.append(slow("tv"))) for _ in range(5)]
+    for thread in threads:
+        thread.start()
+
+    wait_until(lambda: cache.stats()["coalesced"] == 4)
+    assert cache.stats()["in_flight"] == 1
+
+    release.set()
+    for thread in threads:
+        thread.join(5)
+
+    assert results == ["TV"] * 5
+    assert calls == ["tv"]
+    assert cache.stats()["in_flight"] == 0
+
+
+def test_waiting_calls_receive_the_leaders_error():
+    cache = ToolResultCache()
+    release = threading.Event()
+
+    @cached_tool(cache)
+    def failing(name: str) -> str:
+        release.wait(5)
+        raise ValueError(name)
+
+    errors = []
+
+    def call():
+        try:
+            failing("x")
+        except ValueError as e:
+            errors.append(e)
+
+    threads = [threading.Thread(target=call) for _ in range(3)]
+    for thread in threads:
+        thread.start()
+    wait_until(lambda: cache.stats()["coalesced"] == 2)
+
+    release.set()
+    for thread in threads:
+        thread.join(5)
+
+    assert len(errors) == 3
+    assert cache.stats()["size"] == 0
+    # Errors are not cached: the next call runs (and fails) again
+    with pytest.raises(ValueError):
+        failing("x")
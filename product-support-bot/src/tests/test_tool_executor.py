@@ -0,0 +1,104 @@
+import asyncio
+import threading
+
+import pytest
+
+from src.agents.product_catalog.executor import (
+    BUSY_MESSAGE,
+    TIMEOUT_MESSAGE,
+    ToolBusy,
+    ToolExecutor,
+    ToolTimeout,
+    async_tool,
+)
+
+
+def blocking_tool(started: threading.Event, release: threading.Event):
+    def lookup(name: str) -> str:
+        started.set()
+        release.wait(5)
+        return name.upper()
+
+    return lookup
+
+
+async def wait_for_event(event: threading.Event) -> None:
+    assert await asyncio.to_thread(event.wait, 5)
+
+
+def test_runs_tools_off_the_event_loop():
+    executor = ToolExecutor(max_workers=2, max_queue=4, timeout=5)
+    loop_thread = threading.get_ident()
+
+    async def main():
+        return await executor.run(threading.get_ident)
+
+    assert asyncio.run(main()) != loop_thread
+    assert executor.stats()["completed"] == 1
+
+
+def test_full_queue_fails_fast_with_tool_busy():
+    executor = ToolExecutor(max_workers=1, max_queue=1, timeout=5)
+    started, release = threading.Event(), threading.Event()
+    tool = blocking_tool(started, release)
+
+    async def main():
+        running = asyncio.ensure_future(executor.run(tool, "a"))
+        await wait_for_event(started)
+        # The only thread is busy, so this call takes the only queue slot
+        waiting = asyncio.ensure_future(executor.run(tool, "b"))
+        await asyncio.sleep(0)
+
+        with pytest.raises(ToolBusy):
+            await executor.run(tool, "c")
+
+        release.set()
+        return await asyncio.gather(running, waiting)
+
+    assert asyncio.run(main()) == ["A", "B"]
+    stats = executor.stats()
+    assert stats["rejected"] == 1
+    assert stats["completed"] == 2
+    assert stats["queued"] == stats["running"] == 0
+
+
+def test_deadline_raises_tool_timeout_and_frees_queued_slots():
+    executor = ToolExecutor(max_workers=1, max_queue=2, timeout=0.05)
+    started, release = threading.Event(), threading.Event()
+    tool = blocking_tool(started, release)
+
+    async def main():
+        running = asyncio.ensure_future(executor.run(tool, "a"))
+        await wait_for_event(started)
+        # Never gets a thread before its deadline, so it is dropped from the queue
+        with pytest.raises(ToolTimeout):
+            await executor.run(tool, "b")
+        with pytest.raises(ToolTimeout):
+            await running
+
+    try:
+        asyncio.run(main())
+    finally:
+        release.set()
+
+    stats = executor.stats()
+    assert stats["timeouts"] == 2
+    assert stats["queued"] == 0
+
+
+def test_async_tool_turns_busy_and_timeout_into_messages():
+    started, release = threading.Event(), threading.Event()
+    tool = blocking_tool(started, release)
+
+    busy = async_tool(tool, ToolExecutor(max_workers=1, max_queue=0, timeout=5))
+    slow = async_tool(tool, ToolExecutor(max_workers=1, max_queue=1, timeout=0.05))
+
+    async def main():
+        return await busy("a"), await slow("b")
+
+    try:
+        assert asyncio.run(main()) == (BUSY_MESSAGE, TIMEOUT_MESSAGE)
+    finally:
+        release.set()
+    # functools.wraps keeps the name ADK declares the tool under
+    assert busy.__name__ == "lookup"
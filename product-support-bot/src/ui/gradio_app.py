@@ -3,56 +3,123 @@ from dotenv import load_dotenv
 load_dotenv()
 
 
+import time
+
 import gradio as gr
+import uvicorn
+from fastapi import FastAPI
+from fastapi.responses import PlainTextResponse
+from google.adk.agents.run_config import RunConfig, StreamingMode
 from google.adk.runners import Runner
-from google.adk.sessions import InMemorySessionService
 from google.genai import types
 
+from src.config import UI_CONCURRENCY_LIMIT, UI_QUEUE_MAX_SIZE
 from src.agents.customer_support.agent import customer_support_agent
+from src.memory_session_service import create_session_service
+from src.metrics import CONTENT_TYPE, registry
 
 
 # ------------------------------------------------------------
 # Config
 # ------------------------------------------------------------
 APP_NAME = "support_app"
-USER_ID = "local_user"
 
-# One session service and one runner for the whole app
-session_service = InMemorySessionService()
+# One bounded session service and one runner for the whole app
+session_service = create_session_service()
 runner = Runner(
     agent=customer_support_agent,
     app_name=APP_NAME,
     session_service=session_service,
 )
 
-# create the session lazily on first message
-_session_id: str | None = None
+# Stream model output (SSE) so partial text reaches the UI as it is generated
+run_config = RunConfig(streaming_mode=StreamingMode.SSE)
 
 
-async def get_session_id() -> str:
+# ------------------------------------------------------------
+# Per-client sessions
+# ------------------------------------------------------------
+def client_ids(client_key: str) -> tuple[str, str]:
     """
-    Create a session the first time, then reuse its id.
+    ADK (user_id, session_id) for one browser session.
+
+    Each Gradio client gets its own user id as well as its own session,
+    because `user:`-prefixed state (last product, preferred brand) is shared
+    by every session of the same user.
     """
-    global _session_id
-    if _session_id is None:
-        session = await session_service.create_session(
-            app_name=APP_NAME,
-            user_id=USER_ID,
-            # optional: initial state dict
-            # state={"foo": "bar"},
-        )
-        _session_id = session.id
-    return _session_id
+    return f"web-{client_key}", f"chat-{client_key}"
+
+
+async def ensure_session(client_key: str) -> tuple[str, str]:
+    """
+    Create the client's session on its first message, then reuse it.
+    """
+    user_id, session_id = client_ids(client_key)
+    session = await session_service.get_session(
+        app_name=APP_NAME, user_id=user_id, session_id=session_id,
+    )
+    if session is None:
+        try:
+            await session_service.create_session(
+                app_name=APP_NAME, user_id=user_id, session_id=session_id,
+            )
+        except Exception:
+            # Created concurrently by another message of the same client
+            pass
+    return user_id, session_id
+
+
+async def end_session(client_key: str) -> None:
+    user_id, session_id = client_ids(client_key)
+    await session_service.delete_session(
+        app_name=APP_NAME, user_id=user_id, session_id=session_id,
+    )
 
 
 # ------------------------------------------------------------
-# Async chat handler
+# Turn latency metrics
 # ------------------------------------------------------------
-async def chat_async(message: str) -> str:
-    result_text = ""
+TTFT_SECONDS = registry.histogram(
+    "ui_time_to_first_token_seconds", "Time from a chat message to the first reply text shown",
+)
+TURN_SECONDS = registry.histogram(
+    "ui_turn_seconds", "Time from a chat message to the end of the streamed reply",
+)
+
+
+# ------------------------------------------------------------
+# Async chat handler (streaming)
+# ------------------------------------------------------------
+def event_text(event) -> str:
+    """
+    Visible text of an event (thought parts excluded).
+    """
+    if not event.content or not event.content.parts:
+        return ""
+    return "".join(
+        part.text for part in event.content.parts
+        if part.text and not getattr(part, "thought", False)
+    )
+
+
+async def chat_stream(message: str, client_key: str, turn_runner: Runner | None = None):
+    """
+    Yield the reply text accumulated so far as runner events arrive, for the
+    session of client `client_key`.
+
+    Only final responses are shown: partial chunks of the model message
+    being generated are displayed immediately, but if that message turns
+    out to be a tool call or an intermediate step it is dropped again.
+    """
+    start = time.perf_counter()
+    first_token = None
+    final_text = ""   # completed final responses of this turn
+    draft = ""        # streamed chunks of the message in progress
+
+    turn_runner = turn_runner or runner
 
     try:
-        session_id = await get_session_id()
+        user_id, session_id = await ensure_session(client_key)
 
         # Wrap user input as ADK Content
         content = types.Content(
@@ -60,29 +127,59 @@ async def chat_async(message: str) -> str:
             parts=[types.Part(text=message)],
         )
 
-        # Stream events from the runner
-        async for event in runner.run_async(
-            user_id=USER_ID,
+        async for event in turn_runner.run_async(
+            user_id=user_id,
             session_id=session_id,
             new_message=content,
+            run_config=run_config,
         ):
-            if event.content and event.content.parts:
-                for part in event.content.parts:
-                    if part.text:
-                        result_text += part.text
+            text = event_text(event)
+
+            if event.partial:
+                if text and not event.get_function_calls():
+                    draft += text
+                    if first_token is None:
+                        first_token = time.perf_counter() - start
+                    yield final_text + draft
+                continue
+
+            # A complete event replaces the chunks streamed for it
+            retracted = bool(draft)
+            draft = ""
+
+            if event.is_final_response() and text:
+                if first_token is None:
+                    first_token = time.perf_counter() - start
+                final_text += ("\n\n" if final_text else "") + text
+                yield final_text
+            elif retracted:
+                # Streamed text belonged to a tool call / intermediate step
+                yield final_text
 
     except Exception as e:
-        result_text = f"Error: {e}"
+        yield f"Error: {e}"
+        return
+    finally:
+        # Failed and abandoned (tab closed, stop pressed) turns count too
+        if first_token is not None:
+            TTFT_SECONDS.observe(first_token)
+        TURN_SECONDS.observe(time.perf_counter() - start)
+
+    if not final_text:
+        yield "(No response from agent.)"
 
-    if not result_text:
-        result_text = "(No response from agent.)"
 
-    return result_text
+# Gradio callback MUST be async (no asyncio.run!); as an async generator,
+# every yielded string replaces the bot message shown so far. Gradio injects
+# the request, whose session_hash identifies the browser session.
+async def chat(message, history, request: gr.Request):
+    async for partial in chat_stream(message, request.session_hash):
+        yield partial
 
 
-# Gradio callback MUST be async (no asyncio.run!)
-async def chat(message, history):
-    return await chat_async(message)
+async def on_unload(request: gr.Request):
+    # Free the ADK session when the browser tab goes away
+    await end_session(request.session_hash)
 
 
 # ------------------------------------------------------------
@@ -93,6 +190,8 @@ with gr.Blocks() as demo:
 
     gr.ChatInterface(
         fn=chat,
+        # Turns of different users run concurrently up to this limit
+        concurrency_limit=UI_CONCURRENCY_LIMIT,
         title="Product Support Bot",
         textbox=gr.Textbox(
             placeholder="Ask about a product...",
@@ -101,9 +200,22 @@ with gr.Blocks() as demo:
         ),
     )
 
+    demo.unload(on_unload)
+
+# Requests beyond the concurrency limit wait in the queue (up to max_size)
+demo.queue(max_size=UI_QUEUE_MAX_SIZE, default_concurrency_limit=UI_CONCURRENCY_LIMIT)
+
+# Serve the UI from a FastAPI app so the turn histograms can be scraped
+app = FastAPI()
+
+
+@app.get("/metrics", response_class=PlainTextResponse)
+def metrics():
+    # Prometheus scrape endpoint
+    return PlainTextResponse(registry.render(), media_type=CONTENT_TYPE)
+
+
+app = gr.mount_gradio_app(app, demo, path="/")
+
 if __name__ == "__main__":
-    demo.launch(
-        share=True,
-        server_name="0.0.0.0",
-        server_port=7860,
-    )
+    uvicorn.run(app, host="0.0.0.0", port=7860)